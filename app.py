@@ -1,17 +1,35 @@
 
 # // app.py
-import pickle
-from flask import Flask, request, jsonify,render_template
-import pandas as pd
-import numpy as np
+import time
+from flask import Flask, request, jsonify,render_template, g, Response
 
-from sklearn.preprocessing import StandardScaler
+# Only the serving modules are imported here; pandas, scikit-learn and the
+# boosting libraries are loaded on first use (see src/pipeline/startup_report.py)
 from src.pipeline.predict_pipeline import CustomData, PredictPipeline
+from src.pipeline.model_registry import get_model_registry
+from src.pipeline.micro_batcher import get_micro_batcher
+from src.pipeline.prediction_cache import get_prediction_cache
+from src.pipeline.metrics import stage_timer, observe_request, render_metrics
+from src.pipeline.serving import readiness
+from src.logger import request_logger
 
 application = Flask(__name__)
 
 app = application
 
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get("request_start")
+    if start is not None:
+        observe_request(request.endpoint or "unknown", request.method, response.status_code, time.perf_counter() - start)
+    return response
+
 # Route for the Home Page
 @app.route("/")
 def home():
@@ -23,30 +41,97 @@ def predictdata():
     if request.method == 'GET':
         return render_template('home.html')
     else:                                           
-        data = CustomData(
-            gender = request.form.get('gender'),
-            race_ethnicity= request.form.get('race_ethnicity'),
-            parental_level_of_education = request.form.get('parental_level_of_education'),
-            lunch = request.form.get('lunch'),
-            test_preparation_course = request.form.get('test_preparation_course'),
-            reading_score = float(request.form.get('reading_score')),
-            writing_score = float(request.form.get('writing_score'))
+        with stage_timer("parse_form"):
+            data = CustomData(
+                gender = request.form.get('gender'),
+                race_ethnicity= request.form.get('race_ethnicity'),
+                parental_level_of_education = request.form.get('parental_level_of_education'),
+                lunch = request.form.get('lunch'),
+                test_preparation_course = request.form.get('test_preparation_course'),
+                reading_score = float(request.form.get('reading_score')),
+                writing_score = float(request.form.get('writing_score'))
 
-        )
+            )
 
-        pred_df = data.get_data_as_data_frame()
-        print(pred_df)
+            features = data.get_data_as_dict()
+        request_logger.info("Prediction input: %s", features)
 
-        predict_pipeline = PredictPipeline()
-        results = predict_pipeline.predict(pred_df)
-        print(results)
+        # Repeated inputs are answered from the prediction cache, the others are
+        # coalesced with concurrent requests into one vectorized model call
+        results = PredictPipeline().cached_prediction(features)
+        if results is None:
+            with stage_timer("micro_batch"):
+                results = get_micro_batcher().predict(features)
+        request_logger.info("Prediction result: %s", results)
 
-        return render_template('home.html', results=results[0])
+        with stage_timer("render"):
+            return render_template('home.html', results=results)
     
 
 
 
 
+# Route for batch prediction from a JSON array of records or an uploaded CSV file
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    import pandas as pd
+
+    predict_pipeline = PredictPipeline()
+    chunk_size = request.args.get('chunk_size', type=int) or predict_pipeline.predict_pipeline_config.batch_chunk_size
+
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            # Read the upload lazily so only one chunk is parsed into memory at a time
+            features = pd.read_csv(upload.stream, chunksize=chunk_size)
+        else:
+            records = request.get_json(silent=True)
+            if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+                return jsonify({"error": "Expected a JSON array of records or a CSV file upload"}), 400
+            features = pd.DataFrame.from_records(records, columns=None if records else CustomData.feature_columns)
+
+        results = predict_pipeline.predict_batch(features, chunk_size=chunk_size)
+    except (ValueError, pd.errors.ParserError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"count": len(results), "predictions": results.tolist()})
+
+
+# Route for the active model version and load statistics
+@app.route('/model/status', methods=['GET'])
+def model_status():
+    return jsonify(get_model_registry().status())
+
+
+# Route for the batch size distribution achieved by the request coalescer
+@app.route('/predict/batching', methods=['GET'])
+def batching_stats():
+    return jsonify(get_micro_batcher().stats())
+
+
+# Route for the prediction cache counters
+@app.route('/predict/cache', methods=['GET'])
+def cache_stats():
+    return jsonify(get_prediction_cache().stats())
+
+
+# Route for the Prometheus metrics of this process
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+# Route for the readiness check, 503 until the model is loaded and warmed
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = readiness()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
+# Development server; production runs gunicorn with gunicorn.conf.py
 if __name__ == "__main__":
+    from src.pipeline.serving import warm_up
+
+    warm_up()
     app.run(host="0.0.0.0",debug=True)
 
@@ -0,0 +1,29 @@
+# gunicorn.conf.py
+# Production entry point: gunicorn picks this file up from the working directory,
+#   gunicorn            (or: gunicorn app:application)
+# The master imports the app, loads and warms the model and sizes the pool
+# before forking, so every worker starts warm and shares the model pages
+# copy-on-write with the master.
+from src.pipeline.serving import ServingConfig, prepare_master
+
+serving_config = ServingConfig()
+
+wsgi_app = "app:application"
+bind = serving_config.bind
+preload_app = True
+worker_class = "gthread"
+timeout = serving_config.timeout
+# Replaced by the autotuned values in on_starting, before any worker is forked
+workers = serving_config.workers or 1
+threads = serving_config.threads or 1
+
+
+def on_starting(server):
+    report = prepare_master(serving_config)
+    server.cfg.set("threads", report["threads"])
+    server.num_workers = report["workers"]
+
+
+def post_fork(server, worker):
+    # The logger and the micro-batcher restart their threads through os.register_at_fork
+    server.log.info("Worker %s forked warm", worker.pid)
@@ -0,0 +1,401 @@
+# src/benchmark_suite.py
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from dataclasses import dataclass, field, asdict
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    Configuration class for the component benchmark suite.
+    """
+    results_dir: str = os.path.join("artifacts", "benchmarks")
+    # The raw columnar dataset written by ingestion, or the CSV export when there is none
+    raw_dataset_path: str = os.path.join("artifacts", "data")
+    raw_data_path: str = os.path.join("artifacts", "data.csv")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    model_path: str = os.path.join("artifacts", "trained_model.pkl")
+    model_artifact_path: str = os.path.join("artifacts", "trained_model")
+    # Timed samples per benchmark; each sample loops until it lasts min_sample_time
+    repeat: int = 5
+    min_sample_time: float = 0.05
+    transform_batch_sizes: list = field(default_factory=lambda: [1, 10, 100, 1_000, 10_000, 100_000])
+    predict_batch_sizes: list = field(default_factory=lambda: [1, 100, 10_000])
+    # Synthetic datasets are stud.csv resampled to this many times its size
+    transformation_scales: list = field(default_factory=lambda: [1, 10, 100])
+    evaluation_scales: list = field(default_factory=lambda: [1, 5])
+    # A benchmark whose median is slower than the baseline by more than this fraction is a regression
+    regression_threshold: float = 0.1
+
+
+QUICK_CONFIG = dict(
+    repeat=3,
+    min_sample_time=0.02,
+    transform_batch_sizes=[1, 100, 10_000],
+    predict_batch_sizes=[1, 1_000],
+    transformation_scales=[1, 10],
+    evaluation_scales=[1],
+)
+
+
+def time_call(func, repeat=5, min_sample_time=0.05, number=None):
+    """
+    Times func like timeit: the number of calls per sample grows until one
+    sample lasts min_sample_time (or is fixed by number), and repeat samples
+    are taken.
+
+    Returns:
+    - stats (dict): Seconds per call as min, median, mean and p95 over the samples,
+      plus the loops per sample and the number of samples.
+    """
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= min_sample_time or number >= 1_000_000:
+                break
+            number *= 10
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    samples = np.asarray(samples)
+    return {
+        "min": float(samples.min()),
+        "median": float(np.median(samples)),
+        "mean": float(samples.mean()),
+        "p95": float(np.percentile(samples, 95)),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def machine_metadata():
+    """
+    Returns the machine, interpreter, library and source versions a result was measured with.
+    """
+    import sklearn
+    import xgboost
+    import catboost
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    try:
+        memory_bytes = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        memory_bytes = None
+
+    return {
+        "created_at": time.time(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "memory_bytes": memory_bytes,
+        "libraries": {
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+            "xgboost": xgboost.__version__,
+            "catboost": catboost.__version__,
+        },
+    }
+
+
+def scaled_dataset(df, n_rows, random_state=42):
+    """
+    Resamples a dataset with replacement to n_rows rows.
+    """
+    return df.sample(n=n_rows, replace=True, random_state=random_state).reset_index(drop=True)
+
+
+class BenchmarkSuite:
+    """
+    Times the serving and training hot paths against the artifacts in
+    artifacts/: CustomData to DataFrame, preprocessor.transform per batch
+    size, model.predict of every candidate family of ModelTrainer,
+    load_object, and end-to-end DataTransformation and evaluate_models on
+    resampled copies of the raw data.
+    """
+    def __init__(self, config: BenchmarkConfig = None):
+        self.benchmark_config = config or BenchmarkConfig()
+        self.results = {}
+
+    def _record(self, name, stats, **params):
+        stats["params"] = params
+        self.results[name] = stats
+        logging.info(f"Benchmark {name}: median {stats['median']:.6f}s")
+        print(f"{name:<56}{stats['median'] * 1e3:>12.4f} ms")
+
+    def _time(self, func, number=None):
+        config = self.benchmark_config
+        return time_call(func, repeat=config.repeat, min_sample_time=config.min_sample_time, number=number)
+
+    def _raw_data(self):
+        from src.components.columnar_dataset import read_dataset_or_csv
+
+        config = self.benchmark_config
+        df = read_dataset_or_csv(config.raw_dataset_path, config.raw_data_path, mmap=False)
+        # Requests carry plain strings, not the dataset's categorical columns
+        return df.astype({name: object for name, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)})
+
+    def _raw_features(self):
+        from src.pipeline.predict_pipeline import CustomData
+
+        df = self._raw_data()
+        return df[CustomData.feature_columns], df["math_score"]
+
+    def bench_custom_data(self):
+        from src.pipeline.predict_pipeline import CustomData
+
+        data = CustomData("female", "group B", "bachelor's degree", "standard", "none", 72.0, 74.0)
+        self._record("custom_data.get_data_as_data_frame", self._time(data.get_data_as_data_frame))
+
+    def bench_transform(self):
+        from src.utils import load_object
+
+        preprocessor = load_object(self.benchmark_config.preprocessor_path)
+        features, _ = self._raw_features()
+        for batch_size in self.benchmark_config.transform_batch_sizes:
+            batch = scaled_dataset(features, batch_size)
+            self._record(
+                f"preprocessor.transform[batch={batch_size}]",
+                self._time(lambda: preprocessor.transform(batch)),
+                batch_size=batch_size,
+            )
+
+    def bench_predict(self):
+        from sklearn.base import clone
+        from sklearn.model_selection import ParameterGrid
+        from src.utils import load_object, prepare_features
+        from src.components.model_trainer import ModelTrainer
+
+        preprocessor = load_object(self.benchmark_config.preprocessor_path)
+        features, target = self._raw_features()
+        X_train = preprocessor.transform(features)
+
+        trainer = ModelTrainer()
+        param_grids = trainer.get_param_grids()
+        for name, model in trainer.get_candidate_models().items():
+            # The first configuration of the family's grid stands for the family
+            model = clone(model).set_params(**next(iter(ParameterGrid(param_grids[name]))))
+            model.fit(prepare_features(model, X_train), target)
+            for batch_size in self.benchmark_config.predict_batch_sizes:
+                X_batch = prepare_features(model, preprocessor.transform(scaled_dataset(features, batch_size)))
+                self._record(
+                    f"model.predict[{name.strip()},batch={batch_size}]",
+                    self._time(lambda: model.predict(X_batch)),
+                    model=name.strip(),
+                    batch_size=batch_size,
+                )
+
+    def bench_load_object(self):
+        from src.utils import load_object
+
+        config = self.benchmark_config
+        for label, path in (("preprocessor", config.preprocessor_path), ("model", config.model_path)):
+            self._record(f"load_object[{label}]", self._time(lambda: load_object(path), number=1), path=path)
+
+        from src.components.model_artifact import is_model_artifact, load_model_artifact
+        if is_model_artifact(config.model_artifact_path):
+            self._record(
+                "load_model_artifact[model]",
+                self._time(lambda: load_model_artifact(config.model_artifact_path), number=1),
+                path=config.model_artifact_path,
+            )
+
+    def bench_data_transformation(self):
+        from src.components.data_transformation import DataTransformation
+
+        raw = self._raw_data()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for scale in self.benchmark_config.transformation_scales:
+                data = scaled_dataset(raw, len(raw) * scale)
+                train_path = os.path.join(tmp_dir, f"train_{scale}.csv")
+                test_path = os.path.join(tmp_dir, f"test_{scale}.csv")
+                split = int(len(data) * 0.8)
+                data.iloc[:split].to_csv(train_path, index=False)
+                data.iloc[split:].to_csv(test_path, index=False)
+
+                transformation = DataTransformation()
+                # Never overwrite the preprocessor that is being served
+                transformation.data_transformation_config.preprocessor_obj_file_path = os.path.join(
+                    tmp_dir, "preprocessor.pkl"
+                )
+                self._record(
+                    f"data_transformation[rows={len(data)}]",
+                    self._time(lambda: transformation.initiate_data_transformation(train_path, test_path), number=1),
+                    rows=len(data),
+                )
+
+    def bench_evaluate_models(self):
+        from sklearn.model_selection import ParameterGrid
+        from src.utils import load_object
+        from src.train_utils import evaluate_models
+        from src.components.model_trainer import ModelTrainer
+
+        preprocessor = load_object(self.benchmark_config.preprocessor_path)
+        raw = self._raw_data()
+        trainer = ModelTrainer()
+        # One configuration per family keeps the run short while covering every family
+        params = {
+            name: {key: [value] for key, value in next(iter(ParameterGrid(grid))).items()}
+            for name, grid in trainer.get_param_grids().items()
+        }
+
+        for scale in self.benchmark_config.evaluation_scales:
+            data = scaled_dataset(raw, len(raw) * scale)
+            X = preprocessor.transform(data.drop(columns=["math_score"]))
+            y = data["math_score"].to_numpy()
+            split = int(len(data) * 0.8)
+            self._record(
+                f"evaluate_models[rows={len(data)}]",
+                time_call(
+                    lambda: evaluate_models(
+                        X[:split], y[:split], X[split:], y[split:],
+                        trainer.get_candidate_models(), params,
+                    ),
+                    repeat=1,
+                    number=1,
+                ),
+                rows=len(data),
+            )
+
+    def run(self, only=None):
+        """
+        Runs the benchmark groups (all of them, or the names in only) and
+        writes the results with the machine metadata as JSON.
+
+        Returns:
+        - results_path (str): The written results file.
+        """
+        try:
+            groups = {
+                "custom_data": self.bench_custom_data,
+                "transform": self.bench_transform,
+                "predict": self.bench_predict,
+                "load_object": self.bench_load_object,
+                "data_transformation": self.bench_data_transformation,
+                "evaluate_models": self.bench_evaluate_models,
+            }
+            for name, bench in groups.items():
+                if only and name not in only:
+                    continue
+                logging.info(f"Running benchmark group {name}")
+                bench()
+
+            results = {
+                "metadata": machine_metadata(),
+                "config": asdict(self.benchmark_config),
+                "benchmarks": self.results,
+            }
+            os.makedirs(self.benchmark_config.results_dir, exist_ok=True)
+            results_path = os.path.join(
+                self.benchmark_config.results_dir, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            with open(results_path, "w") as file_obj:
+                json.dump(results, file_obj, indent=2)
+            logging.info(f"Benchmark results saved at {results_path}")
+            return results_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def compare_results(baseline, candidate, threshold=0.1):
+    """
+    Compares the median of every benchmark present in two result files.
+
+    Returns:
+    - rows (list): One dict per benchmark with both medians, their ratio and
+      a status of "regression", "improvement" or "ok".
+    """
+    rows = []
+    for name, result in candidate["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "benchmark": name,
+            "baseline": before["median"],
+            "candidate": result["median"],
+            "ratio": ratio,
+            "status": status,
+        })
+    return rows
+
+
+def _compare_command(baseline_path, candidate_path, threshold):
+    with open(baseline_path) as file_obj:
+        baseline = json.load(file_obj)
+    with open(candidate_path) as file_obj:
+        candidate = json.load(file_obj)
+
+    for key in ("cpu_count", "machine", "python", "libraries"):
+        if baseline["metadata"].get(key) != candidate["metadata"].get(key):
+            print(f"Warning: {key} differs between the runs, timings may not be comparable")
+
+    rows = compare_results(baseline, candidate, threshold)
+    print(f"{'benchmark':<56}{'baseline (ms)':>14}{'candidate (ms)':>15}{'ratio':>8}  status")
+    for row in rows:
+        print(
+            f"{row['benchmark']:<56}{row['baseline'] * 1e3:>14.4f}{row['candidate'] * 1e3:>15.4f}"
+            f"{row['ratio']:>8.2f}  {row['status']}"
+        )
+    n_regressions = sum(row["status"] == "regression" for row in rows)
+    print(f"{n_regressions} regression(s) beyond {threshold:.0%}")
+    return n_regressions
+
+
+# Run the suite:        python -m src.benchmark_suite run [--quick] [--only transform predict]
+# Compare two results:  python -m src.benchmark_suite compare baseline.json candidate.json [--threshold 0.1]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite for the serving and training hot paths")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--quick", action="store_true", help="Fewer samples, batch sizes and scales")
+    run_parser.add_argument("--only", nargs="+", help="Benchmark groups to run")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=BenchmarkConfig.regression_threshold)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        config = BenchmarkConfig(**QUICK_CONFIG) if args.quick else BenchmarkConfig()
+        print(f"Results saved at {BenchmarkSuite(config).run(only=args.only)}")
+    else:
+        sys.exit(1 if _compare_command(args.baseline, args.candidate, args.threshold) else 0)
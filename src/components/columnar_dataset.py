@@ -0,0 +1,234 @@
+# src/components/columnar_dataset.py
+import os
+import sys
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+SCHEMA_FILE_NAME = "schema.json"
+
+
+def _column_file_name(index):
+    return f"col_{index:03d}.bin"
+
+
+class ColumnarDatasetWriter:
+    """
+    Writes a DataFrame, possibly chunk by chunk, as a typed columnar dataset:
+    one raw little-endian binary file per column plus a schema.json sidecar.
+
+    String columns are stored as int32 category codes (-1 for missing values)
+    with their categories in the schema; numeric columns keep their dtype,
+    widened when a later chunk needs it.
+    Appending a chunk only appends to the column files, so a dataset of any
+    size is written in constant memory.
+    """
+    def __init__(self, dataset_path):
+        self.dataset_path = dataset_path
+        self.columns = None
+        self.n_rows = 0
+        self._files = []
+
+        if os.path.isdir(dataset_path):
+            shutil.rmtree(dataset_path)
+        os.makedirs(dataset_path, exist_ok=True)
+
+    def _init_schema(self, df):
+        self.columns = []
+        for i, (name, dtype) in enumerate(df.dtypes.items()):
+            if pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+                column = {"name": name, "kind": "numeric", "dtype": np.dtype(dtype).newbyteorder("<").str}
+            else:
+                column = {"name": name, "kind": "categorical", "dtype": "<i4", "categories": []}
+            column["file"] = _column_file_name(i)
+            self.columns.append(column)
+            self._files.append(open(os.path.join(self.dataset_path, column["file"]), "wb"))
+        # Category -> code lookup per categorical column
+        self._category_codes = [
+            {} if column["kind"] == "categorical" else None for column in self.columns
+        ]
+
+    def _promote_column(self, column, dtype):
+        """
+        Rewrites the rows written so far of a numeric column with a wider dtype
+        and returns the reopened column file.
+        """
+        if dtype.kind not in "biuf":
+            raise ValueError(f"Column '{column['name']}' can't be promoted from {column['dtype']} to {dtype}")
+        dtype = dtype.newbyteorder("<")
+        index = self.columns.index(column)
+        file_path = os.path.join(self.dataset_path, column["file"])
+        self._files[index].close()
+
+        written = np.fromfile(file_path, dtype=np.dtype(column["dtype"]), count=self.n_rows)
+        written.astype(dtype).tofile(f"{file_path}.tmp")
+        os.replace(f"{file_path}.tmp", file_path)
+        logging.info(f"Column '{column['name']}' promoted from {column['dtype']} to {dtype.str}")
+
+        column["dtype"] = dtype.str
+        self._files[index] = open(file_path, "ab")
+        return self._files[index]
+
+    def append(self, df):
+        """
+        Appends the rows of a DataFrame with the same columns as the first chunk.
+        A numeric column whose chunk doesn't fit the stored dtype is promoted to
+        a dtype that holds both (rewriting the rows written so far).
+        """
+        try:
+            if self.columns is None:
+                self._init_schema(df)
+            elif list(df.columns) != [column["name"] for column in self.columns]:
+                raise ValueError("All chunks must have the same columns")
+
+            for column, file_obj, category_codes in zip(self.columns, self._files, self._category_codes):
+                values = df[column["name"]]
+                if column["kind"] == "numeric":
+                    dtype = np.dtype(column["dtype"])
+                    if not np.can_cast(values.dtype, dtype, casting="safe"):
+                        # e.g. int64 -> float64 once a chunk has a missing value
+                        file_obj = self._promote_column(column, np.result_type(dtype, values.dtype))
+                        dtype = np.dtype(column["dtype"])
+                    data = values.to_numpy(dtype=dtype)
+                else:
+                    # New categories get the next codes, earlier codes never change
+                    codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=True)
+                    mapping = np.empty(len(uniques), dtype=np.int32)
+                    for j, category in enumerate(uniques.tolist()):
+                        if category not in category_codes:
+                            category_codes[category] = len(column["categories"])
+                            column["categories"].append(category)
+                        mapping[j] = category_codes[category]
+                    data = np.where(codes >= 0, mapping[codes] if len(mapping) else -1, -1).astype("<i4")
+                file_obj.write(np.ascontiguousarray(data).tobytes())
+
+            self.n_rows += len(df)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def close(self):
+        """
+        Flushes the column files and writes the schema. A dataset without a
+        schema is incomplete and can't be read.
+        """
+        try:
+            for file_obj in self._files:
+                file_obj.close()
+
+            schema = {"rows": self.n_rows, "columns": self.columns or []}
+            schema_path = os.path.join(self.dataset_path, SCHEMA_FILE_NAME)
+            with open(f"{schema_path}.tmp", "w") as file_obj:
+                json.dump(schema, file_obj, indent=2)
+            os.replace(f"{schema_path}.tmp", schema_path)
+
+            logging.info(f"Columnar dataset with {self.n_rows} rows written at {self.dataset_path}")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def write_columnar_dataset(df, dataset_path):
+    """
+    Writes a DataFrame as a columnar dataset in one go.
+    """
+    writer = ColumnarDatasetWriter(dataset_path)
+    writer.append(df)
+    writer.close()
+    return dataset_path
+
+
+def read_columnar_dataset(dataset_path, mmap=True):
+    """
+    Reads a columnar dataset into a DataFrame with categorical dtypes for the
+    string columns. With mmap=True the column files are memory-mapped instead
+    of read into memory.
+    """
+    try:
+        with open(os.path.join(dataset_path, SCHEMA_FILE_NAME)) as file_obj:
+            schema = json.load(file_obj)
+
+        data = {}
+        for column in schema["columns"]:
+            file_path = os.path.join(dataset_path, column["file"])
+            dtype = np.dtype(column["dtype"])
+            if schema["rows"] == 0:
+                values = np.empty(0, dtype=dtype)
+            elif mmap:
+                values = np.memmap(file_path, dtype=dtype, mode="r", shape=(schema["rows"],))
+            else:
+                values = np.fromfile(file_path, dtype=dtype, count=schema["rows"])
+
+            if column["kind"] == "categorical":
+                values = pd.Categorical.from_codes(values, categories=column["categories"])
+            data[column["name"]] = values
+
+        return pd.DataFrame(data, copy=False)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def is_columnar_dataset(path):
+    return os.path.isfile(os.path.join(path, SCHEMA_FILE_NAME))
+
+
+def read_dataset(path, mmap=True):
+    """
+    Reads a dataset artifact, either a columnar dataset directory or a CSV file.
+    """
+    if is_columnar_dataset(path):
+        return read_columnar_dataset(path, mmap=mmap)
+    return pd.read_csv(path)
+
+
+def read_dataset_or_csv(dataset_path, csv_path, mmap=True):
+    """
+    Reads the columnar dataset at dataset_path, or the CSV file at csv_path
+    when there is none (artifacts written before the columnar format, or with
+    export_csv only).
+    """
+    return read_dataset(dataset_path if is_columnar_dataset(dataset_path) else csv_path, mmap=mmap)
+
+
+# Run for testing: write/read time and disk size against the CSV round trip
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    df = pd.read_csv(os.path.join("notebook", "data", "stud.csv"))
+    df = pd.concat([df] * scale, ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "data.csv")
+        dataset_path = os.path.join(tmp_dir, "data")
+
+        start = time.perf_counter()
+        df.to_csv(csv_path, index=False)
+        csv_write = time.perf_counter() - start
+        start = time.perf_counter()
+        pd.read_csv(csv_path)
+        csv_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_columnar_dataset(df, dataset_path)
+        columnar_write = time.perf_counter() - start
+        start = time.perf_counter()
+        read_columnar_dataset(dataset_path)
+        columnar_read = time.perf_counter() - start
+
+        csv_size = os.path.getsize(csv_path)
+        columnar_size = sum(
+            os.path.getsize(os.path.join(dataset_path, file_name)) for file_name in os.listdir(dataset_path)
+        )
+
+    print(f"Rows: {len(df)}")
+    print(f"{'format':<10}{'write (s)':>12}{'read (s)':>12}{'size (MB)':>12}")
+    print(f"{'csv':<10}{csv_write:>12.4f}{csv_read:>12.4f}{csv_size / 1e6:>12.2f}")
+    print(f"{'columnar':<10}{columnar_write:>12.4f}{columnar_read:>12.4f}{columnar_size / 1e6:>12.2f}")
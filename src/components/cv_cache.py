@@ -0,0 +1,173 @@
+# src/components/cv_cache.py
+import os
+import sys
+import json
+import hashlib
+from dataclasses import dataclass
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+# Parameters that only change how fast an estimator trains, not its CV scores
+_THREAD_PARAMS = {"n_jobs", "thread_count", "nthread", "verbose"}
+
+
+@dataclass
+class CVCacheConfig:
+    """
+    Configuration class for the cross-validation result cache.
+    """
+    cache_dir: str = os.path.join("artifacts", "cv_cache")
+    # Least recently used results are evicted above this size on disk
+    max_bytes: int = 64 * 1024 * 1024
+
+
+def fingerprint_arrays(*arrays):
+    """
+    Returns a sha256 digest of the shape, dtype and content of the arrays
+    (dense or sparse).
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        if hasattr(array, "tocsr"):
+            # Sparse matrices are hashed through their CSR buffers
+            array = array.tocsr()
+            digest.update(f"csr{array.shape}".encode())
+            for part in (array.data, array.indices, array.indptr):
+                part = np.ascontiguousarray(part)
+                digest.update(f"{part.shape}:{part.dtype.str}".encode())
+                digest.update(memoryview(part).cast("B"))
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}:{array.dtype.str}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def _library_version(estimator):
+    module = sys.modules.get(type(estimator).__module__.split(".")[0])
+    return getattr(module, "__version__", "")
+
+
+class CVCache:
+    """
+    Content-addressed on-disk cache of cross-validation fold scores.
+
+    An entry is keyed by the training data, the estimator class and its
+    parameters, the library version and the CV splitter, so rerunning a search
+    only fits the configurations that changed. Every result is written as soon
+    as it is computed, which also lets an interrupted search resume.
+    """
+    def __init__(self, config: CVCacheConfig = None):
+        self.cv_cache_config = config or CVCacheConfig()
+        os.makedirs(self.cv_cache_config.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, data_fingerprint, estimator, cv):
+        params = {
+            key: value for key, value in estimator.get_params(deep=False).items()
+            if key not in _THREAD_PARAMS
+        }
+        key_source = json.dumps({
+            "data": data_fingerprint,
+            "estimator": f"{type(estimator).__module__}.{type(estimator).__qualname__}",
+            "version": _library_version(estimator),
+            "params": sorted((key, repr(value)) for key, value in params.items()),
+            "cv": repr(cv),
+        })
+        return hashlib.sha256(key_source.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cv_cache_config.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Returns the cached fold scores for a key, or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as file_obj:
+                entry = json.load(file_obj)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        # Mark as recently used for the eviction order
+        os.utime(path)
+        self.hits += 1
+        return entry["scores"]
+
+    def put(self, key, scores):
+        """
+        Stores the fold scores of one configuration.
+        """
+        try:
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file_obj:
+                json.dump({"scores": [float(score) for score in scores]}, file_obj)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+        - n_evicted (int): Number of deleted entries.
+        """
+        try:
+            entries = []
+            for file_name in os.listdir(self.cv_cache_config.cache_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cv_cache_config.cache_dir, file_name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            n_evicted = 0
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.cv_cache_config.max_bytes:
+                    break
+                os.remove(path)
+                total_bytes -= size
+                n_evicted += 1
+
+            if n_evicted:
+                logging.info(f"Evicted {n_evicted} CV cache entries, {total_bytes} bytes left")
+            return n_evicted
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def cached_cross_val_scores(estimator, X, y, cv, cache=None, data_fingerprint=None, fold_store=None):
+    """
+    Returns the R2 fold scores of an estimator, from the cache when possible.
+    With a fold_store (SharedFoldStore built with cv among its splitters), the folds are
+    read from it instead of being split from X and y.
+
+    Returns:
+    - scores (list): One R2 score per fold.
+    - cached (bool): Whether the scores came from the cache.
+    """
+    from sklearn.model_selection import cross_val_score
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(data_fingerprint or fingerprint_arrays(X, y), estimator, cv)
+        scores = cache.get(key)
+        if scores is not None:
+            return scores, True
+
+    if fold_store is not None:
+        scores = fold_store.cross_val_scores(estimator, cv)
+    else:
+        scores = cross_val_score(estimator, X, y, cv=cv, scoring="r2", n_jobs=1).tolist()
+    if cache is not None:
+        cache.put(key, scores)
+    return scores, False
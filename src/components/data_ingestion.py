@@ -1,71 +1,165 @@
 # # src/components/data_ingestion.py
 import os
 import sys
+import time
 from src.exception import CustomException
 from src.logger import logging
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from dataclasses import dataclass
 
-from src.components.data_transformation import DataTransformation
-from src.components.data_transformation import DataTransformationConfig
-from src.components.model_trainer import ModelTrainer
-from src.components.model_trainer import ModelTrainerConfig
+from src.components.columnar_dataset import ColumnarDatasetWriter, write_columnar_dataset
 @dataclass
 class DataIngestionConfig:
     train_data_path: str = os.path.join('artifacts', 'train.csv')
     test_data_path: str = os.path.join('artifacts', 'test.csv')
     raw_data_path: str = os.path.join('artifacts', 'data.csv')
+    # Typed columnar datasets passed to the next stages, see src/components/columnar_dataset.py
+    train_dataset_path: str = os.path.join('artifacts', 'train')
+    test_dataset_path: str = os.path.join('artifacts', 'test')
+    raw_dataset_path: str = os.path.join('artifacts', 'data')
+    # Also write the train/test/raw CSV files above
+    export_csv: bool = False
+    source_data_path: str = os.path.join('notebook', 'data', 'stud.csv')
+    # Streaming mode reads the source in chunks and splits rows by hash, in constant memory
+    streaming: bool = False
+    chunk_size: int = 100_000
+    # Share of test rows and seed of the split, in both modes
+    test_size: float = 0.2
+    split_seed: int = 42
+
+
+def _process_peak_rss_mb():
+    """
+    Returns the peak resident set size of this process since it started, in MB,
+    or None where the resource module is not available (Windows). This is the
+    high-water mark of the whole process, not of one ingestion run: it only
+    shows the ingestion's own peak when nothing before it used more memory.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def hash_split_mask(df, test_size, split_seed):
+    """
+    Returns a boolean mask of the rows that belong to the test set.
+
+    The assignment only depends on the row content and the seed, so it is
+    reproducible across runs and chunkings without shuffling in memory.
+    Identical rows always land in the same split.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False, hash_key=f"{split_seed:016d}"[-16:])
+    return (hashes.to_numpy() % 10_000) < int(round(test_size * 10_000))
+
 
 class DataIngestion:
     def __init__(self):
         self.ingestion_config = DataIngestionConfig()
+        self.ingestion_report = None
+
+    def _dataset_paths(self):
+        config = self.ingestion_config
+        return (config.raw_dataset_path, config.train_dataset_path, config.test_dataset_path)
+
+    def _csv_paths(self):
+        config = self.ingestion_config
+        return (config.raw_data_path, config.train_data_path, config.test_data_path)
 
 # method to initiate data ingestion -> reading the dataset from source like mongodb or from the csv dataset
     def initiate_data_ingestion(self):
         logging.info("Entered the data ingestion method or Component")
+        if self.ingestion_config.streaming:
+            return self.initiate_streaming_data_ingestion()
         try:
             # Read the dataset from the csv file
             # You can change the path to your dataset file OR You can use mongoDB or any other source to read the dataset
-            df = pd.read_csv('notebook/data/stud.csv')
+            df = pd.read_csv(self.ingestion_config.source_data_path)
             logging.info("Read the Dataset from the Dataframe")
 
-            os.makedirs(os.path.dirname(self.ingestion_config.train_data_path),exist_ok=True)
-
-            df.to_csv(self.ingestion_config.raw_data_path, index=False, header=True)
+            os.makedirs(os.path.dirname(self.ingestion_config.train_dataset_path),exist_ok=True)
 
             logging.info("Train test split initiated...")
-            train_set,test_set = train_test_split(df,test_size=0.2,random_state=42)
+            train_set,test_set = train_test_split(df,test_size=self.ingestion_config.test_size,random_state=self.ingestion_config.split_seed)
 
-            train_set.to_csv(self.ingestion_config.train_data_path, index=False, header=True)
+            for dataset_path, part in zip(self._dataset_paths(), (df, train_set, test_set)):
+                write_columnar_dataset(part, dataset_path)
 
-            test_set.to_csv(self.ingestion_config.test_data_path, index=False, header=True)
+            if self.ingestion_config.export_csv:
+                for csv_path, part in zip(self._csv_paths(), (df, train_set, test_set)):
+                    part.to_csv(csv_path, index=False, header=True)
 
             logging.info("Ingestion of the data is completed...")
 
             return (
-                self.ingestion_config.train_data_path,
-                self.ingestion_config.test_data_path
+                self.ingestion_config.train_dataset_path,
+                self.ingestion_config.test_dataset_path
             )
 
 
         except:
             raise CustomException("Error occurred during data ingestion", sys) from None
 
-if __name__ == "__main__":
-    obj = DataIngestion()
-    train_data, test_data = obj.initiate_data_ingestion()
-
-    data_transformation = DataTransformation()
-    train_arr,test_arr,_ = data_transformation.initiate_data_transformation(train_path=train_data, test_path=test_data)
-
-    model_trainer = ModelTrainer()
-    # print(model_trainer.initiate_model_trainer(train_arr,test_arr))
-    print("Best accuracy of the model is : ",model_trainer.initiate_model_trainer(train_array=train_arr, test_array=test_arr, preprocessor_path=data_transformation.data_transformation_config.preprocessor_obj_file_path))
-
+    def initiate_streaming_data_ingestion(self):
+        """
+        Reads the source in chunks and appends every chunk to the raw, train and
+        test files, so memory stays constant whatever the size of the source.
+        Rows are assigned to train or test with hash_split_mask.
+        """
+        logging.info("Entered the streaming data ingestion method")
+        try:
+            config = self.ingestion_config
+            os.makedirs(os.path.dirname(config.train_dataset_path), exist_ok=True)
+
+            start_time = time.perf_counter()
+            n_rows = n_train = n_test = 0
+            writers = [ColumnarDatasetWriter(dataset_path) for dataset_path in self._dataset_paths()]
+
+            for i, chunk in enumerate(pd.read_csv(config.source_data_path, chunksize=config.chunk_size)):
+                test_mask = hash_split_mask(chunk, config.test_size, config.split_seed)
+                parts = (chunk, chunk[~test_mask], chunk[test_mask])
+
+                for writer, part in zip(writers, parts):
+                    writer.append(part)
+
+                if config.export_csv:
+                    # The first chunk creates the files with a header, the others are appended
+                    mode, header = ("w", True) if i == 0 else ("a", False)
+                    for csv_path, part in zip(self._csv_paths(), parts):
+                        part.to_csv(csv_path, mode=mode, header=header, index=False)
+
+                n_rows += len(chunk)
+                n_test += int(test_mask.sum())
+                n_train = n_rows - n_test
+
+            for writer in writers:
+                writer.close()
+
+            elapsed = time.perf_counter() - start_time
+            self.ingestion_report = {
+                "rows": n_rows,
+                "train_rows": n_train,
+                "test_rows": n_test,
+                "seconds": elapsed,
+                "rows_per_sec": n_rows / elapsed if elapsed > 0 else None,
+                "process_peak_rss_mb": _process_peak_rss_mb(),
+            }
+            logging.info(f"Streaming ingestion completed: {self.ingestion_report}")
 
+            return (
+                config.train_dataset_path,
+                config.test_dataset_path
+            )
 
-    print(f"Train Data Path: {train_data}")
-    print(f"Test Data Path: {test_data}")
+        except Exception as e:
+            raise CustomException(e, sys)
 
+# Run the full training pipeline, see src/pipeline/train_pipeline.py
+if __name__ == "__main__":
+    from src.pipeline.train_pipeline import TrainPipeline
 
+    TrainPipeline().run()
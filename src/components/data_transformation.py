@@ -4,6 +4,7 @@ import sys
 from dataclasses import dataclass
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from src.exception import CustomException
 from src.logger import logging
@@ -13,6 +14,7 @@ from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 
 from src.utils import save_object
+from src.components.columnar_dataset import read_dataset
 
 
 @dataclass
@@ -21,6 +23,8 @@ class DataTransformationConfig:
     Configuration class for data transformation.
     """
     preprocessor_obj_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    # Keep the features as CSR when the one-hot block is sparse instead of densifying them
+    keep_sparse: bool = True
 
 
 class DataTransformation:
@@ -60,7 +64,7 @@ class DataTransformation:
             preprocessor = ColumnTransformer(transformers=[
                 ("num_pipeline", num_pipeline, numerical_columns),
                 ("cat_pipeline", cat_pipeline, categorical_columns)
-            ])
+            ], sparse_threshold=1.0 if self.data_transformation_config.keep_sparse else 0.0)
             logging.info("Column transformer created successfully.")
 
             return preprocessor
@@ -71,16 +75,17 @@ class DataTransformation:
     def initiate_data_transformation(self, train_path, test_path):
         """
         Initiates the data transformation process:
-        - Reads training and testing datasets
+        - Reads training and testing datasets (columnar dataset directories or CSV files)
         - Applies preprocessing
         - Saves the preprocessor object
-        - Returns transformed arrays and preprocessor path
+        - Returns the transformed features (CSR when keep_sparse and the one-hot
+          block is sparse), the targets as separate vectors and the preprocessor path
         """
         logging.info("Entered the data transformation method/component.")
         try:
-            # Load datasets
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            # Load datasets, memory-mapped when they are columnar datasets
+            train_df = read_dataset(train_path)
+            test_df = read_dataset(test_path)
             logging.info("Train and test datasets loaded successfully.")
 
             # Get preprocessing pipeline
@@ -102,13 +107,9 @@ class DataTransformation:
             input_feature_train_arr = preprocessor_obj.fit_transform(input_feature_train_df)
             input_feature_test_arr = preprocessor_obj.transform(input_feature_test_df)
 
-            # Combine features with target
-            train_arr = np.c_[
-                input_feature_train_arr, target_feature_train_df.to_numpy()
-            ]
-            test_arr = np.c_[
-                input_feature_test_arr, target_feature_test_df.to_numpy()
-            ]
+            # Targets stay separate vectors so the features are never copied into a dense block
+            target_feature_train_arr = target_feature_train_df.to_numpy()
+            target_feature_test_arr = target_feature_test_df.to_numpy()
 
             # Save the preprocessor object
             logging.info("Saving the preprocessor object.")
@@ -119,8 +120,10 @@ class DataTransformation:
 
             logging.info("Data transformation completed successfully.")
             return (
-                train_arr,
-                test_arr,
+                input_feature_train_arr,
+                target_feature_train_arr,
+                input_feature_test_arr,
+                target_feature_test_arr,
                 self.data_transformation_config.preprocessor_obj_file_path
             )
 
@@ -129,13 +132,90 @@ class DataTransformation:
             raise CustomException(e, sys)
 
 
+def save_features(file_path, X):
+    """
+    Saves a feature matrix as .npz, in CSR form if it is sparse.
+    """
+    try:
+        tmp_file_path = f"{file_path}.tmp.npz"
+        if sparse.issparse(X):
+            sparse.save_npz(tmp_file_path, sparse.csr_matrix(X), compressed=False)
+        else:
+            np.savez(tmp_file_path, dense=X)
+        os.replace(tmp_file_path, file_path)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def load_features(file_path):
+    """
+    Loads a feature matrix written by save_features.
+    """
+    try:
+        with np.load(file_path) as data:
+            if "dense" in data:
+                return data["dense"]
+        return sparse.load_npz(file_path).tocsr()
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def sparse_memory_report(n_rows=20_000, n_categories=1_000, random_state=42):
+    """
+    Compares the memory of the dense np.c_ output with the CSR features plus
+    target vector on a synthetic dataset with high-cardinality categoricals.
+    """
+    import tracemalloc
+
+    rng = np.random.default_rng(random_state)
+    df = pd.DataFrame({
+        "gender": rng.choice(["female", "male"], n_rows),
+        "race_ethnicity": [f"group {i}" for i in rng.integers(0, n_categories, n_rows)],
+        "parental_level_of_education": [f"level {i}" for i in rng.integers(0, n_categories // 10, n_rows)],
+        "lunch": rng.choice(["standard", "free/reduced"], n_rows),
+        "test_preparation_course": rng.choice(["none", "completed"], n_rows),
+        "reading_score": rng.integers(0, 101, n_rows),
+        "writing_score": rng.integers(0, 101, n_rows),
+    })
+    y = rng.integers(0, 101, n_rows).astype(float)
+
+    report = {"rows": n_rows}
+    for label, keep_sparse in (("dense", False), ("sparse", True)):
+        transformation = DataTransformation()
+        transformation.data_transformation_config.keep_sparse = keep_sparse
+        preprocessor = transformation.get_data_transformer_object()
+
+        tracemalloc.start()
+        X = preprocessor.fit_transform(df)
+        if keep_sparse:
+            result_bytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes + y.nbytes
+        else:
+            X = np.c_[X, y]
+            result_bytes = X.nbytes
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report[label] = {
+            "n_features": X.shape[1],
+            "result_mb": result_bytes / 1e6,
+            "peak_mb": peak / 1e6,
+        }
+        del X
+
+    return report
+
+
 # Run for testing
 if __name__ == "__main__":
+    if "--memory-benchmark" in sys.argv:
+        print(sparse_memory_report())
+        sys.exit(0)
+
     obj = DataTransformation()
-    train_data, test_data, preprocessor_path = obj.initiate_data_transformation(
+    X_train, y_train, X_test, y_test, preprocessor_path = obj.initiate_data_transformation(
         train_path="artifacts/train.csv",
         test_path="artifacts/test.csv"
     )
-    print(f"Train Data Shape: {train_data.shape}")
-    print(f"Test Data Shape: {test_data.shape}")
+    print(f"Train Data Shape: {X_train.shape}")
+    print(f"Test Data Shape: {X_test.shape}")
     print(f"Preprocessor Path: {preprocessor_path}")
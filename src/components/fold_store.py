@@ -0,0 +1,372 @@
+# src/components/fold_store.py
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+from dataclasses import dataclass
+import numpy as np
+from scipy import sparse
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class FoldStoreConfig:
+    """
+    Configuration class for the shared cross-validation fold store.
+    """
+    # Parent of the per-run store directory; None uses /dev/shm when it exists and
+    # has room for the store, so the folds live in shared memory, else the system
+    # temp directory
+    store_dir: str = None
+    # Delete the store when the search is done
+    cleanup: bool = True
+
+
+def _block_bytes(X, y):
+    X_bytes = sum(getattr(X, part).nbytes for part in ("data", "indices", "indptr")) if sparse.issparse(X) else X.nbytes
+    return X_bytes + np.asarray(y).nbytes
+
+
+def _default_store_dir(required_bytes=0):
+    # /dev/shm is often small (64 MB in a default Docker container): a store that
+    # doesn't fit there goes to the temp directory instead of failing the search
+    if os.path.isdir("/dev/shm") and shutil.disk_usage("/dev/shm").free >= 1.1 * required_bytes:
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def _save_block(store_path, name, X, y):
+    meta = {"shape": list(X.shape), "sparse": bool(sparse.issparse(X))}
+    if meta["sparse"]:
+        X = sparse.csr_matrix(X)
+        # Canonical (sorted, no duplicates) buffers are never rewritten by scipy once mapped read-only
+        if not X.has_canonical_format:
+            X = X.copy()
+            X.sum_duplicates()
+        for part in ("data", "indices", "indptr"):
+            np.save(os.path.join(store_path, f"{name}.{part}.npy"), getattr(X, part))
+    else:
+        np.save(os.path.join(store_path, f"{name}.X.npy"), np.ascontiguousarray(X))
+    np.save(os.path.join(store_path, f"{name}.y.npy"), np.ascontiguousarray(y))
+    return meta
+
+
+def writable_features(estimator, X):
+    """
+    Returns X, or a writable copy of the memory-mapped features for the
+    estimators that can't read from read-only buffers.
+    """
+    # CatBoost builds its Pool from writable typed memoryviews of the input buffers
+    if type(estimator).__module__.split(".")[0] != "catboost":
+        return X
+    buffer = X.data if sparse.issparse(X) else X
+    return X.copy() if not buffer.flags.writeable else X
+
+
+class SharedFoldStore:
+    """
+    The training and test features and every CV fold, written once per
+    training run as .npy files and memory-mapped read-only by every process
+    of the model search.
+
+    The store pickles to its directory path only, so handing it to a process
+    pool or a joblib worker copies no data: all workers map the same pages of
+    the page cache (of /dev/shm by default) and each fold is already a
+    contiguous block, so no worker fancy-indexes its own copy of X either.
+    """
+    def __init__(self, store_path):
+        self.store_path = store_path
+        with open(os.path.join(store_path, "meta.json")) as file_obj:
+            self.meta = json.load(file_obj)
+        # repr of every splitter -> its fold set index and number of folds
+        self.splitters = self.meta["splitters"]
+        # Fingerprint of the training data, for the CV cache keys
+        self.fingerprint = self.meta["fingerprint"]
+
+    def __getstate__(self):
+        return {"store_path": self.store_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["store_path"])
+
+    @classmethod
+    def build(cls, X_train, y_train, X_test, y_test, splitters, config: FoldStoreConfig = None):
+        """
+        Splits the training data with every splitter and writes the train/test
+        blocks and every fold to a new store directory.
+
+        Parameters:
+        - X_train, X_test: Dense arrays or sparse matrices.
+        - y_train, y_test: Target vectors.
+        - splitters (list): scikit-learn splitters (KFold for the regressors,
+          StratifiedKFold for the classifiers), each split once here for all
+          model families using it.
+
+        Returns:
+        - store (SharedFoldStore): The store, memory-mapped.
+        """
+        try:
+            from src.components.cv_cache import fingerprint_arrays
+
+            config = config or FoldStoreConfig()
+            start_time = time.perf_counter()
+            # Every fold of a splitter holds one copy of the training rows (train + val parts)
+            n_copies = 1 + sum(cv.get_n_splits(X_train, y_train) for cv in {repr(cv): cv for cv in splitters}.values())
+            required_bytes = n_copies * _block_bytes(X_train, y_train) + _block_bytes(X_test, y_test)
+            parent_dir = config.store_dir or _default_store_dir(required_bytes)
+            os.makedirs(parent_dir, exist_ok=True)
+            store_path = tempfile.mkdtemp(prefix="fold_store_", dir=parent_dir)
+
+            y_train = np.asarray(y_train)
+            blocks = {
+                "train": _save_block(store_path, "train", X_train, y_train),
+                "test": _save_block(store_path, "test", X_test, np.asarray(y_test)),
+            }
+            if sparse.issparse(X_train):
+                X_train = sparse.csr_matrix(X_train)
+            fold_sets = {}
+            for index, cv in enumerate(splitters):
+                if repr(cv) in fold_sets:
+                    continue
+                n_splits = 0
+                for fold, (train_index, val_index) in enumerate(cv.split(X_train, y_train)):
+                    name = f"split{index}_fold{fold}"
+                    blocks[f"{name}_train"] = _save_block(
+                        store_path, f"{name}_train", X_train[train_index], y_train[train_index]
+                    )
+                    blocks[f"{name}_val"] = _save_block(store_path, f"{name}_val", X_train[val_index], y_train[val_index])
+                    n_splits += 1
+                fold_sets[repr(cv)] = {"index": index, "n_splits": n_splits}
+
+            with open(os.path.join(store_path, "meta.json"), "w") as file_obj:
+                json.dump({
+                    "splitters": fold_sets,
+                    "fingerprint": fingerprint_arrays(X_train, y_train),
+                    "blocks": blocks,
+                }, file_obj)
+
+            size = sum(entry.stat().st_size for entry in os.scandir(store_path))
+            logging.info(
+                f"Built fold store {store_path}: {len(fold_sets)} fold sets, {size / 1e6:.1f} MB "
+                f"in {time.perf_counter() - start_time:.2f}s"
+            )
+            return cls(store_path)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _load_block(self, name):
+        meta = self.meta["blocks"][name]
+        path = os.path.join(self.store_path, name)
+        y = np.load(f"{path}.y.npy", mmap_mode="r")
+        if meta["sparse"]:
+            parts = [np.load(f"{path}.{part}.npy", mmap_mode="r") for part in ("data", "indices", "indptr")]
+            X = sparse.csr_matrix(tuple(parts), shape=tuple(meta["shape"]), copy=False)
+        else:
+            X = np.load(f"{path}.X.npy", mmap_mode="r")
+        return X, y
+
+    def train(self):
+        """
+        Returns (X_train, y_train), memory-mapped.
+        """
+        return self._load_block("train")
+
+    def test(self):
+        """
+        Returns (X_test, y_test), memory-mapped.
+        """
+        return self._load_block("test")
+
+    def _fold_set(self, cv):
+        fold_set = self.splitters.get(repr(cv))
+        if fold_set is None:
+            raise ValueError(f"The fold store was not built with {cv!r}")
+        return fold_set
+
+    def fold(self, cv, fold):
+        """
+        Returns (X_fold_train, y_fold_train, X_val, y_val) of one fold of a
+        splitter the store was built with, memory-mapped.
+        """
+        name = f"split{self._fold_set(cv)['index']}_fold{fold}"
+        return (*self._load_block(f"{name}_train"), *self._load_block(f"{name}_val"))
+
+    def cross_val_scores(self, estimator, cv):
+        """
+        Fits a clone of the estimator on every fold of cv and returns the R2
+        fold scores, like cross_val_score(scoring="r2"). A fold that fails to
+        fit scores nan, like its error_score.
+        """
+        from sklearn.base import clone
+        from sklearn.metrics import r2_score
+        from src.utils import prepare_features
+
+        scores = []
+        for fold in range(self._fold_set(cv)["n_splits"]):
+            X_fold_train, y_fold_train, X_val, y_val = self.fold(cv, fold)
+            model = clone(estimator)
+            try:
+                model.fit(writable_features(model, prepare_features(model, X_fold_train)), y_fold_train)
+                y_pred = model.predict(writable_features(model, prepare_features(model, X_val)))
+                scores.append(float(r2_score(y_val, y_pred)))
+            except Exception as e:
+                logging.warning(f"{type(estimator).__name__} failed on fold {fold}: {e}")
+                scores.append(float("nan"))
+        return scores
+
+    def cleanup(self):
+        """
+        Deletes the store directory.
+        """
+        shutil.rmtree(self.store_path, ignore_errors=True)
+
+
+def _process_tree_memory_mb(pid):
+    """
+    Returns the summed (rss, memory) in MB of a process and all its
+    descendants. memory is the PSS without shared-memory (tmpfs) pages: PSS
+    splits every shared page between the processes mapping it, so its sum is
+    what the tree really uses, and tmpfs files are counted once by the caller.
+    RSS counts a shared page again in every process.
+    """
+    values = {"Rss": 0, "Pss": 0, "Pss_Shmem": 0}
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f"/proc/{current}/smaps_rollup") as file_obj:
+                for line in file_obj:
+                    key = line.split(":")[0]
+                    if key in values:
+                        values[key] += int(line.split()[1])
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as file_obj:
+                    pids.extend(int(child) for child in file_obj.read().split())
+        except (OSError, ValueError):
+            # The process exited while it was being read
+            continue
+    return values["Rss"] / 1024, (values["Pss"] - values["Pss_Shmem"]) / 1024
+
+
+def _stores_mb(parent_dir):
+    size = 0
+    for entry in os.scandir(parent_dir):
+        if entry.name.startswith("fold_store_") and entry.is_dir():
+            size += sum(file_entry.stat().st_size for file_entry in os.scandir(entry.path))
+    return size / 1024 / 1024
+
+
+# Brute-force neighbours and the multiclass CatBoost take hours at benchmark sizes on a small machine
+BENCHMARK_EXCLUDED_FAMILIES = ("K-Neighbors Regressor", "CatBoosting Classifier")
+
+
+def _benchmark_run(use_fold_store, n_rows, n_cores, excluded_families=BENCHMARK_EXCLUDED_FAMILIES):
+    import threading
+    import resource
+    import pandas as pd
+    from sklearn.model_selection import ParameterGrid
+    from src.utils import load_object
+    from src.train_utils import evaluate_models
+    from src.benchmark_suite import scaled_dataset
+    from src.components.model_trainer import ModelTrainer
+
+    preprocessor = load_object(os.path.join("artifacts", "preprocessor.pkl"))
+    data = scaled_dataset(pd.read_csv(os.path.join("notebook", "data", "stud.csv")), n_rows)
+    X = preprocessor.transform(data.drop(columns=["math_score"]))
+    y = data["math_score"].to_numpy()
+    split = int(n_rows * 0.8)
+    del data
+
+    trainer = ModelTrainer()
+    models = {
+        name: model for name, model in trainer.get_candidate_models().items() if name not in excluded_families
+    }
+    # One seeded configuration per family: the data movement is the same whatever the grid size
+    params = {}
+    for name, model in models.items():
+        params[name] = {
+            key: [value] for key, value in next(iter(ParameterGrid(trainer.get_param_grids()[name]))).items()
+        }
+        if "random_state" in model.get_params():
+            params[name]["random_state"] = [0]
+
+    # Upper bound of the store: the data plus one copy per fold of a KFold and a StratifiedKFold
+    store_parent_dir = _default_store_dir(7 * _block_bytes(X, y))
+    peak = {"rss_mb": 0.0, "memory_mb": 0.0}
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.1):
+            rss, memory = _process_tree_memory_mb(os.getpid())
+            peak["rss_mb"] = max(peak["rss_mb"], rss)
+            peak["memory_mb"] = max(peak["memory_mb"], memory + _stores_mb(store_parent_dir))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start_time = time.perf_counter()
+    reports = evaluate_models(
+        X[:split], y[:split], X[split:], y[split:], models, params, n_cores=n_cores,
+        fold_store_config=FoldStoreConfig(store_dir=store_parent_dir) if use_fold_store else None,
+    )
+    seconds = time.perf_counter() - start_time
+    done.set()
+    sampler.join()
+
+    return {
+        "fold_store": use_fold_store,
+        "rows": n_rows,
+        "n_cores": n_cores,
+        "families": list(models),
+        "seconds": seconds,
+        "peak_tree_rss_mb": peak["rss_mb"],
+        "peak_memory_mb": peak["memory_mb"],
+        "peak_parent_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "cv_scores": {name: report["cv_score"] for name, report in reports.items()},
+    }
+
+
+def fold_store_benchmark(n_rows=500_000, n_cores=6):
+    """
+    Runs evaluate_models (one configuration per candidate family, n_cores
+    concurrent family searches) on stud.csv resampled to n_rows rows, once
+    with per-worker copies of the data and once with the shared fold store.
+    Each mode runs in a fresh interpreter so the peak memory figures don't mix.
+
+    Returns:
+    - results (list): Wall time, peak memory of the whole process tree (PSS
+      plus the store files), summed RSS, peak RSS of the parent and of the
+      largest worker, and the CV scores per mode.
+    """
+    import ast
+    import subprocess
+
+    results = []
+    for use_fold_store in (False, True):
+        script = (
+            "from src.components import fold_store\n"
+            f"print(repr(fold_store._benchmark_run({use_fold_store!r}, {n_rows!r}, {n_cores!r})))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        results.append(ast.literal_eval(result.stdout.strip().splitlines()[-1]))
+    return results
+
+
+# Run for testing: python -m src.components.fold_store [n_rows] [n_cores]
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_cores = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    results = fold_store_benchmark(n_rows, n_cores)
+    print(f"{n_rows} rows, {len(results[0]['families'])} families on {n_cores} cores "
+          f"(without {', '.join(BENCHMARK_EXCLUDED_FAMILIES)})")
+    print(f"{'mode':<12}{'wall (s)':>10}{'memory':>10}{'sum RSS':>10}{'parent RSS':>12}{'worker RSS':>12}")
+    for result in results:
+        print(f"{'fold store' if result['fold_store'] else 'copies':<12}{result['seconds']:>10.1f}"
+              f"{result['peak_memory_mb']:>9.0f}M{result['peak_tree_rss_mb']:>9.0f}M"
+              f"{result['peak_parent_rss_mb']:>11.0f}M{result['peak_worker_rss_mb']:>11.0f}M")
+    print(f"Same CV scores: {results[0]['cv_scores'] == results[1]['cv_scores']}")
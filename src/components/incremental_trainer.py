@@ -0,0 +1,505 @@
+# src/components/incremental_trainer.py
+import os
+import sys
+import json
+import copy
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.pipeline import Pipeline
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import save_object, load_object, prepare_features
+from src.components.columnar_dataset import read_dataset, is_columnar_dataset, write_columnar_dataset
+from src.components.model_artifact import (
+    save_model_artifact, publish_model_artifact, save_model_metadata, model_metadata_path, ModelArtifactConfig
+)
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    """
+    Configuration class for incremental model updates.
+    """
+    model_path: str = os.path.join("artifacts", "trained_model.pkl")
+    # Native artifact rewritten on promotion, None skips it
+    model_artifact_path: str = os.path.join("artifacts", "trained_model")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    # Columnar datasets written by DataIngestion, the CSV exports are used when they don't exist
+    train_dataset_path: str = os.path.join("artifacts", "train")
+    test_dataset_path: str = os.path.join("artifacts", "test")
+    train_data_path: str = os.path.join("artifacts", "train.csv")
+    test_data_path: str = os.path.join("artifacts", "test.csv")
+    search_report_file_path: str = os.path.join("artifacts", "model_search_report.json")
+    report_file_path: str = os.path.join("artifacts", "incremental_update_report.json")
+    target_column: str = "math_score"
+    # Trees (forests) or boosting rounds added by one update
+    n_new_estimators: int = 50
+    # The update is promoted only if the test R2 drops by at most this much
+    max_score_drop: float = 0.0
+    # Largest prediction change allowed when moving the fitted model onto the updated scaling
+    rebase_tolerance: float = 1e-6
+
+
+def _existing_path(dataset_path, csv_path):
+    return dataset_path if is_columnar_dataset(dataset_path) else csv_path
+
+
+def update_preprocessor(preprocessor, new_df, all_df):
+    """
+    Returns a copy of the fitted preprocessor with updated numeric statistics:
+    median/mean imputation values are recomputed on all training rows and every
+    StandardScaler is updated with partial_fit on the new rows. The fitted
+    categories of the one-hot encoder are kept.
+
+    Returns:
+    - preprocessor: The updated copy.
+    - scale (np.ndarray), shift (np.ndarray): Per output feature, the map
+      x_old = scale * x_new + shift between the old and the updated features.
+    """
+    updated = copy.deepcopy(preprocessor)
+    n_features = max(output_slice.stop for output_slice in updated.output_indices_.values())
+    scale = np.ones(n_features)
+    shift = np.zeros(n_features)
+
+    for name, transformer, columns in updated.transformers_:
+        if name == "remainder" or not isinstance(transformer, Pipeline):
+            continue
+        steps = transformer.named_steps
+        output_slice = updated.output_indices_[name]
+
+        imputer = steps.get("imputer")
+        if imputer is not None and imputer.strategy in ("median", "mean"):
+            values = all_df[columns].to_numpy(dtype=float)
+            reduce = np.nanmedian if imputer.strategy == "median" else np.nanmean
+            imputer.statistics_ = reduce(values, axis=0)
+
+        scaler = steps.get("scaler")
+        if scaler is None or transformer.steps[-1][1] is not scaler:
+            continue
+        old_mean = scaler.mean_.copy() if scaler.with_mean else np.zeros(output_slice.stop - output_slice.start)
+        old_scale = scaler.scale_.copy() if scaler.with_std else np.ones_like(old_mean)
+        # The scaler sees the output of the steps before it, for the new rows only
+        scaler.partial_fit(Pipeline(transformer.steps[:-1]).transform(new_df[columns]))
+        new_mean = scaler.mean_ if scaler.with_mean else np.zeros_like(old_mean)
+        new_scale = scaler.scale_ if scaler.with_std else np.ones_like(old_scale)
+
+        scale[output_slice] = new_scale / old_scale
+        shift[output_slice] = (new_mean - old_mean) / old_scale
+
+    return updated, scale, shift
+
+
+def _sklearn_trees(model):
+    if hasattr(model, "tree_"):
+        return [model.tree_]
+    estimators = np.ravel(getattr(model, "estimators_", []))
+    if len(estimators) and all(hasattr(estimator, "tree_") for estimator in estimators):
+        return [estimator.tree_ for estimator in estimators]
+    return None
+
+
+class _ThresholdSnapper:
+    """
+    Moves a mapped threshold between the neighbouring observed feature values.
+
+    Trees compare float32 features, and a split often sits exactly on a
+    float32 value, so the affine map alone can put a row on the other side
+    after rounding. For every feature the reference rows (the same rows under
+    the old and the updated preprocessor) give the largest updated value that
+    went left and the smallest one that went right, and the mapped threshold
+    is clipped between them.
+    """
+    def __init__(self, X_old, X_new):
+        X_old = np.asarray(X_old.toarray() if hasattr(X_old, "toarray") else X_old, dtype=np.float32)
+        X_new = np.asarray(X_new.toarray() if hasattr(X_new, "toarray") else X_new, dtype=np.float32)
+        self.columns = {}
+        for feature in range(X_old.shape[1]):
+            order = np.argsort(X_old[:, feature], kind="stable")
+            new_values = X_new[order, feature]
+            self.columns[feature] = (
+                X_old[order, feature],
+                np.maximum.accumulate(new_values),
+                np.minimum.accumulate(new_values[::-1])[::-1],
+            )
+
+    def _neighbours(self, feature, index):
+        old_values, prefix_max, suffix_min = self.columns[feature]
+        lo = prefix_max[index - 1] if index > 0 else None
+        hi = suffix_min[index] if index < len(old_values) else None
+        if lo is not None and hi is not None and lo >= hi:
+            # The updated rounding merged values from both sides: keep the mapped threshold
+            return None, None
+        return lo, hi
+
+    def less_equal(self, feature, old_threshold, threshold):
+        # sklearn: x <= threshold goes left, threshold in [lo, hi)
+        old_values = self.columns[feature][0]
+        lo, hi = self._neighbours(feature, np.searchsorted(old_values, old_threshold, side="right"))
+        if lo is not None:
+            threshold = max(threshold, float(lo))
+        if hi is not None and threshold >= hi:
+            threshold = float(lo) if lo is not None else float(np.nextafter(hi, np.float32(-np.inf)))
+        return threshold
+
+    def less(self, feature, old_threshold, threshold):
+        # XGBoost: x < threshold goes left, float32 threshold in (lo, hi]
+        old_values = self.columns[feature][0]
+        lo, hi = self._neighbours(feature, np.searchsorted(old_values, np.float32(old_threshold), side="left"))
+        threshold = np.float32(threshold)
+        if hi is not None:
+            threshold = min(threshold, hi)
+        if lo is not None and threshold <= lo:
+            threshold = hi if hi is not None else np.nextafter(lo, np.float32(np.inf))
+        return float(threshold)
+
+
+def _rebase_xgboost(model, scale, shift, snapper):
+    import xgboost
+
+    booster = model.get_booster()
+    raw = json.loads(booster.save_raw(raw_format="json"))
+    for tree in raw["learner"]["gradient_booster"]["model"]["trees"]:
+        for node, left in enumerate(tree["left_children"]):
+            if left != -1:
+                feature = tree["split_indices"][node]
+                old_threshold = tree["split_conditions"][node]
+                threshold = (old_threshold - shift[feature]) / scale[feature]
+                if snapper is not None:
+                    threshold = snapper.less(feature, old_threshold, threshold)
+                tree["split_conditions"][node] = float(np.float32(threshold))
+    rebased = xgboost.Booster()
+    rebased.load_model(bytearray(json.dumps(raw).encode()))
+    model._Booster = rebased
+    return model
+
+
+def rebase_model(model, scale, shift, X_old=None, X_new=None):
+    """
+    Rewrites a fitted model in place so that it computes on the updated
+    features (x_old = scale * x_new + shift) what it computed on the old ones:
+    tree thresholds t become (t - shift) / scale, linear coefficients w
+    become w * scale and the intercept absorbs w . shift.
+
+    Parameters:
+    - X_old, X_new: Optional reference rows transformed by the old and the
+      updated preprocessor; tree thresholds are then snapped between the
+      observed values so these rows take exactly the same paths.
+
+    Raises:
+    - ValueError: If the model family can't be rebased.
+    """
+    snapper = _ThresholdSnapper(X_old, X_new) if X_old is not None and X_new is not None else None
+    trees = _sklearn_trees(model)
+    if trees is not None:
+        for tree in trees:
+            internal = tree.children_left != -1
+            features = tree.feature[internal]
+            old_thresholds = tree.threshold[internal]
+            thresholds = (old_thresholds - shift[features]) / scale[features]
+            if snapper is not None:
+                thresholds = np.array([
+                    snapper.less_equal(feature, old_threshold, threshold)
+                    for feature, old_threshold, threshold in zip(features, old_thresholds, thresholds)
+                ])
+            # threshold is a writable view of the fitted nodes
+            tree.threshold[internal] = thresholds
+        return model
+    if type(model).__name__ == "XGBRegressor":
+        return _rebase_xgboost(model, scale, shift, snapper)
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        coef = np.asarray(model.coef_, dtype=float)
+        model.intercept_ = model.intercept_ + coef @ shift
+        model.coef_ = coef * scale
+        return model
+    raise ValueError(f"{type(model).__name__} can't be moved onto updated features")
+
+
+def update_strategy(model):
+    """
+    Returns how a fitted model family is updated: "warm_start" (gradient
+    boosting continues with more stages), "add_trees" (random forest),
+    "continue_boosting" (XGBoost rounds on top of the booster), "partial_fit",
+    or "refit" (same hyperparameters, no search) for the others.
+    """
+    name = type(model).__name__
+    if name == "GradientBoostingRegressor":
+        return "warm_start"
+    if name == "RandomForestRegressor":
+        return "add_trees"
+    if name == "XGBRegressor":
+        return "continue_boosting"
+    if hasattr(model, "partial_fit"):
+        return "partial_fit"
+    return "refit"
+
+
+def update_model(model, strategy, X_all, y_all, X_new, y_new, n_new_estimators):
+    """
+    Trains a model already rebased onto the updated features further.
+    X_all/y_all are every training row (old and new), X_new/y_new only the new ones.
+    """
+    if strategy in ("warm_start", "add_trees"):
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + n_new_estimators)
+        model.fit(prepare_features(model, X_all), y_all)
+        return model
+    if strategy == "continue_boosting":
+        booster = model.get_booster()
+        updated = type(model)(**{**model.get_params(), "n_estimators": n_new_estimators})
+        updated.fit(prepare_features(updated, X_all), y_all, xgb_model=booster)
+        return updated
+    if strategy == "partial_fit":
+        model.partial_fit(prepare_features(model, X_new), y_new)
+        return model
+    updated = clone(model)
+    updated.fit(prepare_features(updated, X_all), y_all)
+    return updated
+
+
+def _stack(*blocks):
+    return np.vstack([block.toarray() if hasattr(block, "toarray") else np.asarray(block) for block in blocks])
+
+
+def _last_full_search_seconds(search_report_file_path):
+    if not os.path.exists(search_report_file_path):
+        return None
+    with open(search_report_file_path) as file_obj:
+        return json.load(file_obj).get("total_time")
+
+
+class IncrementalTrainer:
+    """
+    Updates the trained model and preprocessor with newly arrived labelled
+    rows instead of rerunning ingestion, transformation and the full model search.
+    """
+    def __init__(self, config: IncrementalTrainerConfig = None):
+        self.incremental_trainer_config = config or IncrementalTrainerConfig()
+
+    def initiate_incremental_update(self, new_data):
+        """
+        Appends new rows to the training data, updates the preprocessor's
+        numeric statistics, moves the fitted model onto the updated features
+        and trains it further according to update_strategy. The result is
+        scored on the held-out test set and only promoted (artifacts and
+        training data rewritten) if its R2 didn't drop by more than
+        max_score_drop.
+
+        Parameters:
+        - new_data: A DataFrame or a CSV path with the CustomData columns and the target.
+
+        Returns:
+        - report (dict): Strategy, scores before and after, promotion and timings.
+        """
+        try:
+            config = self.incremental_trainer_config
+            start_time = time.perf_counter()
+
+            new_df = pd.read_csv(new_data) if isinstance(new_data, str) else new_data.reset_index(drop=True)
+            train_path = _existing_path(config.train_dataset_path, config.train_data_path)
+            test_path = _existing_path(config.test_dataset_path, config.test_data_path)
+            train_df = read_dataset(train_path, mmap=False)
+            test_df = read_dataset(test_path)
+
+            missing_columns = [col for col in train_df.columns if col not in new_df.columns]
+            if missing_columns:
+                raise ValueError(f"New data is missing columns: {missing_columns}")
+            new_df = new_df[train_df.columns]
+            all_df = pd.concat([train_df, new_df], ignore_index=True)
+            logging.info(f"Incremental update with {len(new_df)} new rows on top of {len(train_df)}")
+
+            target = config.target_column
+            preprocessor = load_object(config.preprocessor_path)
+            model = load_object(config.model_path)
+            X_all_old = preprocessor.transform(all_df.drop(columns=[target]))
+            X_test_old = preprocessor.transform(test_df.drop(columns=[target]))
+            y_test = test_df[target].to_numpy()
+            previous_predictions = model.predict(prepare_features(model, X_test_old))
+            previous_score = r2_score(y_test, previous_predictions)
+
+            updated_preprocessor, scale, shift = update_preprocessor(
+                preprocessor, new_df.drop(columns=[target]), all_df.drop(columns=[target])
+            )
+            X_all = updated_preprocessor.transform(all_df.drop(columns=[target]))
+            X_new = updated_preprocessor.transform(new_df.drop(columns=[target]))
+            X_test = updated_preprocessor.transform(test_df.drop(columns=[target]))
+            y_all = all_df[target].to_numpy()
+
+            strategy = update_strategy(model)
+            rebase_max_abs_diff = None
+            if strategy != "refit":
+                rebased = rebase_model(
+                    copy.deepcopy(model), scale, shift,
+                    X_old=_stack(X_all_old, X_test_old), X_new=_stack(X_all, X_test),
+                )
+                rebase_max_abs_diff = float(np.max(np.abs(
+                    rebased.predict(prepare_features(rebased, X_test)) - previous_predictions
+                )))
+                if rebase_max_abs_diff > config.rebase_tolerance:
+                    logging.warning(f"Rebased model differs by {rebase_max_abs_diff}, refitting instead")
+                    strategy = "refit"
+                else:
+                    model = rebased
+
+            update_start_time = time.perf_counter()
+            updated_model = update_model(
+                model, strategy, X_all, y_all, X_new, new_df[target].to_numpy(), config.n_new_estimators
+            )
+            model_update_seconds = time.perf_counter() - update_start_time
+
+            updated_score = r2_score(y_test, updated_model.predict(prepare_features(updated_model, X_test)))
+            promoted = updated_score >= previous_score - config.max_score_drop
+
+            if promoted:
+                # Preprocessor and model form one version: everything is written to staging files
+                # first and swapped in back to back, so a registry load either straddles the swap
+                # (and is refused by its version check) or reads a matching pair
+                staged = []
+                for file_path, obj in ((config.preprocessor_path, updated_preprocessor), (config.model_path, updated_model)):
+                    save_object(f"{file_path}.staging", obj)
+                    staged.append(file_path)
+                # Both record the digest of the staged preprocessor, the same bytes once swapped in
+                staged_preprocessor_path = f"{config.preprocessor_path}.staging"
+                metadata_path = model_metadata_path(config.model_path)
+                save_model_metadata(config.model_path, staged_preprocessor_path, f"{metadata_path}.staging")
+                staged.append(metadata_path)
+                if config.model_artifact_path:
+                    save_model_artifact(
+                        updated_model, ModelArtifactConfig(artifact_path=config.model_artifact_path), publish=False,
+                        preprocessor_path=staged_preprocessor_path,
+                    )
+                for file_path in staged:
+                    os.replace(f"{file_path}.staging", file_path)
+                if config.model_artifact_path:
+                    publish_model_artifact(config.model_artifact_path)
+                if is_columnar_dataset(train_path):
+                    write_columnar_dataset(all_df, train_path)
+                else:
+                    all_df.to_csv(train_path, index=False, header=True)
+                logging.info(f"Promoted incremental update: R2 {previous_score:.4f} -> {updated_score:.4f}")
+            else:
+                logging.warning(f"Incremental update not promoted: R2 {previous_score:.4f} -> {updated_score:.4f}")
+
+            report = {
+                "model": type(updated_model).__name__,
+                "strategy": strategy,
+                "new_rows": len(new_df),
+                "train_rows": len(all_df),
+                "previous_score": previous_score,
+                "updated_score": updated_score,
+                "promoted": bool(promoted),
+                "rebase_max_abs_diff": rebase_max_abs_diff,
+                "model_update_seconds": model_update_seconds,
+                "update_seconds": time.perf_counter() - start_time,
+                "last_full_search_seconds": _last_full_search_seconds(config.search_report_file_path),
+            }
+            os.makedirs(os.path.dirname(config.report_file_path) or ".", exist_ok=True)
+            with open(config.report_file_path, "w") as file_obj:
+                json.dump(report, file_obj, indent=2)
+            return report
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def update_benchmark(data_path=None, test_path=None, new_fraction=0.2, random_state=42):
+    """
+    For every tree or linear family of ModelTrainer: fits the preprocessor and
+    the model on the first (1 - new_fraction) of the training rows, then runs
+    an incremental update with the remaining rows and compares it with a
+    refit from scratch (preprocessor and model, same hyperparameters) on all rows.
+    The training and test data default to the ingestion artifacts (columnar
+    datasets, or the CSV files when there are none).
+
+    Returns:
+    - results (list): One report per family with the update and refit times and scores.
+    """
+    import tempfile
+    from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, SGDRegressor
+    from sklearn.tree import DecisionTreeRegressor
+    from xgboost import XGBRegressor
+    from src.components.data_transformation import DataTransformation
+
+    models = {
+        "Linear Regression": LinearRegression(),
+        "SGD Regressor": SGDRegressor(random_state=random_state),
+        "DecisionTree Regressor": DecisionTreeRegressor(max_depth=10, random_state=random_state),
+        "RandomFores Regressor": RandomForestRegressor(n_estimators=128, max_depth=10, random_state=random_state),
+        "GradientBoosting Regressor": GradientBoostingRegressor(n_estimators=100, random_state=random_state),
+        "AdaBoost Regressor": AdaBoostRegressor(n_estimators=50, random_state=random_state),
+        "XGBRegressor ": XGBRegressor(n_estimators=100, max_depth=5),
+    }
+
+    defaults = IncrementalTrainerConfig()
+    data_path = data_path or _existing_path(defaults.train_dataset_path, defaults.train_data_path)
+    test_path = test_path or _existing_path(defaults.test_dataset_path, defaults.test_data_path)
+    train_df = read_dataset(data_path, mmap=False).sample(frac=1.0, random_state=random_state).reset_index(drop=True)
+    test_df = read_dataset(test_path)
+    n_old = int(len(train_df) * (1 - new_fraction))
+    old_df, new_df = train_df.iloc[:n_old], train_df.iloc[n_old:]
+    target = IncrementalTrainerConfig.target_column
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, template in models.items():
+            config = IncrementalTrainerConfig(
+                model_path=os.path.join(tmp_dir, "model.pkl"),
+                model_artifact_path=None,
+                preprocessor_path=os.path.join(tmp_dir, "preprocessor.pkl"),
+                train_dataset_path=os.path.join(tmp_dir, "train"),
+                test_dataset_path=os.path.join(tmp_dir, "test"),
+                train_data_path=os.path.join(tmp_dir, "train.csv"),
+                test_data_path=test_path,
+                search_report_file_path=os.path.join(tmp_dir, "none.json"),
+                report_file_path=os.path.join(tmp_dir, "report.json"),
+            )
+            old_df.to_csv(config.train_data_path, index=False)
+            preprocessor = DataTransformation().get_data_transformer_object()
+            model = clone(template)
+            model.fit(prepare_features(model, preprocessor.fit_transform(old_df.drop(columns=[target]))), old_df[target])
+            save_object(config.preprocessor_path, preprocessor)
+            save_object(config.model_path, model)
+
+            report = IncrementalTrainer(config).initiate_incremental_update(new_df)
+
+            refit_start = time.perf_counter()
+            preprocessor = DataTransformation().get_data_transformer_object()
+            X_all = preprocessor.fit_transform(train_df.drop(columns=[target]))
+            refit = clone(template)
+            refit.fit(prepare_features(refit, X_all), train_df[target])
+            report["refit_seconds"] = time.perf_counter() - refit_start
+            report["refit_score"] = r2_score(
+                test_df[target], refit.predict(prepare_features(refit, preprocessor.transform(test_df.drop(columns=[target]))))
+            )
+            report["family"] = name
+            results.append(report)
+    return results
+
+
+# Run for testing: python -m src.components.incremental_trainer new_rows.csv, or --benchmark
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--benchmark"]:
+        last_search = _last_full_search_seconds(IncrementalTrainerConfig.search_report_file_path)
+        print(f"{'family':<28}{'strategy':<19}{'rebase diff':>12}{'update (s)':>12}{'refit (s)':>11}"
+              f"{'R2 before':>11}{'R2 update':>11}{'R2 refit':>10}  promoted")
+        for report in update_benchmark():
+            rebase = "-" if report["rebase_max_abs_diff"] is None else f"{report['rebase_max_abs_diff']:.1e}"
+            print(f"{report['family']:<28}{report['strategy']:<19}{rebase:>12}{report['update_seconds']:>12.3f}"
+                  f"{report['refit_seconds']:>11.3f}{report['previous_score']:>11.4f}{report['updated_score']:>11.4f}"
+                  f"{report['refit_score']:>10.4f}  {report['promoted']}")
+        if last_search is not None:
+            print(f"Last full model search: {last_search:.1f}s")
+        sys.exit(0)
+
+    report = IncrementalTrainer().initiate_incremental_update(sys.argv[1])
+    print(f"{report['model']} updated by {report['strategy']} with {report['new_rows']} rows: "
+          f"R2 {report['previous_score']:.4f} -> {report['updated_score']:.4f}, "
+          f"{'promoted' if report['promoted'] else 'not promoted'}")
+    print(f"Update took {report['update_seconds']:.2f}s (model {report['model_update_seconds']:.2f}s)")
+    if report["last_full_search_seconds"] is not None:
+        print(f"Last full model search took {report['last_full_search_seconds']:.2f}s")
@@ -0,0 +1,444 @@
+# src/components/model_artifact.py
+import os
+import sys
+import json
+import time
+import hashlib
+from dataclasses import dataclass
+import numpy as np
+import dill
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+# Manifest of a saved but not yet published artifact, see publish_model_artifact
+STAGED_MANIFEST_FILE_NAME = "manifest.json.staging"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class ModelArtifactConfig:
+    """
+    Configuration class for the native model artifact format.
+    """
+    artifact_path: str = os.path.join("artifacts", "trained_model")
+    # Arrays at least this large are written as separate .npy files and memory-mapped on load
+    min_array_bytes: int = 4096
+    # Use the XGBoost/CatBoost save formats instead of pickling those models
+    use_native_formats: bool = True
+
+
+def _sha256_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_metadata_path(model_path):
+    return f"{model_path}.meta.json"
+
+
+def save_model_metadata(model_path, preprocessor_path, metadata_path=None):
+    """
+    Records the sha256 of the preprocessor a pickled model was trained with in
+    a sidecar next to the pickle (native artifacts keep it in their manifest),
+    so the registry can refuse a model/preprocessor pair from two runs.
+    """
+    try:
+        metadata_path = metadata_path or model_metadata_path(model_path)
+        with open(f"{metadata_path}.tmp", "w") as file_obj:
+            json.dump({"preprocessor_sha256": _sha256_file(preprocessor_path)}, file_obj, indent=2)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def trained_preprocessor_digest(model_path=None, artifact_path=None):
+    """
+    Returns the sha256 of the preprocessor recorded for the native artifact
+    (when artifact_path is given) or for the pickle, None when the model was
+    saved without one.
+    """
+    if artifact_path is not None:
+        return read_manifest(artifact_path).get("preprocessor_sha256")
+    metadata_path = model_metadata_path(model_path)
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path) as file_obj:
+        return json.load(file_obj).get("preprocessor_sha256")
+
+
+def preprocessor_digest(preprocessor_path):
+    return _sha256_file(preprocessor_path)
+
+
+def _library_versions():
+    versions = {"numpy": np.__version__}
+    for name in ("sklearn", "xgboost", "catboost"):
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", "")
+    return versions
+
+
+def _native_kind(model):
+    module = type(model).__module__
+    if module.startswith("xgboost"):
+        return "xgboost"
+    if module.startswith("catboost"):
+        return "catboost"
+    return None
+
+
+def _native_model_class(manifest):
+    """
+    Returns the estimator class recorded in the manifest (e.g.
+    catboost.core.CatBoostClassifier), so a native model is rebuilt as the
+    regressor or classifier it was saved from.
+    """
+    import importlib
+
+    module_name, _, class_name = manifest["model_class"].rpartition(".")
+    if module_name.split(".")[0] != manifest["kind"]:
+        raise ValueError(f"Model class {manifest['model_class']} doesn't match the {manifest['kind']} format")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _feature_schema(model):
+    schema = {"n_features_in": getattr(model, "n_features_in_", None)}
+    feature_names = getattr(model, "feature_names_in_", None)
+    if feature_names is not None:
+        schema["feature_names"] = [str(name) for name in feature_names]
+    return schema
+
+
+class _ArrayPickler(dill.Pickler):
+    """
+    Pickler that writes every large numeric array to its own .npy blob and
+    keeps only a reference to it in the pickle stream.
+    """
+    def __init__(self, file_obj, blob_dir, min_array_bytes):
+        super().__init__(file_obj, protocol=dill.settings["protocol"])
+        self.blob_dir = blob_dir
+        self.min_array_bytes = min_array_bytes
+        self.blobs = {}
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject or obj.nbytes < self.min_array_bytes:
+            return None
+        array = np.asarray(obj)
+        digest = hashlib.sha256(f"{array.shape}:{array.dtype.str}".encode())
+        digest.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+        # Content-addressed, so unchanged arrays are not rewritten on the next save
+        blob_name = f"{digest.hexdigest()[:24]}.npy"
+        blob_path = os.path.join(self.blob_dir, blob_name)
+        if not os.path.exists(blob_path):
+            tmp_blob_path = f"{blob_path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_blob_path, array)
+            os.replace(tmp_blob_path, blob_path)
+        self.blobs[blob_name] = True
+        return blob_name
+
+
+class _ArrayUnpickler(dill.Unpickler):
+    def __init__(self, file_obj, blob_dir, mmap):
+        super().__init__(file_obj)
+        self.blob_dir = blob_dir
+        self.mmap_mode = "r" if mmap else None
+        self._loaded = {}
+
+    def persistent_load(self, blob_name):
+        # The same blob referenced twice stays the same array object
+        if blob_name not in self._loaded:
+            self._loaded[blob_name] = np.load(os.path.join(self.blob_dir, blob_name), mmap_mode=self.mmap_mode)
+        return self._loaded[blob_name]
+
+
+def _remove_unreferenced_files(artifact_path, files):
+    # Garbage-collect the files of previous versions
+    blob_dir = os.path.join(artifact_path, "blobs")
+    keep = (MANIFEST_FILE_NAME, STAGED_MANIFEST_FILE_NAME, "blobs")
+    for name in os.listdir(artifact_path):
+        if name not in files and name not in keep and not name.endswith(".tmp"):
+            os.remove(os.path.join(artifact_path, name))
+    for name in os.listdir(blob_dir):
+        if os.path.join("blobs", name) not in files and not name.endswith(".tmp.npy"):
+            os.remove(os.path.join(blob_dir, name))
+
+
+def save_model_artifact(model, config: ModelArtifactConfig = None, publish=True, preprocessor_path=None):
+    """
+    Saves a model as a native artifact directory.
+
+    Layout:
+    - manifest.json: format version, library versions, model class, feature
+      schema and the sha256 of every file (plus one checksum over all of them)
+    - model.ubj / model.cbm: XGBoost/CatBoost models in their own format
+    - model.pkl + blobs/*.npy: any other model, pickled with its large arrays
+      stored as separate .npy files that are memory-mapped on load
+
+    The manifest is written last with an atomic rename, so a reader either
+    sees the previous complete artifact or the new one. Blobs no longer
+    referenced are removed afterwards; processes that still map them keep
+    their pages until they reload.
+
+    With a preprocessor_path, the sha256 of the preprocessor the model was
+    trained with is recorded in the manifest.
+
+    With publish=False the manifest is left staged and readers keep seeing
+    the previous artifact until publish_model_artifact is called, so the
+    swap can happen together with other files (the preprocessor).
+
+    Returns:
+    - manifest (dict): The written manifest.
+    """
+    try:
+        config = config or ModelArtifactConfig()
+        artifact_path = config.artifact_path
+        blob_dir = os.path.join(artifact_path, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+        logging.info(f"Saving model artifact at {artifact_path}")
+
+        kind = _native_kind(model) if config.use_native_formats else None
+        if kind == "xgboost":
+            model_file = "model.ubj"
+        elif kind == "catboost":
+            model_file = "model.cbm"
+        else:
+            kind, model_file = "pickle", "model.pkl"
+
+        # Model files get a unique name so the previous manifest never points at a half-written file
+        model_file = f"{time.time_ns()}-{model_file}"
+        model_path = os.path.join(artifact_path, model_file)
+        blobs = {}
+        if kind == "xgboost":
+            model.save_model(model_path)
+        elif kind == "catboost":
+            model.save_model(model_path, format="cbm")
+        else:
+            with open(model_path, "wb") as file_obj:
+                pickler = _ArrayPickler(file_obj, blob_dir, config.min_array_bytes)
+                pickler.dump(model)
+            blobs = pickler.blobs
+
+        files = {model_file: _sha256_file(model_path)}
+        for blob_name in sorted(blobs):
+            # The blob name is already its content hash
+            files[os.path.join("blobs", blob_name)] = blob_name[:-len(".npy")]
+
+        checksum = hashlib.sha256(json.dumps(sorted(files.items())).encode()).hexdigest()
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "created_at": time.time(),
+            "kind": kind,
+            "model_class": f"{type(model).__module__}.{type(model).__qualname__}",
+            "model_file": model_file,
+            "library_versions": _library_versions(),
+            "feature_schema": _feature_schema(model),
+            "files": files,
+            "size_bytes": sum(os.path.getsize(os.path.join(artifact_path, name)) for name in files),
+            "checksum": checksum,
+            "preprocessor_sha256": _sha256_file(preprocessor_path) if preprocessor_path else None,
+        }
+
+        staged_manifest_path = os.path.join(artifact_path, STAGED_MANIFEST_FILE_NAME)
+        with open(f"{staged_manifest_path}.tmp", "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(f"{staged_manifest_path}.tmp", staged_manifest_path)
+
+        logging.info(f"Model artifact saved: {kind}, {len(blobs)} blobs, {manifest['size_bytes']} bytes")
+        if publish:
+            publish_model_artifact(artifact_path)
+        return manifest
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def publish_model_artifact(artifact_path):
+    """
+    Swaps in the manifest staged by save_model_artifact with an atomic rename
+    and removes the files only previous versions referenced.
+    """
+    try:
+        staged_manifest_path = os.path.join(artifact_path, STAGED_MANIFEST_FILE_NAME)
+        with open(staged_manifest_path) as file_obj:
+            files = json.load(file_obj)["files"]
+        os.replace(staged_manifest_path, os.path.join(artifact_path, MANIFEST_FILE_NAME))
+        _remove_unreferenced_files(artifact_path, files)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def is_model_artifact(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE_NAME))
+
+
+def read_manifest(artifact_path):
+    with open(os.path.join(artifact_path, MANIFEST_FILE_NAME)) as file_obj:
+        return json.load(file_obj)
+
+
+def verify_model_artifact(artifact_path, manifest=None):
+    """
+    Checks every file of the artifact against the sha256 in its manifest.
+
+    Raises:
+    - ValueError: If a file is missing or its content doesn't match.
+    """
+    manifest = manifest or read_manifest(artifact_path)
+    for name, expected in manifest["files"].items():
+        file_path = os.path.join(artifact_path, name)
+        if not os.path.exists(file_path):
+            raise ValueError(f"Model artifact file {name} is missing")
+        if name.startswith("blobs"):
+            array = np.load(file_path, mmap_mode="r")
+            digest = hashlib.sha256(f"{array.shape}:{array.dtype.str}".encode())
+            digest.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+            actual = digest.hexdigest()[:len(expected)]
+        else:
+            actual = _sha256_file(file_path)
+        if actual != expected:
+            raise ValueError(f"Model artifact file {name} doesn't match its checksum")
+
+
+def load_model_artifact(artifact_path, mmap=True, verify=False):
+    """
+    Loads a model saved by save_model_artifact.
+
+    Parameters:
+    - artifact_path (str): The artifact directory.
+    - mmap (bool): Memory-map the array blobs (read-only, shared between
+      processes through the page cache) instead of reading them into memory.
+    - verify (bool): Check every file against the manifest checksums first.
+
+    Returns:
+    - model: The loaded model.
+    """
+    try:
+        logging.info(f"Loading model artifact from {artifact_path}")
+        manifest = read_manifest(artifact_path)
+        if manifest["format_version"] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported model artifact format version {manifest['format_version']}")
+        if verify:
+            verify_model_artifact(artifact_path, manifest)
+
+        model_path = os.path.join(artifact_path, manifest["model_file"])
+        if manifest["kind"] == "xgboost":
+            model = _native_model_class(manifest)()
+            model.load_model(model_path)
+        elif manifest["kind"] == "catboost":
+            model = _native_model_class(manifest)()
+            model.load_model(model_path, format="cbm")
+        else:
+            with open(model_path, "rb") as file_obj:
+                model = _ArrayUnpickler(file_obj, os.path.join(artifact_path, "blobs"), mmap).load()
+
+        logging.info(f"Model artifact loaded: {manifest['model_class']}")
+        return model
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _memory_mb():
+    """
+    Returns (rss, private) memory of this process in MB from /proc, or
+    (None, None) where /proc is not available.
+    """
+    try:
+        values = {}
+        with open("/proc/self/smaps_rollup") as file_obj:
+            for line in file_obj:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(":")] = int(parts[1])
+        private = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+        return values["Rss"] / 1024, private / 1024
+    except (OSError, KeyError):
+        return None, None
+
+
+def _measure_load(kind, path, queue):
+    import sklearn, xgboost, catboost  # noqa: F401  imported before the baseline
+    from src.utils import load_object
+
+    rss_before, private_before = _memory_mb()
+    start = time.perf_counter()
+    if kind == "pickle":
+        model = load_object(path)
+    else:
+        model = load_model_artifact(path)
+    load_time = time.perf_counter() - start
+    rss_after, private_after = _memory_mb()
+    queue.put({
+        "load_time": load_time,
+        "rss_mb": rss_after - rss_before if rss_before is not None else None,
+        "private_mb": private_after - private_before if private_before is not None else None,
+    })
+    del model
+
+
+def load_benchmark(models, work_dir):
+    """
+    Saves every model as a dill pickle and as a native artifact, then loads
+    each one in a fresh process and reports the load time, the RSS growth
+    and the private (unshared) memory growth of that process.
+    """
+    import multiprocessing
+    from src.utils import save_object
+
+    context = multiprocessing.get_context("spawn")
+    report = {}
+    for name, model in models.items():
+        pickle_path = os.path.join(work_dir, f"{name}.pkl")
+        artifact_path = os.path.join(work_dir, name)
+        save_object(pickle_path, model)
+        save_model_artifact(model, ModelArtifactConfig(artifact_path=artifact_path))
+
+        report[name] = {}
+        for kind, path in (("pickle", pickle_path), ("artifact", artifact_path)):
+            queue = context.Queue()
+            process = context.Process(target=_measure_load, args=(kind, path, queue))
+            process.start()
+            report[name][kind] = queue.get()
+            process.join()
+    return report
+
+
+# Run for testing: load time and memory of the dill pickles against the native artifacts
+if __name__ == "__main__":
+    import tempfile
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.neighbors import KNeighborsRegressor
+    from xgboost import XGBRegressor
+    from catboost import CatBoostRegressor
+
+    rng = np.random.default_rng(42)
+    X = rng.random((20_000, 19))
+    y = X @ rng.random(19) + rng.normal(0, 0.1, len(X))
+
+    models = {
+        "random_forest_256": RandomForestRegressor(n_estimators=256, n_jobs=-1, random_state=42).fit(X, y),
+        "knn": KNeighborsRegressor().fit(X, y),
+        "linear": LinearRegression().fit(X, y),
+        "xgboost": XGBRegressor(n_estimators=256).fit(X, y),
+        "catboost": CatBoostRegressor(iterations=256, verbose=False, allow_writing_files=False).fit(X, y),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = load_benchmark(models, tmp_dir)
+
+    print(f"{'model':<20}{'format':<10}{'load (s)':>10}{'rss (MB)':>10}{'private (MB)':>14}")
+    for name, results in report.items():
+        for kind, result in results.items():
+            print(
+                f"{name:<20}{kind:<10}{result['load_time']:>10.4f}"
+                f"{result['rss_mb'] or 0:>10.1f}{result['private_mb'] or 0:>14.1f}"
+            )
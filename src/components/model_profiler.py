@@ -0,0 +1,194 @@
+# src/components/model_profiler.py
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import save_object, prepare_features
+
+
+@dataclass
+class ModelProfilerConfig:
+    """
+    Configuration class for the inference cost profile of the candidate models.
+    """
+    # Rows per batch for the batch latency
+    batch_size: int = 1000
+    # Timed samples per latency; each sample loops until it lasts min_sample_time
+    repeat: int = 5
+    min_sample_time: float = 0.02
+    # Load every model in a fresh process to measure its resident memory, False skips it
+    measure_memory: bool = True
+
+
+@dataclass
+class SelectionBudget:
+    """
+    Inference budgets of the selected model, None leaves a dimension unbounded.
+    """
+    max_single_row_latency_ms: float = None
+    max_batch_latency_ms: float = None
+    max_model_size_mb: float = None
+    max_resident_memory_mb: float = None
+    # Among the models within budget scoring at most this much below the best of them,
+    # the one with the fastest single-row prediction is selected
+    score_tolerance: float = 0.0
+
+
+# Profile keys checked against the budget, lower is better for all of them
+_BUDGETED = {
+    "single_row_latency_ms": "max_single_row_latency_ms",
+    "batch_latency_ms": "max_batch_latency_ms",
+    "model_size_mb": "max_model_size_mb",
+    "resident_memory_mb": "max_resident_memory_mb",
+}
+
+
+def _batch(X, batch_size):
+    # Repeat the rows when there are fewer than batch_size of them
+    n_repeats = -(-batch_size // X.shape[0])
+    if sparse.issparse(X):
+        return sparse.vstack([X] * n_repeats).tocsr()[:batch_size]
+    return np.tile(X, (n_repeats, 1))[:batch_size]
+
+
+def _measure_resident_memory(model_path, row_path):
+    import sklearn, xgboost, catboost  # noqa: F401  imported before the baseline
+    from src.utils import load_object
+    from src.components.data_transformation import load_features
+    from src.components.model_artifact import _memory_mb
+
+    row = load_features(row_path)
+    _, private_before = _memory_mb()
+    model = load_object(model_path)
+    # The first prediction allocates the lazily built structures (XGBoost predictor, KD-trees)
+    model.predict(prepare_features(model, row))
+    _, private_after = _memory_mb()
+    return private_after - private_before if private_before is not None else None
+
+
+def _resident_memory_mb(model_path, row, work_dir):
+    import ast
+    import subprocess
+    from src.components.data_transformation import save_features
+
+    # A fresh interpreter, so the libraries and the model are not already resident
+    row_path = os.path.join(work_dir, "row.npz")
+    save_features(row_path, row)
+    script = (
+        "from src.components import model_profiler\n"
+        f"print(repr(model_profiler._measure_resident_memory({model_path!r}, {row_path!r})))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+
+def profile_model(model, X, config: ModelProfilerConfig = None, work_dir=None):
+    """
+    Measures the inference cost of a fitted model.
+
+    Parameters:
+    - model: The fitted estimator.
+    - X: Feature rows (dense or CSR) the latencies are measured on.
+    - config (ModelProfilerConfig): Batch size, timing and memory options.
+    - work_dir (str): Where the model is serialized, a temporary directory by default.
+
+    Returns:
+    - profile (dict): "single_row_latency_ms" and "batch_latency_ms" (medians),
+      "batch_rows_per_second", "model_size_mb" (the dill pickle saved as
+      trained_model.pkl) and "resident_memory_mb" (private memory of a process
+      after loading the model and predicting once, None when not measured).
+    """
+    try:
+        from src.benchmark_suite import time_call
+
+        config = config or ModelProfilerConfig()
+        X = prepare_features(model, X)
+        row = X[:1]
+        X_batch = _batch(X, config.batch_size)
+
+        single = time_call(lambda: model.predict(row), repeat=config.repeat, min_sample_time=config.min_sample_time)
+        batch = time_call(lambda: model.predict(X_batch), repeat=config.repeat, min_sample_time=config.min_sample_time)
+
+        with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+            model_path = os.path.join(tmp_dir, "model.pkl")
+            save_object(model_path, model)
+            model_size_mb = os.path.getsize(model_path) / 1024 / 1024
+
+            resident_memory_mb = None
+            if config.measure_memory:
+                resident_memory_mb = _resident_memory_mb(os.path.abspath(model_path), row, tmp_dir)
+
+        return {
+            "single_row_latency_ms": single["median"] * 1e3,
+            "batch_latency_ms": batch["median"] * 1e3,
+            "batch_rows_per_second": config.batch_size / batch["median"],
+            "model_size_mb": model_size_mb,
+            "resident_memory_mb": resident_memory_mb,
+        }
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _dominates(a, b):
+    """
+    Whether candidate a is at least as good as b on the score and every
+    measured cost, and strictly better on one of them.
+    """
+    pairs = [(a["test_score"], b["test_score"])]
+    pairs += [(-a[key], -b[key]) for key in _BUDGETED if a.get(key) is not None and b.get(key) is not None]
+    return all(x >= y for x, y in pairs) and any(x > y for x, y in pairs)
+
+
+def select_model(candidates, budget: SelectionBudget = None):
+    """
+    Picks the model with the best test score among those within the budget.
+    When none fits, the best scoring model is selected regardless of cost.
+
+    Parameters:
+    - candidates (dict): Model name -> dict with "test_score" and the profile_model keys.
+    - budget (SelectionBudget): The inference budgets.
+
+    Returns:
+    - name (str): The selected model.
+    - table (dict): Per model, the score and costs with "pareto_optimal", "within_budget" and "selected".
+    - summary (dict): The budget, the Pareto frontier and whether the selection fell back to max score.
+    """
+    budget = budget or SelectionBudget()
+    table = {name: dict(candidate) for name, candidate in candidates.items()}
+
+    for name, row in table.items():
+        row["pareto_optimal"] = not any(
+            _dominates(other, row) for other_name, other in table.items() if other_name != name
+        )
+        row["within_budget"] = all(
+            getattr(budget, limit) is None or (row.get(key) is not None and row[key] <= getattr(budget, limit))
+            for key, limit in _BUDGETED.items()
+        )
+
+    feasible = [name for name, row in table.items() if row["within_budget"]]
+    fallback = not feasible
+    if fallback:
+        logging.warning("No model fits the inference budget, selecting the best score")
+        feasible = list(table)
+
+    best_score = max(table[name]["test_score"] for name in feasible)
+    close = [name for name in feasible if table[name]["test_score"] >= best_score - budget.score_tolerance]
+    # Ties (and models within score_tolerance) go to the fastest single-row prediction
+    selected = min(close, key=lambda name: (table[name].get("single_row_latency_ms") or 0.0, -table[name]["test_score"]))
+    for name, row in table.items():
+        row["selected"] = name == selected
+
+    summary = {
+        "budget": dict(budget.__dict__),
+        "selected": selected,
+        "budget_fallback": fallback,
+        "pareto_frontier": [name for name, row in table.items() if row["pareto_optimal"]],
+    }
+    return selected, table, summary
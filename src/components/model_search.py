@@ -0,0 +1,231 @@
+# src/components/model_search.py
+import os
+import sys
+import json
+import math
+import time
+import numpy as np
+
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import r2_score
+from sklearn.model_selection import ParameterGrid
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import prepare_features
+from src.train_utils import _cv_splitter, _limit_estimator_threads
+from src.components.cv_cache import CVCache, cached_cross_val_scores, fingerprint_arrays
+
+
+def _evaluate_candidate(candidate_id, model, params, X, y, cv, cv_cache_config, data_fingerprint):
+    start_time = time.perf_counter()
+    # One core per candidate, the candidates themselves run in parallel
+    estimator = _limit_estimator_threads(clone(model).set_params(**params), 1)
+    X = prepare_features(estimator, X)
+    cache = CVCache(cv_cache_config) if cv_cache_config is not None else None
+    scores, cached = cached_cross_val_scores(estimator, X, y, cv, cache, data_fingerprint)
+    # A configuration that fails on a fold ranks last instead of breaking the search
+    score = float(np.mean(scores)) if np.all(np.isfinite(scores)) else -np.inf
+    return candidate_id, score, cached, time.perf_counter() - start_time
+
+
+def successive_halving_search(
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    models,
+    params,
+    time_budget=300.0,
+    eta=3,
+    min_resource=None,
+    cv=3,
+    n_jobs=None,
+    random_state=42,
+    cv_cache_config=None,
+    refit_family_best=False,
+):
+    """
+    Time-budgeted successive halving over every configuration of every model family.
+
+    All configurations start on a small random subset of the training rows.
+    After each rung only the best 1/eta of them, across all families together,
+    move on to eta times more rows. The search stops when one configuration is
+    left, the full training set is reached or time_budget (seconds) runs out;
+    the best configuration of the last completed rung is then refitted on the
+    full training data. With a cv_cache_config, fold scores are read from and
+    written to the CV cache. With refit_family_best, the best configuration of
+    every other family (at the last rung it reached) is refitted as well, so
+    the families can be compared like after a grid search; these refits run
+    after the time budget.
+
+    Returns:
+    - model_report (dict): Winning model name (and with refit_family_best every
+      other family evaluated) -> dict with the fitted "model", "best_params",
+      "cv_score", "train_score", "test_score", "n_configs" and "fit_time" (CV
+      and refit seconds of the family), in the format of evaluate_models.
+    - search_report (dict): Every evaluation with its rung, number of rows,
+      CV score and elapsed time.
+    """
+    try:
+        start_time = time.perf_counter()
+        deadline = start_time + time_budget
+        n_jobs = n_jobs or os.cpu_count() or 1
+        n_samples = len(y_train)
+
+        candidates = [
+            (name, config)
+            for name in models
+            for config in ParameterGrid(params[name])
+        ]
+        n_rungs = max(1, math.ceil(math.log(len(candidates), eta))) if len(candidates) > 1 else 1
+        # Enough rows on the first rung that the last rung uses the full training set
+        resource = min_resource or max(cv * 10, n_samples // eta ** (n_rungs - 1))
+
+        # Nested random subsets, so a promoted configuration sees a superset of its previous rows
+        order = np.random.RandomState(random_state).permutation(n_samples)
+        if any(is_classifier(model) for model in models.values()):
+            # Stratified folds need cv rows of every class: grow the first rung until it
+            # holds them for each class that has that many rows at all
+            _, labels = np.unique(y_train[order], return_inverse=True)
+            for label in np.unique(labels):
+                positions = np.flatnonzero(labels == label)
+                if len(positions) >= cv:
+                    resource = max(resource, positions[cv - 1] + 1)
+        resource = min(resource, n_samples)
+
+        logging.info(f"Successive halving over {len(candidates)} configurations, {resource} rows on the first rung")
+
+        evaluations = []
+        # Family -> (rung, CV score, candidate id) of its best configuration on the last rung it reached
+        family_best = {}
+        survivors = list(range(len(candidates)))
+        best_id = None
+        rung = 0
+        budget_exhausted = False
+
+        while survivors:
+            rows = order[:resource]
+            X_rung, y_rung = X_train[rows], y_train[rows]
+            data_fingerprint = fingerprint_arrays(X_rung, y_rung) if cv_cache_config is not None else None
+            # The splitter grid mode uses: stratified for classifiers, plain KFold otherwise
+            splitters = {name: _cv_splitter(models[name], y_rung, cv) for name in models}
+            rung_scores = {}
+
+            # Evaluate in batches of n_jobs so the deadline is checked between batches
+            for batch_start in range(0, len(survivors), n_jobs):
+                if time.perf_counter() >= deadline and (best_id is not None or rung_scores):
+                    budget_exhausted = True
+                    break
+                batch = survivors[batch_start:batch_start + n_jobs]
+                results = Parallel(n_jobs=min(n_jobs, len(batch)))(
+                    delayed(_evaluate_candidate)(
+                        candidate_id, models[candidates[candidate_id][0]], candidates[candidate_id][1],
+                        X_rung, y_rung, splitters[candidates[candidate_id][0]], cv_cache_config, data_fingerprint
+                    )
+                    for candidate_id in batch
+                )
+                for candidate_id, score, cached, elapsed in results:
+                    rung_scores[candidate_id] = score
+                    name, config = candidates[candidate_id]
+                    if name not in family_best or (rung, score) > family_best[name][:2]:
+                        family_best[name] = (rung, score, candidate_id)
+                    evaluations.append({
+                        "model": name,
+                        "params": config,
+                        "rung": rung,
+                        "n_samples": int(resource),
+                        "cv_score": score,
+                        "elapsed": elapsed,
+                        "cached": cached,
+                    })
+
+            if not rung_scores:
+                break
+
+            # Configurations of an interrupted rung that were not evaluated are dropped
+            ranked = sorted(rung_scores, key=lambda candidate_id: rung_scores[candidate_id], reverse=True)
+            best_id = ranked[0]
+            best_cv_score = rung_scores[best_id]
+            logging.info(
+                f"Rung {rung}: {len(rung_scores)} configurations on {resource} rows, "
+                f"best {candidates[best_id][0]} {candidates[best_id][1]} with CV score {rung_scores[best_id]:.4f}"
+            )
+
+            if budget_exhausted or len(ranked) == 1 or resource >= n_samples:
+                break
+
+            survivors = ranked[:max(1, len(ranked) // eta)]
+            resource = min(resource * eta, n_samples)
+            rung += 1
+
+        best_name = candidates[best_id][0]
+        refit_ids = {best_name: (best_id, best_cv_score)}
+        if refit_family_best:
+            for name, (_, score, candidate_id) in family_best.items():
+                refit_ids.setdefault(name, (candidate_id, score))
+
+        model_report = {}
+        refit_time = 0.0
+        for name, (candidate_id, cv_score) in refit_ids.items():
+            family_params = candidates[candidate_id][1]
+            refit_start = time.perf_counter()
+            model = clone(models[name]).set_params(**family_params)
+            model.fit(prepare_features(model, X_train), y_train)
+            model_refit_time = time.perf_counter() - refit_start
+            refit_time += model_refit_time
+
+            model_report[name] = {
+                "model": model,
+                "best_params": family_params,
+                "cv_score": cv_score,
+                "train_score": r2_score(y_train, model.predict(prepare_features(model, X_train))),
+                "test_score": r2_score(y_test, model.predict(prepare_features(model, X_test))),
+                "n_configs": len([c for c in candidates if c[0] == name]),
+                "fit_time": model_refit_time + sum(
+                    evaluation["elapsed"] for evaluation in evaluations if evaluation["model"] == name
+                ),
+            }
+        total_time = time.perf_counter() - start_time
+
+        logging.info(
+            f"Successive halving picked {best_name} {candidates[best_id][1]} with Test Score: "
+            f"{model_report[best_name]['test_score']} after {len(evaluations)} evaluations in {total_time:.2f}s"
+        )
+        search_report = {
+            "mode": "halving",
+            "time_budget": time_budget,
+            "budget_exhausted": budget_exhausted,
+            "eta": eta,
+            "n_candidates": len(candidates),
+            "n_evaluations": len(evaluations),
+            "fits_skipped": sum(cv for evaluation in evaluations if evaluation["cached"]),
+            "refit_time": refit_time,
+            "total_time": total_time,
+            "evaluations": evaluations,
+        }
+        return model_report, search_report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def save_search_report(file_path, model_report, search_report):
+    """
+    Writes the search report and the scores of the selected models as JSON.
+    """
+    try:
+        report = dict(search_report)
+        report["models"] = {
+            name: {key: value for key, value in result.items() if key != "model"}
+            for name, result in model_report.items()
+        }
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as file_obj:
+            json.dump(report, file_obj, indent=2, default=str)
+        logging.info(f"Model search report saved at {file_path}")
+
+    except Exception as e:
+        raise CustomException(e, sys)
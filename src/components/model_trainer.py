@@ -1,6 +1,7 @@
 # # src/components/model_trainer.py
 import os
 import sys
+import time
 from dataclasses import dataclass
 
 from catboost import CatBoostClassifier
@@ -14,7 +15,14 @@ from sklearn.metrics import r2_score
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.tree import DecisionTreeRegressor
 from xgboost import XGBRegressor
-from src.utils import save_object, evaluate_models
+from src.utils import save_object, prepare_features
+from src.train_utils import evaluate_models
+from src.components.model_search import successive_halving_search, save_search_report
+from src.components.cv_cache import CVCacheConfig
+from src.components.fold_store import FoldStoreConfig
+from src.components.model_profiler import ModelProfilerConfig, SelectionBudget, profile_model, select_model
+from src.components.score_table import ScoreTableExporter, ScoreTableConfig
+from src.components.model_artifact import save_model_artifact, save_model_metadata, ModelArtifactConfig
 
 from src.exception import CustomException
 from src.logger import logging
@@ -23,84 +31,220 @@ from src.logger import logging
 class ModelTrainerConfig:
     trained_mode_file_path: str = os.path.join(
         "artifacts","trained_model.pkl")
+    # Native artifact (memory-mapped arrays, XGBoost/CatBoost formats) saved next to the pickle, None disables it
+    model_artifact_path: str = os.path.join(
+        "artifacts","trained_model")
+    search_report_file_path: str = os.path.join(
+        "artifacts","model_search_report.json")
+    # "grid" runs every GridSearchCV, "halving" runs a time-budgeted successive halving
+    search_mode: str = "grid"
+    # Wall-clock budget of the halving search, in seconds
+    search_time_budget: float = 300.0
+    # Cores shared by the concurrent model searches, None uses every core
+    search_n_cores: int = None
+    # CV fold scores are cached here and reused by later runs, None disables the cache
+    cv_cache_dir: str = os.path.join(
+        "artifacts","cv_cache")
+    cv_cache_max_bytes: int = 64 * 1024 * 1024
+    # Split the CV folds once into memory-mapped files shared by every family search (grid mode)
+    share_cv_folds: bool = True
+    # Where the shared folds are written, None uses /dev/shm when it exists
+    fold_store_dir: str = None
+    # Precompute every integer score input into artifacts/score_table.f32 after training
+    export_score_table: bool = False
+    # Measure the inference latency, size and memory of every candidate and select within
+    # the budgets below; False selects by test score only
+    profile_candidates: bool = True
+    profile_batch_size: int = 1000
+    # Resident memory is measured by loading each model in a fresh interpreter (about 3s per
+    # candidate); None measures it only when max_resident_memory_mb is set
+    profile_resident_memory: bool = None
+    # Inference budgets of the selected model, None leaves a dimension unbounded; the best
+    # scoring model is selected when none fits
+    max_single_row_latency_ms: float = None
+    max_batch_latency_ms: float = None
+    max_model_size_mb: float = None
+    max_resident_memory_mb: float = None
+    # A model within budget scoring at most this much below the best one wins if it predicts a row faster
+    selection_score_tolerance: float = 0.0
     
 class ModelTrainer:
     def __init__(self):
         self.model_trainer_config = ModelTrainerConfig()
 
-    def initiate_model_trainer(self,train_array,test_array,preprocessor_path):
-        try:
-            logging.info("Splitting training and testing data")
-
-            X_train,X_test,y_train,y_test = (
-                train_array[:,:-1],
-                test_array[:,:-1],
-                train_array[:,-1],
-                test_array[:,-1]
-            )
+    def get_candidate_models(self):
+        """
+        Returns the candidate model families, name -> unfitted estimator.
+        """
+        models = {
+            "RandomFores Regressor": RandomForestRegressor(),
+            "DecisionTree Regressor": DecisionTreeRegressor(),
+            "K-Neighbors Regressor": KNeighborsRegressor(),
+            "Linear Regression": LinearRegression(),
+            "XGBRegressor ": XGBRegressor(),
+            "CatBoosting Classifier": CatBoostClassifier(verbose=False),
+            "GradientBoosting Regressor": GradientBoostingRegressor(),
+            "AdaBoost Regressor": AdaBoostRegressor()
+        }
+        return models
 
-            models = {
-                "RandomFores Regressor": RandomForestRegressor(),
-                "DecisionTree Regressor": DecisionTreeRegressor(),
-                "K-Neighbors Regressor": KNeighborsRegressor(),
-                "Linear Regression": LinearRegression(),
-                "XGBRegressor ": XGBRegressor(),
-                "CatBoosting Classifier": CatBoostClassifier(verbose=False),
-                "GradientBoosting Regressor": GradientBoostingRegressor(),
-                "AdaBoost Regressor": AdaBoostRegressor()
+    def get_param_grids(self):
+        """
+        Returns the hyperparameter grid of every candidate model family.
+        """
+        params = {
+            "RandomFores Regressor": {
+                "n_estimators": [8,12,32,64,128,256],
+                "max_depth": [10, 20]
+            },
+            "DecisionTree Regressor": {
+                "max_depth": [10, 20],
+                "min_samples_split": [2, 5],
+                'criterion': ['squared_error', 'absolute_error']
+            },
+            "K-Neighbors Regressor": {
+                "n_neighbors": [3, 5, 7]
+            },
+            "Linear Regression": {},
+            "XGBRegressor ": {
+                "n_estimators": [100, 200],
+                "learning_rate": [0.01, 0.1, 0.2],
+                "max_depth": [3, 5, 7]
+            },
+            "CatBoosting Classifier": {
+                "iterations": [100, 200],
+                "depth": [6, 8]
+            },
+            "GradientBoosting Regressor": {
+                "n_estimators": [100, 200],
+                "learning_rate": [0.01, 0.1, 0.2,],
+            },
+            "AdaBoost Regressor": {
+                "n_estimators": [50, 100],
+                "learning_rate": [0.01, 0.1, 0.2]
             }
+        }
+        return params
+
+    def select_candidate(self, model_report, X_test):
+        """
+        Profiles the fitted best model of every family on the test features
+        and selects the best test score within the inference budgets. The
+        profile, Pareto and budget columns are added to model_report so they
+        end up in the search report.
+
+        Returns:
+        - name (str): The selected model family.
+        - selection (dict): The budget, the Pareto frontier and whether the budget had to be ignored.
+        """
+        config = self.model_trainer_config
+        measure_memory = config.profile_resident_memory
+        if measure_memory is None:
+            measure_memory = config.max_resident_memory_mb is not None
+        profiler_config = ModelProfilerConfig(batch_size=config.profile_batch_size, measure_memory=measure_memory)
+        candidates = {}
+        for name, report in model_report.items():
+            logging.info(f"Profiling model: {name}")
+            profile = profile_model(report["model"], X_test, profiler_config)
+            report.update(profile)
+            candidates[name] = {"test_score": report["test_score"], **profile}
+
+        name, table, selection = select_model(candidates, SelectionBudget(
+            max_single_row_latency_ms=config.max_single_row_latency_ms,
+            max_batch_latency_ms=config.max_batch_latency_ms,
+            max_model_size_mb=config.max_model_size_mb,
+            max_resident_memory_mb=config.max_resident_memory_mb,
+            score_tolerance=config.selection_score_tolerance,
+        ))
+        for candidate_name, row in table.items():
+            for key in ("pareto_optimal", "within_budget", "selected"):
+                model_report[candidate_name][key] = row[key]
+
+        logging.info(
+            f"Selected {name}: {table[name]['single_row_latency_ms']:.3f} ms per row, "
+            f"{table[name]['model_size_mb']:.2f} MB, Pareto frontier: {selection['pareto_frontier']}"
+        )
+        return name, selection
+
+    def initiate_model_trainer(self,X_train,y_train,X_test,y_test,preprocessor_path):
+        """
+        Searches the candidate models and saves the best one.
+
+        The features (dense or CSR) and the targets come separately from
+        DataTransformation; features are only densified for the estimators
+        that don't accept sparse input.
+        """
+        try:
+            logging.info("Received training and testing data")
+
+            models = self.get_candidate_models()
 
             logging.info("Intiating the Model Hyperparameter Tuning...")
-            params = {
-                "RandomFores Regressor": {
-                    "n_estimators": [8,12,32,64,128,256],
-                    "max_depth": [10, 20]
-                },
-                "DecisionTree Regressor": {
-                    "max_depth": [10, 20],
-                    "min_samples_split": [2, 5],
-                    'criterion': ['squared_error', 'absolute_error']
-                },
-                "K-Neighbors Regressor": {
-                    "n_neighbors": [3, 5, 7]
-                },
-                "Linear Regression": {},
-                "XGBRegressor ": {
-                    "n_estimators": [100, 200],
-                    "learning_rate": [0.01, 0.1, 0.2],
-                    "max_depth": [3, 5, 7]
-                },
-                "CatBoosting Classifier": {
-                    "iterations": [100, 200],
-                    "depth": [6, 8]
-                },
-                "GradientBoosting Regressor": {
-                    "n_estimators": [100, 200],
-                    "learning_rate": [0.01, 0.1, 0.2,],
-                },
-                "AdaBoost Regressor": {
-                    "n_estimators": [50, 100],
-                    "learning_rate": [0.01, 0.1, 0.2]
-                }
-            }
+            params = self.get_param_grids()
 
-            model_report:dict = evaluate_models(
-                X_train=X_train,
-                y_train=y_train,
-                X_test=X_test,
-                y_test=y_test,
-                models=models,
-                params=params,
-            )
+            cv_cache_config = None
+            if self.model_trainer_config.cv_cache_dir:
+                cv_cache_config = CVCacheConfig(
+                    cache_dir=self.model_trainer_config.cv_cache_dir,
+                    max_bytes=self.model_trainer_config.cv_cache_max_bytes,
+                )
 
-            # TO get the best model score from the model report
-            best_model_score = max(sorted(model_report.values()))
+            search_start_time = time.perf_counter()
+            if self.model_trainer_config.search_mode == "halving":
+                # Time-budgeted successive halving across all model families together
+                model_report, search_report = successive_halving_search(
+                    X_train=X_train,
+                    y_train=y_train,
+                    X_test=X_test,
+                    y_test=y_test,
+                    models=models,
+                    params=params,
+                    time_budget=self.model_trainer_config.search_time_budget,
+                    n_jobs=self.model_trainer_config.search_n_cores,
+                    cv_cache_config=cv_cache_config,
+                    # Every family's best configuration is profiled against the budgets, like in grid mode
+                    refit_family_best=self.model_trainer_config.profile_candidates,
+                )
+            elif self.model_trainer_config.search_mode == "grid":
+                model_report:dict = evaluate_models(
+                    X_train=X_train,
+                    y_train=y_train,
+                    X_test=X_test,
+                    y_test=y_test,
+                    models=models,
+                    params=params,
+                    n_cores=self.model_trainer_config.search_n_cores,
+                    cv_cache_config=cv_cache_config,
+                    fold_store_config=FoldStoreConfig(
+                        store_dir=self.model_trainer_config.fold_store_dir
+                    ) if self.model_trainer_config.share_cv_folds else None,
+                )
+                # Per-configuration entries in the format of the halving report, once for all families
+                evaluations = [
+                    evaluation for report in model_report.values() for evaluation in report.pop("evaluations")
+                ]
+                search_report = {
+                    "mode": "grid",
+                    "n_candidates": sum(report["n_configs"] for report in model_report.values()),
+                    "n_evaluations": len(evaluations),
+                    "fits_skipped": sum(report["fits_skipped"] for report in model_report.values()),
+                    "total_time": time.perf_counter() - search_start_time,
+                    "evaluations": evaluations,
+                }
+            else:
+                raise ValueError(f"Unknown search mode: {self.model_trainer_config.search_mode}")
+
+            if self.model_trainer_config.profile_candidates:
+                best_model_name, search_report["selection"] = self.select_candidate(model_report, X_test)
+            else:
+                # TO get the best model score from the model report
+                best_model_name = max(model_report, key=lambda name: model_report[name]["test_score"])
 
-            best_model_name = list(model_report.keys())[
-                list(model_report.values()).index(best_model_score)
-            ]
+            save_search_report(self.model_trainer_config.search_report_file_path, model_report, search_report)
+            best_model_score = model_report[best_model_name]["test_score"]
 
-            best_model = models[best_model_name]
+            # The refitted best estimator of the search, not the unfitted template
+            best_model = model_report[best_model_name]["model"]
 
             logging.info(f"Best model found: {best_model_name} with score: {best_model_score}")
 
@@ -115,9 +259,23 @@ class ModelTrainer:
                 obj=best_model
             )
 
+            # The registry only serves the model with the preprocessor it was trained with
+            save_model_metadata(self.model_trainer_config.trained_mode_file_path, preprocessor_path)
             logging.info(f"Model saved at {self.model_trainer_config.trained_mode_file_path}")
 
-            predicted = best_model.predict(X_test)
+            if self.model_trainer_config.model_artifact_path:
+                save_model_artifact(best_model, ModelArtifactConfig(
+                    artifact_path=self.model_trainer_config.model_artifact_path
+                ), preprocessor_path=preprocessor_path)
+
+            if self.model_trainer_config.export_score_table:
+                score_table_report = ScoreTableExporter(ScoreTableConfig(
+                    model_file_path=self.model_trainer_config.trained_mode_file_path,
+                    preprocessor_file_path=preprocessor_path,
+                )).initiate_export()
+                logging.info(f"Score table report: {score_table_report}")
+
+            predicted = best_model.predict(prepare_features(best_model, X_test))
             r2 = r2_score(y_test, predicted)
 
             logging.info(f"R2 Score of the best model: {r2}")
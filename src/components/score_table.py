@@ -0,0 +1,255 @@
+# src/components/score_table.py
+import os
+import sys
+import json
+import time
+import itertools
+from dataclasses import dataclass, asdict
+from multiprocessing import Pool
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import load_object, prepare_features
+
+
+CATEGORICAL_FIELDS = [
+    "gender",
+    "race_ethnicity",
+    "parental_level_of_education",
+    "lunch",
+    "test_preparation_course",
+]
+SCORE_FIELDS = ["reading_score", "writing_score"]
+
+
+@dataclass
+class ScoreTableConfig:
+    """
+    Configuration class for the precomputed score table.
+    """
+    table_file_path: str = os.path.join("artifacts", "score_table.f32")
+    layout_file_path: str = os.path.join("artifacts", "score_table.json")
+    model_file_path: str = os.path.join("artifacts", "trained_model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    score_min: int = 0
+    score_max: int = 100
+    # Categorical combinations scored per task (each one covers every score pair)
+    combinations_per_task: int = 8
+    # Number of worker processes, None uses every core
+    n_jobs: int = None
+
+
+# Per-process state of the export workers
+_worker = {}
+
+
+def _init_worker(config, layout):
+    from src.pipeline.compiled_encoder import CompiledEncoder
+
+    preprocessor = load_object(config["preprocessor_file_path"])
+    try:
+        encoder = CompiledEncoder.compile(preprocessor)
+    except Exception:
+        encoder = None
+
+    _worker["model"] = load_object(config["model_file_path"])
+    _worker["preprocessor"] = preprocessor
+    _worker["encoder"] = encoder
+    _worker["layout"] = layout
+    _worker["table"] = np.memmap(
+        config["table_file_path"], dtype=np.float32, mode="r+", shape=tuple(layout["shape"])
+    )
+
+
+def _score_combinations(task):
+    """
+    Scores a range of categorical combinations against every score pair and
+    writes the results straight into the memory-mapped table.
+    """
+    start, stop = task
+    layout = _worker["layout"]
+    categories = layout["categories"]
+    scores = np.arange(layout["score_min"], layout["score_max"] + 1, dtype=np.float64)
+    n_scores = len(scores)
+
+    combinations = list(itertools.product(*[categories[field] for field in CATEGORICAL_FIELDS]))[start:stop]
+    n_rows = len(combinations) * n_scores * n_scores
+
+    # Structured block: every combination repeated for the full reading x writing grid
+    data = np.empty(n_rows, dtype=[(field, object) for field in CATEGORICAL_FIELDS]
+                    + [(field, np.float64) for field in SCORE_FIELDS])
+    for i, field in enumerate(CATEGORICAL_FIELDS):
+        data[field] = np.repeat(np.array([combination[i] for combination in combinations], dtype=object), n_scores * n_scores)
+    data["reading_score"] = np.tile(np.repeat(scores, n_scores), len(combinations))
+    data["writing_score"] = np.tile(scores, len(combinations) * n_scores)
+
+    if _worker["encoder"] is not None:
+        features = _worker["encoder"].transform_structured(data)
+    else:
+        import pandas as pd
+        features = prepare_features(_worker["model"], _worker["preprocessor"].transform(pd.DataFrame(data)))
+
+    predictions = np.asarray(_worker["model"].predict(features), dtype=np.float32)
+
+    flat = _worker["table"].reshape(-1, n_scores * n_scores)
+    flat[start:stop] = predictions.reshape(len(combinations), n_scores * n_scores)
+    flat.flush()
+    return n_rows
+
+
+class ScoreTableExporter:
+    """
+    Scores the whole finite input domain (every category combination and every
+    integer reading/writing score) with the trained model and stores it as a
+    dense float32 table that the serving path can memory-map.
+    """
+    def __init__(self, config: ScoreTableConfig = None):
+        self.score_table_config = config or ScoreTableConfig()
+
+    def initiate_export(self):
+        """
+        Builds the score table in parallel and writes the table and its layout file.
+
+        Returns:
+        - report (dict): Build time, table shape and size on disk.
+        """
+        try:
+            from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+
+            logging.info("Entered the score table export method/component.")
+            start_time = time.perf_counter()
+            config = self.score_table_config
+
+            preprocessor = load_object(config.preprocessor_file_path)
+            column_categories = dict(zip(
+                preprocessor.named_transformers_["cat_pipeline"].feature_names_in_,
+                preprocessor.named_transformers_["cat_pipeline"].named_steps["onehotencoder"].categories_,
+            ))
+            categories = {field: column_categories[field].tolist() for field in CATEGORICAL_FIELDS}
+            n_scores = config.score_max - config.score_min + 1
+            shape = [len(categories[field]) for field in CATEGORICAL_FIELDS] + [n_scores, n_scores]
+            n_combinations = int(np.prod(shape[:len(CATEGORICAL_FIELDS)]))
+
+            layout = {
+                "fields": CATEGORICAL_FIELDS + SCORE_FIELDS,
+                "categories": categories,
+                "score_min": config.score_min,
+                "score_max": config.score_max,
+                "shape": shape,
+                "dtype": "float32",
+                # Without the previous table's layout, which this export replaces
+                "model_version": ModelRegistry(ModelRegistryConfig(
+                    model_path=config.model_file_path,
+                    preprocessor_path=config.preprocessor_file_path,
+                    score_table_path=config.table_file_path,
+                    score_table_layout_path=config.layout_file_path,
+                )).current_version(include_score_table=False),
+            }
+
+            os.makedirs(os.path.dirname(config.table_file_path), exist_ok=True)
+            table = np.memmap(config.table_file_path, dtype=np.float32, mode="w+", shape=tuple(shape))
+            del table
+
+            tasks = [
+                (start, min(start + config.combinations_per_task, n_combinations))
+                for start in range(0, n_combinations, config.combinations_per_task)
+            ]
+            n_jobs = config.n_jobs or os.cpu_count()
+            logging.info(f"Scoring {n_combinations * n_scores * n_scores} points in {len(tasks)} tasks on {n_jobs} processes")
+
+            with Pool(processes=n_jobs, initializer=_init_worker, initargs=(asdict(config), layout)) as pool:
+                n_rows = sum(pool.imap_unordered(_score_combinations, tasks))
+
+            build_time = time.perf_counter() - start_time
+            layout["rows"] = n_rows
+            layout["build_time"] = build_time
+            layout["size_bytes"] = os.path.getsize(config.table_file_path)
+
+            # The layout is written last, a table without its layout is never served
+            tmp_layout_path = f"{config.layout_file_path}.tmp"
+            with open(tmp_layout_path, "w") as file_obj:
+                json.dump(layout, file_obj, indent=2)
+            os.replace(tmp_layout_path, config.layout_file_path)
+
+            report = {
+                "rows": n_rows,
+                "build_time": build_time,
+                "size_bytes": layout["size_bytes"],
+                "n_jobs": n_jobs,
+            }
+            logging.info(f"Score table exported: {report}")
+            return report
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+class ScoreTable:
+    """
+    Read-only memory-mapped score table. lookup returns None for records
+    outside the table's domain (unknown categories, missing, fractional or
+    out of range scores), which must be scored by the live model.
+    """
+    def __init__(self, table, layout):
+        self.table = table
+        self.layout = layout
+        self.model_version = layout["model_version"]
+        self._indexes = [
+            {category: i for i, category in enumerate(layout["categories"][field])}
+            for field in CATEGORICAL_FIELDS
+        ]
+        self._score_min = layout["score_min"]
+        self._score_max = layout["score_max"]
+
+    @classmethod
+    def load(cls, config: ScoreTableConfig = None):
+        """
+        Memory-maps the table described by the layout file, or returns None if
+        no table was exported.
+        """
+        config = config or ScoreTableConfig()
+        if not os.path.exists(config.layout_file_path):
+            return None
+        try:
+            with open(config.layout_file_path) as file_obj:
+                layout = json.load(file_obj)
+            table = np.memmap(config.table_file_path, dtype=np.float32, mode="r", shape=tuple(layout["shape"]))
+            return cls(table, layout)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _score_index(self, value):
+        if value is None:
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        if not value.is_integer() or not self._score_min <= value <= self._score_max:
+            return None
+        return int(value) - self._score_min
+
+    def lookup(self, record):
+        """
+        Returns the precomputed prediction for a record, or None if it is out of domain.
+        """
+        index = []
+        for field, category_index in zip(CATEGORICAL_FIELDS, self._indexes):
+            value = record.get(field)
+            position = category_index.get(value) if isinstance(value, str) else None
+            if position is None:
+                return None
+            index.append(position)
+        for field in SCORE_FIELDS:
+            position = self._score_index(record.get(field))
+            if position is None:
+                return None
+            index.append(position)
+        return float(self.table[tuple(index)])
+
+
+# Run for testing
+if __name__ == "__main__":
+    report = ScoreTableExporter().initiate_export()
+    print(f"Score table report: {report}")
@@ -1,23 +1,195 @@
 import logging
+import logging.handlers
 import os
+import sys
+import queue
+import atexit
+import itertools
+import threading
 from datetime import datetime
 
 # Create 'logs' directory if it doesn't exist
 logs_dir = os.path.join(os.getcwd(), "logs")
 os.makedirs(logs_dir, exist_ok=True)
 
-# Create log file path with timestamp
-LOG_FILE = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
-LOG_FILE_PATH = os.path.join(logs_dir, LOG_FILE)
+LOG_FORMAT = '[%(asctime)s] [Line:%(lineno)d] [%(name)s] - %(levelname)s - %(message)s'
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# "size" rotates at LOG_MAX_BYTES, "time" rotates every LOG_ROTATE_WHEN (e.g. "midnight", "H")
+LOG_ROTATION = os.environ.get("LOG_ROTATION", "size")
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_ROTATE_WHEN = os.environ.get("LOG_ROTATE_WHEN", "midnight")
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 5))
+# Fraction of the per-request messages (the "request" logger) that are written
+LOG_REQUEST_SAMPLE_RATE = float(os.environ.get("LOG_REQUEST_SAMPLE_RATE", 0.01))
+
+
+def _log_file_path():
+    # One file per process: pre-forked workers never write into the same file
+    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    return os.path.join(logs_dir, f"{timestamp}_{os.getpid()}.log")
+
+
+LOG_FILE_PATH = _log_file_path()
+LOG_FILE = os.path.basename(LOG_FILE_PATH)
+
+
+def _file_handler(file_path):
+    if LOG_ROTATION == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            file_path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that hands the record over unformatted. The queue is
+    in-process, so the %-style message and any traceback are rendered by the
+    listener thread instead of the thread that logged.
+    """
+    def prepare(self, record):
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one record out of every 1/rate per message template. Warnings and
+    errors are always kept.
+    """
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counters = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        counter = self._counters.get(record.msg)
+        if counter is None:
+            counter = self._counters.setdefault(record.msg, itertools.count())
+        return next(counter) % self.every == 0
+
+
+class _QueueLogging:
+    """
+    Routes every record of the root logger through a queue to a background
+    thread that writes the rotating log file, so logging never blocks a
+    request on disk I/O. After a fork the child starts its own listener and
+    its own file.
+    """
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = _DeferredQueueHandler(self.queue)
+        self.listener = None
+        self._lock = threading.Lock()
+
+    def start(self, file_path):
+        with self._lock:
+            self.file_handler = _file_handler(file_path)
+            self.listener = logging.handlers.QueueListener(self.queue, self.file_handler, respect_handler_level=True)
+            self.listener.start()
+
+    def stop(self):
+        with self._lock:
+            if self.listener is not None:
+                # Drains the queue before returning
+                self.listener.stop()
+                self.listener = None
+                self.file_handler.close()
+
+    def after_fork_in_child(self):
+        global LOG_FILE_PATH, LOG_FILE
+        # The parent's listener thread doesn't exist in the child, records it had
+        # not written yet are the parent's to write
+        self.queue = queue.SimpleQueue()
+        self.queue_handler.queue = self.queue
+        self.listener = None
+        self._lock = threading.Lock()
+        LOG_FILE_PATH = _log_file_path()
+        LOG_FILE = os.path.basename(LOG_FILE_PATH)
+        self.start(LOG_FILE_PATH)
+        # multiprocessing children leave through os._exit and skip atexit
+        mp_util = sys.modules.get("multiprocessing.util")
+        if mp_util is not None:
+            mp_util.Finalize(self, _QueueLogging.stop, args=(self,), exitpriority=-100)
+
+
+queue_logging = _QueueLogging()
+queue_logging.start(LOG_FILE_PATH)
+atexit.register(queue_logging.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=queue_logging.after_fork_in_child)
 
 # Configure logging
 logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format='[%(asctime)s] [Line:%(lineno)d] [%(name)s] - %(levelname)s - %(message)s',
-    level=logging.INFO
+    handlers=[queue_logging.queue_handler],
+    level=LOG_LEVEL
 )
 
+# High-volume per-request messages go through this logger and are sampled
+request_logger = logging.getLogger("request")
+request_logger.addFilter(SamplingFilter(LOG_REQUEST_SAMPLE_RATE))
+
+
+def _overhead_benchmark(n_requests=2_000):
+    """
+    Per-request cost of the log calls of one /predict before this logger
+    (synchronous FileHandler, eager f-strings including the DataFrame repr)
+    and with it (queued, lazy %-style, sampled request messages).
+    """
+    import time
+    import tempfile
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "gender": ["female"], "race_ethnicity": ["group B"], "parental_level_of_education": ["bachelor's degree"],
+        "lunch": ["standard"], "test_preparation_course": ["none"], "reading_score": [72.0], "writing_score": [74.0],
+    })
+    features = df.iloc[0].to_dict()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        old_logger = logging.getLogger("benchmark.old")
+        old_logger.propagate = False
+        old_handler = logging.FileHandler(os.path.join(tmp_dir, "old.log"))
+        old_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        old_logger.addHandler(old_handler)
+        old_logger.setLevel(logging.INFO)
+
+        def old_request():
+            old_logger.info("Converting custom data to DataFrame...")
+            old_logger.info(f"Custom data converted to DataFrame: {df}")
+            old_logger.info("Starting prediction pipeline...")
+            old_logger.info("Prediction pipeline completed successfully.")
+            print(features, file=devnull)
+            print(66.1, file=devnull)
+
+        def new_request():
+            logging.debug("Custom data converted to DataFrame: %s", df)
+            request_logger.info("Prediction input: %s", features)
+            request_logger.info("Prediction result: %s", 66.1)
+
+        results = {}
+        with open(os.devnull, "w") as devnull:
+            for label, request in (("before", old_request), ("after", new_request)):
+                start = time.perf_counter()
+                for _ in range(n_requests):
+                    request()
+                results[label] = (time.perf_counter() - start) / n_requests
+        old_handler.close()
+    return results
+
+
 # Optional testing
 if __name__ == "__main__":
     logging.info("Logger initialized successfully.")
     logging.debug("This is a debug message.")
+    if "--benchmark" in sys.argv:
+        results = _overhead_benchmark()
+        print(f"Log calls per request before: {results['before'] * 1e6:.1f} us, after: {results['after'] * 1e6:.1f} us")
@@ -0,0 +1,354 @@
+# src/pipeline/async_api.py
+import sys
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging, request_logger
+from src.pipeline.predict_pipeline import CustomData, PredictPipeline, RecordValidationError
+from src.pipeline.metrics import observe_request, render_metrics
+from src.pipeline.serving import readiness, warm_up
+
+
+@dataclass
+class AsyncApiConfig:
+    """
+    Configuration class for the asynchronous JSON prediction API.
+    """
+    # Threads running preprocessor.transform/model.predict
+    max_workers: int = 4
+    # Requests allowed to wait for a free scoring thread, beyond that the API answers 429
+    max_queue: int = 64
+    # Budget in seconds for reading the body and scoring, answered with 504 when exceeded
+    request_timeout: float = 2.0
+    max_body_bytes: int = 1024 * 1024
+    # Largest JSON array of records accepted in one request
+    max_records: int = 1000
+    retry_after_seconds: int = 1
+    warm_up_on_startup: bool = True
+
+
+def _json_response(status, content, headers=()):
+    return status, json.dumps(content).encode(), [(b"content-type", b"application/json"), *headers]
+
+
+class AsyncPredictionApi:
+    """
+    ASGI application serving JSON predictions next to the Flask form app:
+
+        uvicorn src.pipeline.async_api:app
+
+    The event loop only reads and validates requests, so a slow client costs a
+    coroutine instead of a worker thread. Scoring runs on a bounded thread
+    pool; when max_workers + max_queue requests are already scoring or waiting
+    for a thread, new ones are answered 429 right away instead of queueing.
+
+    Routes: POST /v1/predict (a CustomData object or an array of them),
+    GET /ready and GET /metrics.
+    """
+    def __init__(self, config: AsyncApiConfig = None, predict_pipeline=None):
+        self.async_api_config = config or AsyncApiConfig()
+        self.predict_pipeline = predict_pipeline
+        self._executor = None
+        # Only changed on the event loop thread
+        self._pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _scoring_executor(self):
+        # Created on first use, so a process forked after import gets its own threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.async_api_config.max_workers, thread_name_prefix="async-predict"
+            )
+        return self._executor
+
+    def _score(self, records):
+        if self.predict_pipeline is None:
+            self.predict_pipeline = PredictPipeline()
+        return self.predict_pipeline.predict_records(records).tolist()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        start = time.perf_counter()
+        endpoint, (status, body, headers) = await self._dispatch(scope, receive)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+        observe_request(endpoint, scope["method"], status, time.perf_counter() - start)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.async_api_config.warm_up_on_startup:
+                    try:
+                        await asyncio.get_running_loop().run_in_executor(None, warm_up)
+                    except Exception as e:
+                        await send({"type": "lifespan.startup.failed", "message": str(e)})
+                        return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope, receive):
+        path, method = scope["path"], scope["method"]
+        if path == "/v1/predict":
+            if method != "POST":
+                return "async_predict", _json_response(405, {"error": "Method not allowed"})
+            return "async_predict", await self._predict(receive)
+        if path == "/ready" and method == "GET":
+            status = readiness()
+            return "async_ready", _json_response(200 if status["ready"] else 503, status)
+        if path == "/metrics" and method == "GET":
+            return "async_metrics", (200, render_metrics().encode(), [(b"content-type", b"text/plain; version=0.0.4")])
+        return "unknown", _json_response(404, {"error": "Not found"})
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.async_api_config.max_body_bytes:
+                raise ValueError("Request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _predict(self, receive):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.async_api_config.request_timeout
+
+        try:
+            body = await asyncio.wait_for(self._read_body(receive), self.async_api_config.request_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return _json_response(504, {"error": "Timed out reading the request"})
+        except ValueError as e:
+            return _json_response(413, {"error": str(e)})
+        if body is None:
+            return _json_response(400, {"error": "Client disconnected"})
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return _json_response(400, {"error": "Body is not valid JSON"})
+
+        batch = isinstance(payload, list)
+        payloads = payload if batch else [payload]
+        if len(payloads) > self.async_api_config.max_records:
+            return _json_response(413, {"error": f"At most {self.async_api_config.max_records} records per request"})
+        try:
+            records = [CustomData.validate_record(item) for item in payloads]
+        except RecordValidationError as e:
+            return _json_response(422, {"error": "Invalid record", "fields": e.errors})
+
+        # Backpressure: refuse instead of queueing work that would miss its deadline anyway
+        if self._pending >= self.async_api_config.max_workers + self.async_api_config.max_queue:
+            self.rejected += 1
+            return _json_response(
+                429, {"error": "Too many requests"},
+                [(b"retry-after", str(self.async_api_config.retry_after_seconds).encode())],
+            )
+
+        self._pending += 1
+        future = self._scoring_executor().submit(self._score, records)
+        # Released when the thread is done, not when the caller gives up, so a
+        # timed-out request keeps counting until its scoring actually finishes
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            # Cancelling the wrapper cancels the scoring if it has not started yet
+            predictions = await asyncio.wait_for(asyncio.wrap_future(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return _json_response(504, {"error": "Timed out scoring the request"})
+        except Exception as e:
+            logging.error("Async prediction failed: %s", e)
+            return _json_response(500, {"error": "Prediction failed"})
+
+        request_logger.info("Async prediction of %d records", len(records))
+        if batch:
+            return _json_response(200, {"predictions": predictions})
+        return _json_response(200, {"prediction": predictions[0]})
+
+    def _release(self):
+        self._pending -= 1
+
+    def stats(self):
+        return {"pending": self._pending, "rejected": self.rejected, "timed_out": self.timed_out}
+
+
+app = AsyncPredictionApi()
+
+
+def _percentiles(latencies):
+    import numpy as np
+
+    latencies = np.asarray(latencies)
+    return {
+        "p50_seconds": float(np.percentile(latencies, 50)),
+        "p99_seconds": float(np.percentile(latencies, 99)),
+    }
+
+
+async def _asgi_client(api, bodies, client_delay, latencies, statuses):
+    for body in bodies:
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                # A slow client: the body arrives client_delay after the request starts
+                await asyncio.sleep(client_delay)
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Event().wait()
+
+        response = {}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+
+        start = time.perf_counter()
+        await api({"type": "http", "method": "POST", "path": "/v1/predict", "headers": []}, receive, send)
+        latencies.append(time.perf_counter() - start)
+        statuses[response["status"]] = statuses.get(response["status"], 0) + 1
+
+
+def _run_asgi(api, requests, n_clients, client_delay):
+    async def main():
+        latencies, statuses = [], {}
+        await asyncio.gather(*(
+            _asgi_client(api, requests[i::n_clients], client_delay, latencies, statuses) for i in range(n_clients)
+        ))
+        return latencies, statuses
+
+    start = time.perf_counter()
+    latencies, statuses = asyncio.run(main())
+    return latencies, statuses, time.perf_counter() - start
+
+
+def _run_flask(flask_app, forms, n_clients, client_delay, threads):
+    import io
+    import threading
+    from werkzeug.test import EnvironBuilder
+
+    class SlowInput(io.BytesIO):
+        def __init__(self, data):
+            super().__init__(data)
+            self.waited = False
+
+        def _wait(self):
+            if not self.waited:
+                # The worker thread is held while the slow client uploads the body
+                time.sleep(client_delay)
+                self.waited = True
+
+        def read(self, *args):
+            self._wait()
+            return super().read(*args)
+
+        def readinto(self, buffer):
+            self._wait()
+            return super().readinto(buffer)
+
+    def handle(form):
+        environ = EnvironBuilder(method="POST", path="/predict", data=form).get_environ()
+        environ["wsgi.input"] = SlowInput(environ["wsgi.input"].read())
+        status = []
+        response = flask_app.wsgi_app(environ, lambda code, headers, exc_info=None: status.append(code))
+        try:
+            b"".join(response)
+        finally:
+            getattr(response, "close", lambda: None)()
+        return int(status[0].split()[0])
+
+    # The gthread pool of one worker: threads handle requests, clients wait for them
+    server = ThreadPoolExecutor(max_workers=threads)
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def client(client_forms):
+        for form in client_forms:
+            start = time.perf_counter()
+            code = server.submit(handle, form).result()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses[code] = statuses.get(code, 0) + 1
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(forms[i::n_clients],)) for i in range(n_clients)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    return latencies, statuses, elapsed
+
+
+def concurrency_benchmark(n_clients=64, n_requests=2000, client_delay_ms=20.0, threads=8):
+    """
+    Serves the same load of concurrent slow clients (each request body arrives
+    client_delay_ms after the request starts) through the Flask /predict form
+    route on a pool of `threads` threads, like one gthread worker, and through
+    the async JSON API with max_workers=threads scoring threads.
+
+    Returns:
+    - report (dict): Throughput, p50 and p99 latency and status counts per API.
+    """
+    try:
+        import app as flask_module
+        from src.pipeline.serving import _sample_form
+        from src.pipeline.prediction_cache import get_prediction_cache
+
+        warm_up()
+        forms = [_sample_form(i) for i in range(n_requests)]
+        client_delay = client_delay_ms / 1000
+
+        report = {"n_clients": n_clients, "n_requests": n_requests, "client_delay_ms": client_delay_ms, "threads": threads}
+
+        # Both runs share the process-wide prediction cache, each starts from an empty one
+        get_prediction_cache().clear()
+        latencies, statuses, elapsed = _run_flask(flask_module.app, forms, n_clients, client_delay, threads)
+        report["flask"] = {"throughput_rps": n_requests / elapsed, "statuses": statuses, **_percentiles(latencies)}
+
+        api = AsyncPredictionApi(AsyncApiConfig(max_workers=threads, warm_up_on_startup=False))
+        bodies = [
+            json.dumps({**form, "reading_score": float(form["reading_score"]), "writing_score": float(form["writing_score"])}).encode()
+            for form in forms
+        ]
+        get_prediction_cache().clear()
+        latencies, statuses, elapsed = _run_asgi(api, bodies, n_clients, client_delay)
+        report["async"] = {"throughput_rps": n_requests / elapsed, "statuses": statuses, **_percentiles(latencies)}
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+# Run for testing: concurrency benchmark against the Flask form route
+if __name__ == "__main__":
+    report = concurrency_benchmark()
+    print(f"{report['n_clients']} clients, {report['n_requests']} requests, "
+          f"{report['client_delay_ms']:.0f} ms client delay, {report['threads']} threads")
+    print(f"{'api':<8}{'req/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}  statuses")
+    for name in ("flask", "async"):
+        result = report[name]
+        print(f"{name:<8}{result['throughput_rps']:>10.1f}{result['p50_seconds'] * 1e3:>12.1f}"
+              f"{result['p99_seconds'] * 1e3:>12.1f}  {result['statuses']}")
@@ -0,0 +1,272 @@
+# src/pipeline/batch_score.py
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.model_registry import get_model_registry
+from src.pipeline.predict_pipeline import CustomData, PredictPipeline, PredictPipelineConfig
+
+
+@dataclass
+class BatchScoreConfig:
+    """
+    Configuration class for offline batch scoring.
+    """
+    # Rows read, shipped to a worker and scored at once
+    chunk_size: int = 10000
+    # Worker processes, None uses every available core
+    n_workers: int = None
+    # Chunks read ahead of the writer per worker; with the chunk size this bounds memory
+    chunks_in_flight_per_worker: int = 2
+    # Copy the input columns into the output next to the prediction
+    keep_columns: bool = False
+    prediction_column: str = "prediction"
+
+
+class _PinnedRegistry:
+    """
+    Serves one LoadedModel for the whole job, so a retraining that lands
+    mid-file can't score part of it with another version.
+    """
+    def __init__(self, loaded):
+        self.loaded = loaded
+
+    def get(self):
+        return self.loaded
+
+
+_worker_pipeline = None
+
+
+def _init_worker(version):
+    global _worker_pipeline
+    # Loads the artifacts once per worker; forked workers inherit them from the parent
+    loaded = get_model_registry().get()
+    if loaded.version != version:
+        raise RuntimeError(f"Worker loaded model version {loaded.version}, the job runs {version}")
+    _worker_pipeline = PredictPipeline(
+        registry=_PinnedRegistry(loaded), config=PredictPipelineConfig(use_prediction_cache=False)
+    )
+
+
+def _score_chunk(chunk):
+    start = time.perf_counter()
+    predictions = _worker_pipeline.predict_batch(chunk, chunk_size=len(chunk) or 1)
+    return os.getpid(), predictions, time.perf_counter() - start
+
+
+def _file_format(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type {extension!r}, expected .csv or .parquet")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet files require pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def read_chunks(file_path, chunk_size):
+    """
+    Yields the rows of a CSV or Parquet file as DataFrames of at most chunk_size rows.
+    """
+    if _file_format(file_path) == "parquet":
+        pyarrow = _import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(file_path)
+        columns = [col for col in CustomData.feature_columns if col in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, chunksize=chunk_size)
+
+
+class _OutputWriter:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.file_format = _file_format(file_path)
+        self._parquet_writer = None
+        self._csv_header = True
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        if self.file_format == "csv" and os.path.exists(file_path):
+            os.remove(file_path)
+
+    def write(self, df):
+        if self.file_format == "parquet":
+            pyarrow = _import_pyarrow()
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pyarrow.parquet.ParquetWriter(self.file_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.file_path, mode="a", header=self._csv_header, index=False)
+            self._csv_header = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def batch_score(input_path, output_path, config: BatchScoreConfig = None):
+    """
+    Scores every row of input_path and writes the predictions to output_path
+    in input order.
+
+    Chunks are read lazily and fanned out to a process pool. At most
+    n_workers * chunks_in_flight_per_worker chunks are read but not yet
+    written, so memory stays bounded whatever the input size.
+
+    Parameters:
+    - input_path (str): CSV or Parquet file with the CustomData columns.
+    - output_path (str): CSV or Parquet file to write.
+    - config (BatchScoreConfig): Chunk size, workers and output options.
+
+    Returns:
+    - report (dict): Rows, wall time, rows/sec and the utilization of every worker.
+    """
+    try:
+        config = config or BatchScoreConfig()
+        n_workers = config.n_workers or _available_cores()
+        max_in_flight = n_workers * config.chunks_in_flight_per_worker
+
+        # Loaded in the parent first: forked workers share it and every worker checks the version
+        version = get_model_registry().get().version
+        logging.info(f"Batch scoring {input_path} with model version {version} on {n_workers} workers")
+
+        start = time.perf_counter()
+        n_rows = 0
+        busy_seconds = {}
+        writer = _OutputWriter(output_path)
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=context, initializer=_init_worker, initargs=(version,)
+        ) as executor:
+            pending = deque()
+
+            def write_oldest():
+                nonlocal n_rows
+                chunk, future = pending.popleft()
+                pid, predictions, seconds = future.result()
+                busy_seconds[pid] = busy_seconds.get(pid, 0.0) + seconds
+                output = chunk.reset_index(drop=True) if config.keep_columns else pd.DataFrame(index=range(len(chunk)))
+                output[config.prediction_column] = predictions
+                writer.write(output)
+                n_rows += len(chunk)
+
+            try:
+                for chunk in read_chunks(input_path, config.chunk_size):
+                    if len(pending) >= max_in_flight:
+                        write_oldest()
+                    # Without keep_columns only the features are kept until the chunk is written
+                    payload = chunk if config.keep_columns else chunk[[]]
+                    pending.append((payload, executor.submit(_score_chunk, chunk)))
+                while pending:
+                    write_oldest()
+            finally:
+                writer.close()
+
+        elapsed = time.perf_counter() - start
+        report = {
+            "input_path": input_path,
+            "output_path": output_path,
+            "model_version": version,
+            "rows": n_rows,
+            "seconds": elapsed,
+            "rows_per_second": n_rows / elapsed if elapsed else 0.0,
+            "n_workers": n_workers,
+            "chunk_size": config.chunk_size,
+            # Share of the wall time each worker spent scoring
+            "worker_utilization": {str(pid): busy / elapsed for pid, busy in sorted(busy_seconds.items())},
+        }
+        logging.info(f"Batch scored {n_rows} rows in {elapsed:.2f}s ({report['rows_per_second']:.0f} rows/s)")
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def scaling_benchmark(input_path, output_path, worker_counts=None, config: BatchScoreConfig = None):
+    """
+    Runs batch_score with 1 to N workers (every available core by default)
+    and reports the throughput and speedup of each run.
+    """
+    config = config or BatchScoreConfig()
+    worker_counts = worker_counts or list(range(1, _available_cores() + 1))
+    results = []
+    for n_workers in worker_counts:
+        report = batch_score(input_path, output_path, BatchScoreConfig(
+            chunk_size=config.chunk_size,
+            n_workers=n_workers,
+            chunks_in_flight_per_worker=config.chunks_in_flight_per_worker,
+            keep_columns=config.keep_columns,
+            prediction_column=config.prediction_column,
+        ))
+        results.append(report)
+    baseline = results[0]["rows_per_second"]
+    for report in results:
+        report["speedup"] = report["rows_per_second"] / baseline if baseline else 0.0
+    return results
+
+
+def _peak_rss_mb(who="self"):
+    import resource
+
+    # ru_maxrss is in KB on Linux; RUSAGE_CHILDREN reports the largest finished worker
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    return usage.ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file with the trained model.")
+    parser.add_argument("input_path", help="CSV or Parquet file with the CustomData columns")
+    parser.add_argument("output_path", help="CSV or Parquet file for the predictions, in input order")
+    parser.add_argument("--chunk-size", type=int, default=BatchScoreConfig.chunk_size)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: every core)")
+    parser.add_argument("--keep-columns", action="store_true", help="Copy the input columns into the output")
+    parser.add_argument("--scaling", action="store_true", help="Run with 1 to N workers and report the speedup")
+    args = parser.parse_args(argv)
+
+    config = BatchScoreConfig(chunk_size=args.chunk_size, n_workers=args.workers, keep_columns=args.keep_columns)
+    if args.scaling:
+        worker_counts = list(range(1, args.workers + 1)) if args.workers else None
+        print(f"{'workers':>8}{'rows/s':>12}{'speedup':>9}  utilization")
+        for report in scaling_benchmark(args.input_path, args.output_path, worker_counts, config):
+            utilization = ", ".join(f"{value:.0%}" for value in report["worker_utilization"].values())
+            print(f"{report['n_workers']:>8}{report['rows_per_second']:>12.0f}{report['speedup']:>8.2f}x  {utilization}")
+        return
+
+    report = batch_score(args.input_path, args.output_path, config)
+    print(f"Scored {report['rows']} rows in {report['seconds']:.2f}s "
+          f"({report['rows_per_second']:.0f} rows/s) with model version {report['model_version']}")
+    for pid, utilization in report["worker_utilization"].items():
+        print(f"worker {pid}: {utilization:.0%} busy")
+    print(f"Peak RSS: parent {_peak_rss_mb():.1f} MB, largest worker {_peak_rss_mb('children'):.1f} MB")
+
+
+# Run for testing: python -m src.pipeline.batch_score artifacts/test.csv artifacts/test_predictions.csv
+if __name__ == "__main__":
+    main()
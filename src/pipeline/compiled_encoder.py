@@ -0,0 +1,257 @@
+# src/pipeline/compiled_encoder.py
+import sys
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+def _is_missing(value):
+    return value is None or value != value
+
+
+def _is_nan(value):
+    # SimpleImputer on object columns only treats NaN as missing, None is left as an unknown category
+    return isinstance(value, float) and value != value
+
+
+class CompiledEncoder:
+    """
+    Flat, pandas-free version of the fitted preprocessor built by
+    DataTransformation.get_data_transformer_object.
+
+    All statistics of the ColumnTransformer are precomputed (numeric medians,
+    means and scales, and for every category the position and scaled value of
+    its one-hot entry), so encoding writes features straight into a float array
+    with the same floating point operations sklearn uses.
+    """
+    def __init__(
+        self,
+        numerical_columns,
+        numerical_offsets,
+        numerical_fill,
+        numerical_mean,
+        numerical_scale,
+        categorical_columns,
+        categorical_fill,
+        category_maps,
+        n_features,
+    ):
+        self.numerical_columns = list(numerical_columns)
+        self.numerical_offsets = np.asarray(numerical_offsets, dtype=np.intp)
+        self.numerical_fill = np.asarray(numerical_fill, dtype=np.float64)
+        self.numerical_mean = None if numerical_mean is None else np.asarray(numerical_mean, dtype=np.float64)
+        self.numerical_scale = None if numerical_scale is None else np.asarray(numerical_scale, dtype=np.float64)
+        self.categorical_columns = list(categorical_columns)
+        self.categorical_fill = list(categorical_fill)
+        # One dict per categorical column: category -> (output position, scaled one-hot value)
+        self.category_maps = [dict(category_map) for category_map in category_maps]
+        self.n_features = n_features
+
+        # Plain python scalars for the single-record path
+        self._numerical_items = list(zip(
+            self.numerical_columns,
+            self.numerical_offsets.tolist(),
+            self.numerical_fill.tolist(),
+            [None] * len(self.numerical_columns) if self.numerical_mean is None else self.numerical_mean.tolist(),
+            [None] * len(self.numerical_columns) if self.numerical_scale is None else self.numerical_scale.tolist(),
+        ))
+        self._categorical_items = list(zip(self.categorical_columns, self.categorical_fill, self.category_maps))
+
+    @classmethod
+    def compile(cls, preprocessor):
+        """
+        Builds a CompiledEncoder from a fitted ColumnTransformer with a numerical
+        pipeline (SimpleImputer -> StandardScaler) and a categorical pipeline
+        (SimpleImputer -> OneHotEncoder -> StandardScaler(with_mean=False)).
+
+        Raises:
+        - ValueError: If the preprocessor has a layout the encoder can't reproduce exactly.
+        """
+        numerical = None
+        categorical = None
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "drop":
+                    raise ValueError("Only remainder='drop' is supported")
+                continue
+
+            steps = dict(transformer.named_steps)
+            output_slice = preprocessor.output_indices_[name]
+
+            if "onehotencoder" in steps:
+                categorical = (steps, list(columns), output_slice)
+            else:
+                numerical = (steps, list(columns), output_slice)
+
+        if numerical is None or categorical is None:
+            raise ValueError("Expected a numerical and a categorical pipeline")
+
+        # Numerical block: median imputation then standard scaling
+        steps, numerical_columns, output_slice = numerical
+        if set(steps) - {"imputer", "scaler"}:
+            raise ValueError(f"Unsupported numerical steps: {list(steps)}")
+        numerical_offsets = np.arange(output_slice.start, output_slice.stop)
+        numerical_fill = steps["imputer"].statistics_
+        scaler = steps.get("scaler")
+        numerical_mean = scaler.mean_ if scaler is not None and scaler.with_mean else None
+        numerical_scale = scaler.scale_ if scaler is not None and scaler.with_std else None
+
+        # Categorical block: most frequent imputation, one-hot, then scaling without centering
+        steps, categorical_columns, output_slice = categorical
+        if set(steps) - {"imputer", "onehotencoder", "scaler"}:
+            raise ValueError(f"Unsupported categorical steps: {list(steps)}")
+        encoder = steps["onehotencoder"]
+        if encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("OneHotEncoder with drop or infrequent categories is not supported")
+        if encoder.handle_unknown != "ignore":
+            raise ValueError("Only OneHotEncoder(handle_unknown='ignore') is supported")
+
+        n_categories = sum(len(categories) for categories in encoder.categories_)
+        scaler = steps.get("scaler")
+        if scaler is not None and scaler.with_mean:
+            raise ValueError("Centering of one-hot columns is not supported")
+        if scaler is not None and scaler.scale_ is not None:
+            # Same expression sklearn applies to the sparse one-hot output
+            one_hot_values = 1.0 * (1 / scaler.scale_)
+        else:
+            one_hot_values = np.ones(n_categories)
+
+        category_maps = []
+        position = 0
+        for categories in encoder.categories_:
+            category_maps.append({
+                category: (output_slice.start + position + i, float(one_hot_values[position + i]))
+                for i, category in enumerate(categories.tolist())
+            })
+            position += len(categories)
+
+        categorical_fill = steps["imputer"].statistics_.tolist() if "imputer" in steps else [None] * len(categorical_columns)
+
+        n_features = max(output_slice.stop, numerical[2].stop)
+        logging.info(f"Compiled preprocessor into a flat encoder with {n_features} features")
+
+        return cls(
+            numerical_columns=numerical_columns,
+            numerical_offsets=numerical_offsets,
+            numerical_fill=numerical_fill,
+            numerical_mean=numerical_mean,
+            numerical_scale=numerical_scale,
+            categorical_columns=categorical_columns,
+            categorical_fill=categorical_fill,
+            category_maps=category_maps,
+            n_features=n_features,
+        )
+
+    def transform_record(self, record, out=None):
+        """
+        Encodes one record (a dict with the CustomData fields).
+
+        Parameters:
+        - record (dict): Column name -> raw value.
+        - out (np.ndarray): Optional preallocated array of shape (n_features,) or (1, n_features).
+
+        Returns:
+        - out (np.ndarray): Encoded features of shape (1, n_features).
+        """
+        if out is None:
+            out = np.zeros((1, self.n_features))
+        else:
+            out[...] = 0.0
+        row = out.reshape(-1)
+
+        for column, offset, fill, mean, scale in self._numerical_items:
+            value = record.get(column)
+            value = fill if _is_missing(value) else float(value)
+            if mean is not None:
+                value -= mean
+            if scale is not None:
+                value /= scale
+            row[offset] = value
+
+        for column, fill, category_map in self._categorical_items:
+            value = record.get(column)
+            if _is_nan(value):
+                value = fill
+            # Unknown categories encode as all zeros, like handle_unknown='ignore'
+            entry = category_map.get(value)
+            if entry is not None:
+                row[entry[0]] = entry[1]
+
+        return out.reshape(1, -1)
+
+    def transform_records(self, records):
+        """
+        Encodes a list of dicts into an array of shape (len(records), n_features).
+        """
+        out = np.zeros((len(records), self.n_features))
+        for i, record in enumerate(records):
+            self.transform_record(record, out=out[i])
+        return out
+
+    def transform_structured(self, data, out=None):
+        """
+        Encodes a NumPy structured array (or any mapping of column -> 1-D array,
+        such as a DataFrame) with vectorized operations.
+        """
+        n_rows = len(data[self.numerical_columns[0]] if self.numerical_columns else data[self.categorical_columns[0]])
+        if out is None:
+            out = np.zeros((n_rows, self.n_features))
+        else:
+            out[...] = 0.0
+
+        for i, column in enumerate(self.numerical_columns):
+            values = np.asarray(data[column], dtype=np.float64).copy()
+            values[np.isnan(values)] = self.numerical_fill[i]
+            if self.numerical_mean is not None:
+                values -= self.numerical_mean[i]
+            if self.numerical_scale is not None:
+                values /= self.numerical_scale[i]
+            out[:, self.numerical_offsets[i]] = values
+
+        rows = np.arange(n_rows)
+        for column, fill, category_map in self._categorical_items:
+            values = np.asarray(data[column], dtype=object)
+            uniques, inverse = np.unique(np.where([_is_nan(v) for v in values], fill, values).astype(str), return_inverse=True)
+            positions = np.full(len(uniques), -1, dtype=np.intp)
+            scaled = np.zeros(len(uniques))
+            for j, category in enumerate(uniques.tolist()):
+                entry = category_map.get(category)
+                if entry is not None:
+                    positions[j], scaled[j] = entry
+            row_positions = positions[inverse]
+            known = row_positions >= 0
+            out[rows[known], row_positions[known]] = scaled[inverse][known]
+
+        return out
+
+
+def verify_parity(preprocessor, df, encoder=None):
+    """
+    Checks that the compiled encoder reproduces preprocessor.transform bit-for-bit
+    on every row of df, through both the record and the vectorized paths.
+
+    Returns:
+    - report (dict): Number of rows checked and whether each path matched exactly.
+    """
+    try:
+        encoder = encoder or CompiledEncoder.compile(preprocessor)
+        expected = preprocessor.transform(df)
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+
+        from_records = encoder.transform_records(df.to_dict("records"))
+        from_columns = encoder.transform_structured(df.to_records(index=False))
+
+        report = {
+            "rows": len(df),
+            "records_match": bool(np.array_equal(expected, from_records)),
+            "structured_match": bool(np.array_equal(expected, from_columns)),
+        }
+        logging.info(f"Compiled encoder parity report: {report}")
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
@@ -0,0 +1,470 @@
+# src/pipeline/compiled_trees.py
+import os
+import sys
+import json
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+# sklearn marks leaves with -1 in children_left
+_TREE_LEAF = -1
+
+
+class CompiledTreeEnsemble:
+    """
+    Flat, library-free version of a fitted tree model: DecisionTreeRegressor,
+    RandomForestRegressor, GradientBoostingRegressor, AdaBoostRegressor or
+    XGBRegressor.
+
+    The nodes of every tree live in contiguous arrays (feature, threshold,
+    children, value). Leaves point to themselves, so scoring advances all
+    (row, tree) pairs one level per step for max_depth steps without any
+    branching, then combines the leaf values the way the library does (same
+    input dtype, comparison and summation order).
+    """
+    def __init__(
+        self,
+        feature,
+        threshold,
+        children,
+        value,
+        missing_right,
+        roots,
+        max_depth,
+        n_features,
+        aggregation,
+        init=0.0,
+        scale=1.0,
+        estimator_weights=None,
+        strict_less=False,
+        output_dtype=np.float64,
+        source=None,
+    ):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        # The features are float32: x <= t holds exactly when x <= the largest float32 not
+        # above t (x < t when x < the smallest float32 not below t), so the comparison
+        # runs in float32 without upcasting every gathered feature
+        threshold32 = self.threshold.astype(np.float32)
+        if strict_less:
+            rounded = threshold32.astype(np.float64) < self.threshold
+            threshold32[rounded] = np.nextafter(threshold32[rounded], np.float32(np.inf))
+        else:
+            rounded = threshold32.astype(np.float64) > self.threshold
+            threshold32[rounded] = np.nextafter(threshold32[rounded], np.float32(-np.inf))
+        self._threshold32 = threshold32
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = np.ascontiguousarray(children, dtype=np.intp)
+        self.is_leaf = self.children[0::2] == np.arange(len(self.feature))
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        # Where a NaN feature goes, per node
+        self.missing_right = np.ascontiguousarray(missing_right, dtype=bool)
+        self._routes_missing_left = not self.missing_right.all()
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        # "mean" (forests), "sum" (boosting: init + sum of scale * leaf) or "weighted_median" (AdaBoost)
+        self.aggregation = aggregation
+        self.init = init
+        self.scale = scale
+        self.estimator_weights = None if estimator_weights is None else np.asarray(estimator_weights, dtype=np.float64)
+        # XGBoost goes left on x < threshold, sklearn on x <= threshold
+        self.strict_less = strict_less
+        self.output_dtype = output_dtype
+        self.source = source
+        # Largest batch scored here; larger ones are faster in the library (see calibrate_max_rows)
+        self.max_rows = None
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @classmethod
+    def _from_trees(cls, trees, n_features, **kwargs):
+        """
+        Concatenates trees given as (children_left, children_right, feature,
+        threshold, value, missing_left, depth) into the flat layout.
+        """
+        feature, threshold, children, value, missing_right, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for left, right, tree_feature, tree_threshold, tree_value, missing_left, depth in trees:
+            left = np.asarray(left, dtype=np.intp)
+            right = np.asarray(right, dtype=np.intp)
+            n_nodes = len(left)
+            node_ids = np.arange(n_nodes)
+            is_leaf = left == _TREE_LEAF
+
+            tree_children = np.empty((n_nodes, 2), dtype=np.intp)
+            tree_children[:, 0] = np.where(is_leaf, node_ids, left) + offset
+            tree_children[:, 1] = np.where(is_leaf, node_ids, right) + offset
+
+            feature.append(np.where(is_leaf, 0, tree_feature))
+            # A leaf sends every value, NaN included, back to itself
+            threshold.append(np.where(is_leaf, np.inf, tree_threshold))
+            children.append(tree_children.ravel())
+            value.append(np.asarray(tree_value, dtype=np.float64))
+            missing_right.append(~np.asarray(missing_left, dtype=bool))
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, depth)
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            # Child indices were local to their tree until the offset above
+            children=np.concatenate(children),
+            value=np.concatenate(value),
+            missing_right=np.concatenate(missing_right),
+            roots=roots,
+            max_depth=max_depth,
+            n_features=n_features,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _sklearn_tree(estimator):
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise ValueError("Only single-output trees are supported")
+        missing_left = getattr(tree, "missing_go_to_left", None)
+        if missing_left is None:
+            missing_left = np.zeros(tree.node_count, dtype=bool)
+        return (
+            tree.children_left, tree.children_right, tree.feature, tree.threshold,
+            tree.value[:, 0, 0], missing_left, tree.max_depth,
+        )
+
+    @classmethod
+    def _compile_xgboost(cls, model):
+        booster = model.get_booster()
+        learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror"):
+            raise ValueError(f"XGBoost objective {objective} is not supported")
+        gradient_booster = learner["gradient_booster"]
+        if gradient_booster["name"] != "gbtree":
+            raise ValueError(f"XGBoost booster {gradient_booster['name']} is not supported")
+        if getattr(model, "best_iteration", None) is not None and model.best_iteration + 1 < booster.num_boosted_rounds():
+            raise ValueError("XGBoost models trained with early stopping are not supported")
+
+        trees = []
+        for tree in gradient_booster["model"]["trees"]:
+            if any(tree["split_type"]):
+                raise ValueError("XGBoost categorical splits are not supported")
+            left = np.asarray(tree["left_children"])
+            # Leaves keep their value in split_conditions; stored as float32 like in XGBoost
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32).astype(np.float64)
+            depth = np.zeros(len(left), dtype=int)
+            for node in range(len(left)):
+                if left[node] != _TREE_LEAF:
+                    depth[left[node]] = depth[tree["right_children"][node]] = depth[node] + 1
+            trees.append((
+                left, tree["right_children"], tree["split_indices"], conditions,
+                np.where(left == _TREE_LEAF, conditions, 0.0), np.asarray(tree["default_left"], dtype=bool),
+                int(depth.max()),
+            ))
+
+        base_score = learner["learner_model_param"]["base_score"].strip("[]")
+        return cls._from_trees(
+            trees,
+            n_features=int(learner["learner_model_param"]["num_feature"]),
+            aggregation="sum",
+            init=np.float32(base_score),
+            strict_less=True,
+            output_dtype=np.float32,
+            source=type(model).__name__,
+        )
+
+    @classmethod
+    def compile(cls, model):
+        """
+        Builds a CompiledTreeEnsemble from a fitted tree model.
+
+        Raises:
+        - ValueError: If the model is not a supported tree model.
+        """
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+        from sklearn.tree import DecisionTreeRegressor
+
+        source = type(model).__name__
+        if isinstance(model, DecisionTreeRegressor):
+            compiled = cls._from_trees(
+                [cls._sklearn_tree(model)], model.n_features_in_, aggregation="mean", source=source
+            )
+        elif isinstance(model, RandomForestRegressor):
+            compiled = cls._from_trees(
+                [cls._sklearn_tree(estimator) for estimator in model.estimators_],
+                model.n_features_in_, aggregation="mean", source=source,
+            )
+        elif isinstance(model, GradientBoostingRegressor):
+            if isinstance(model.init_, str) and model.init_ == "zero":
+                init = 0.0
+            elif isinstance(model.init_, DummyRegressor):
+                init = float(np.ravel(model.init_.constant_)[0])
+            else:
+                raise ValueError("GradientBoostingRegressor with a custom init estimator is not supported")
+            compiled = cls._from_trees(
+                [cls._sklearn_tree(estimator) for estimator in model.estimators_[:, 0]],
+                model.n_features_in_, aggregation="sum", init=init, scale=model.learning_rate, source=source,
+            )
+        elif isinstance(model, AdaBoostRegressor):
+            if not all(isinstance(estimator, DecisionTreeRegressor) for estimator in model.estimators_):
+                raise ValueError("AdaBoostRegressor is only supported with decision tree estimators")
+            compiled = cls._from_trees(
+                [cls._sklearn_tree(estimator) for estimator in model.estimators_],
+                model.n_features_in_, aggregation="weighted_median",
+                estimator_weights=model.estimator_weights_, source=source,
+            )
+        elif source == "XGBRegressor":
+            compiled = cls._compile_xgboost(model)
+        else:
+            raise ValueError(f"{source} is not a supported tree model")
+
+        logging.info(
+            "Compiled %s into %d trees, %d nodes, depth %d", source, compiled.n_trees, compiled.n_nodes, compiled.max_depth
+        )
+        return compiled
+
+    def _leaf_values(self, X):
+        n_rows = X.shape[0]
+        n_trees = self.n_trees
+        flat_X = X.ravel()
+        # One lane per (row, tree), rows major
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, n_trees)
+        nodes = np.tile(self.roots, n_rows)
+
+        for _ in range(self.max_depth):
+            x = flat_X[row_offsets + self.feature[nodes]]
+            thresholds = self._threshold32[nodes]
+            # NaN fails both comparisons and is routed by missing_right below
+            go_right = ~(x < thresholds) if self.strict_less else ~(x <= thresholds)
+            if self._routes_missing_left:
+                missing = np.isnan(x)
+                if missing.any():
+                    go_right[missing] = self.missing_right[nodes[missing]]
+            nodes = self.children[2 * nodes + go_right]
+            if self.is_leaf[nodes].all():
+                break
+
+        return self.value[nodes].reshape(n_rows, n_trees)
+
+    def predict(self, X):
+        """
+        Scores a 2D array (or sparse matrix) of encoded features.
+
+        Returns:
+        - predictions (np.ndarray): One prediction per row, same values as
+          model.predict(prepare_features(model, X)).
+        """
+        # prepare_features densifies sparse input for XGBoost, so its implicit zeros
+        # are scored as 0.0 like here rather than as missing values
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        # Both libraries compare float32 features against the thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+
+        values = self._leaf_values(X)
+
+        if self.aggregation == "weighted_median":
+            sorted_idx = np.argsort(values, axis=1)
+            weight_cdf = np.cumsum(self.estimator_weights[sorted_idx], axis=1, dtype=np.float64)
+            median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, np.newaxis]
+            median_idx = median_or_above.argmax(axis=1)
+            rows = np.arange(len(values))
+            return values[rows, sorted_idx[rows, median_idx]]
+
+        # cumsum adds left to right like the libraries' per-tree accumulation
+        if self.aggregation == "mean":
+            return np.cumsum(values, axis=1)[:, -1] / self.n_trees
+        terms = np.empty((len(values), self.n_trees + 1), dtype=self.output_dtype)
+        terms[:, 0] = self.init
+        terms[:, 1:] = values * self.scale if self.scale != 1.0 else values
+        return np.cumsum(terms, axis=1, dtype=self.output_dtype)[:, -1]
+
+
+def is_supported_tree_model(model):
+    return type(model).__name__ in (
+        "DecisionTreeRegressor", "RandomForestRegressor", "GradientBoostingRegressor", "AdaBoostRegressor", "XGBRegressor"
+    )
+
+
+def probe_records(encoder, n_rows=256, random_state=42):
+    """
+    Random records (dicts with the preprocessor's input columns) built from the
+    categories and score range the compiled encoder knows.
+    """
+    rng = np.random.default_rng(random_state)
+    categories = [list(category_map) for category_map in encoder.category_maps]
+    records = []
+    for _ in range(n_rows):
+        record = {column: values[rng.integers(len(values))] for column, values in zip(encoder.categorical_columns, categories)}
+        record.update({column: float(rng.integers(0, 101)) for column in encoder.numerical_columns})
+        records.append(record)
+    return records
+
+
+def probe_features(encoder, n_features, n_rows=256, random_state=42):
+    """
+    Encoded rows to verify and calibrate a compiled model without the training
+    data: random records through the compiled encoder, or standard normal
+    features when the preprocessor could not be compiled.
+    """
+    if encoder is None:
+        return np.random.default_rng(random_state).standard_normal((n_rows, n_features))
+    return encoder.transform_records(probe_records(encoder, n_rows, random_state))
+
+
+def probe_inputs(preprocessor, encoder, n_features, n_rows=256, random_state=42):
+    """
+    The probe rows in every format a predict path hands to the scorer: the
+    compiled encoder's dense rows, the preprocessor.transform output of the
+    same records (CSR for a sparse OneHotEncoder) and its CSR form.
+
+    Returns:
+    - inputs (dict): Format name -> encoded rows.
+    """
+    import pandas as pd
+    from scipy import sparse
+
+    X = probe_features(encoder, n_features, n_rows, random_state)
+    inputs = {"dense": X, "csr": sparse.csr_matrix(X)}
+    if encoder is not None and preprocessor is not None:
+        records = pd.DataFrame(probe_records(encoder, n_rows, random_state))
+        inputs["preprocessor"] = preprocessor.transform(records)
+    return inputs
+
+
+def calibrate_max_rows(model, compiled, X, batch_sizes=(1, 16, 64, 256, 1024), repeat=3):
+    """
+    Returns the largest batch size at which the compiled scorer beats
+    model.predict (best of repeat calls), 0 when it never does. Beyond a few
+    hundred rows the libraries' compiled loops usually win.
+    """
+    import time
+    from src.utils import prepare_features
+
+    def best_time(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    max_rows = 0
+    for batch_size in batch_sizes:
+        batch = X[np.arange(batch_size) % len(X)]
+        library_input = prepare_features(model, batch)
+        if best_time(lambda: compiled.predict(batch)) >= best_time(lambda: model.predict(library_input)):
+            break
+        max_rows = batch_size
+    return max_rows
+
+
+def verify_parity(model, X, compiled=None):
+    """
+    Compares the compiled scorer with model.predict on every row of X.
+
+    Returns:
+    - report (dict): Rows checked, whether every prediction matched exactly and the largest absolute difference.
+    """
+    try:
+        from src.utils import prepare_features
+
+        compiled = compiled or CompiledTreeEnsemble.compile(model)
+        expected = np.asarray(model.predict(prepare_features(model, X))).ravel()
+        actual = compiled.predict(X)
+        report = {
+            "model": compiled.source,
+            "rows": len(expected),
+            "exact_match": bool(np.array_equal(expected, actual)),
+            "max_abs_diff": float(np.max(np.abs(expected.astype(np.float64) - actual))) if len(expected) else 0.0,
+        }
+        logging.info(f"Compiled tree parity report: {report}")
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _fit_candidates(X_train, y_train):
+    from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.tree import DecisionTreeRegressor
+    from xgboost import XGBRegressor
+    from src.utils import prepare_features
+
+    # The largest settings of the ModelTrainer grids
+    models = {
+        "DecisionTree Regressor": DecisionTreeRegressor(max_depth=20, random_state=42),
+        "RandomFores Regressor": RandomForestRegressor(n_estimators=256, max_depth=20, random_state=42),
+        "GradientBoosting Regressor": GradientBoostingRegressor(n_estimators=200, random_state=42),
+        "AdaBoost Regressor": AdaBoostRegressor(n_estimators=100, random_state=42),
+        "XGBRegressor ": XGBRegressor(n_estimators=200, max_depth=7),
+    }
+    for model in models.values():
+        model.fit(prepare_features(model, X_train), y_train)
+    return models
+
+
+def latency_benchmark(model, compiled, X, batch_sizes=(1, 64, 10_000)):
+    """
+    Median latency of model.predict and of the compiled scorer per batch size.
+    Batches larger than X are built by repeating its rows.
+    """
+    from src.benchmark_suite import time_call
+    from src.utils import prepare_features
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = X[np.arange(batch_size) % len(X)]
+        library_input = prepare_features(model, batch)
+        results[batch_size] = {
+            "library_seconds": time_call(lambda: model.predict(library_input), repeat=3)["median"],
+            "compiled_seconds": time_call(lambda: compiled.predict(batch), repeat=3)["median"],
+        }
+    return results
+
+
+# Run for testing: parity on the held out test data and latency per batch size, for every tree family
+if __name__ == "__main__":
+    from src.utils import load_object
+    from src.components.columnar_dataset import read_dataset_or_csv
+
+    preprocessor = load_object(os.path.join("artifacts", "preprocessor.pkl"))
+    train_df = read_dataset_or_csv(os.path.join("artifacts", "train"), os.path.join("artifacts", "train.csv"))
+    test_df = read_dataset_or_csv(os.path.join("artifacts", "test"), os.path.join("artifacts", "test.csv"))
+    target_column = "math_score"
+
+    def encode(df):
+        return preprocessor.transform(df.drop(columns=[target_column]))
+
+    # The preprocessor output as the predict paths get it (CSR), and densified like the compiled encoder's rows
+    X_train, X_test_transformed = encode(train_df), encode(test_df)
+    X_test = X_test_transformed.toarray() if hasattr(X_test_transformed, "toarray") else np.asarray(X_test_transformed)
+    models = _fit_candidates(X_train, train_df[target_column].to_numpy())
+
+    failed = []
+    print(f"{'model':<28}{'exact':>7}{'max diff':>11}{'batch':>8}{'library (us)':>15}{'compiled (us)':>15}{'speedup':>9}")
+    for name, model in models.items():
+        compiled = CompiledTreeEnsemble.compile(model)
+        report = verify_parity(model, X_test, compiled)
+        if not (report["exact_match"] and verify_parity(model, X_test_transformed, compiled)["exact_match"]):
+            failed.append(name)
+        for batch_size, timing in latency_benchmark(model, compiled, X_test).items():
+            print(f"{name:<28}{str(report['exact_match']):>7}{report['max_abs_diff']:>11.2e}{batch_size:>8}"
+                  f"{timing['library_seconds'] * 1e6:>15.1f}{timing['compiled_seconds'] * 1e6:>15.1f}"
+                  f"{timing['library_seconds'] / timing['compiled_seconds']:>8.1f}x")
+        print(f"{name:<28}served compiled up to {calibrate_max_rows(model, compiled, X_test)} rows")
+
+    if failed:
+        raise SystemExit(f"Compiled scorer does not match model.predict for {failed}")
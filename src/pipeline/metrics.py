@@ -0,0 +1,354 @@
+# src/pipeline/metrics.py
+import os
+import time
+import threading
+from bisect import bisect_left
+
+
+# Latency buckets in seconds, from 100us (cached lookups) to 5s (cold model loads)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """
+        Returns the child for one combination of label values. Hot paths should
+        keep the child instead of calling labels on every observation.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self):
+        with self._lock:
+            self._children = {}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, labelvalues):
+        return [f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(self.value)}"]
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        # le buckets: an observation equal to a bound falls into that bucket
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """
+        Context manager observing the duration of its block, a no-op while metrics are disabled.
+        """
+        return _Timer(self) if _enabled else _NULL_TIMER
+
+    def render(self, name, labelnames, labelvalues):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(list(self.buckets) + [float("inf")], counts):
+            cumulative += bucket_count
+            labels = _format_labels(labelnames, labelvalues, [("le", _format_value(bound))])
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, labelvalues)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {count}")
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+
+class MetricsRegistry:
+    """
+    Process-local collection of metrics rendered in the Prometheus text format.
+    Every gunicorn worker keeps its own registry; the scraper sees the worker
+    that answered the /metrics request.
+    """
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """
+        Registers a function called before every render, to refresh gauges
+        whose values live elsewhere (e.g. the active model version).
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Instrumentation is on unless METRICS_ENABLED=0; the overhead is measured by the benchmark below
+_enabled = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by endpoint, method and status code.", ["endpoint", "method", "status"]
+))
+HTTP_ERRORS = REGISTRY.register(Counter(
+    "http_request_errors_total", "HTTP requests answered with a 5xx status.", ["endpoint"]
+))
+HTTP_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by endpoint.", ["endpoint"]
+))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "predict_stage_duration_seconds",
+    "Latency of each stage of the prediction path: parse_form, build_dataframe, artifact_load, "
+    "cache_lookup, transform, model_predict, render, and micro_batch (queue wait plus the batched "
+    "transform and model_predict).",
+    ["stage"],
+))
+MODEL_VERSION = REGISTRY.register(Gauge(
+    "model_version_info", "Active model version (value is always 1).", ["version"]
+))
+MODEL_RELOADS = REGISTRY.register(Counter(
+    "model_reloads_total", "Number of model loads by this process.", []
+))
+MODEL_LOAD_SECONDS = REGISTRY.register(Gauge(
+    "model_load_seconds", "Time it took to load the active model version.", []
+))
+
+
+def stage_timer(stage):
+    """
+    Returns a context manager that observes the duration of its block in the
+    predict_stage_duration_seconds histogram.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return STAGE_DURATION.labels(stage=stage).time()
+
+
+def observe_request(endpoint, method, status, duration):
+    if not _enabled:
+        return
+    HTTP_REQUESTS.labels(endpoint=endpoint, method=method, status=status).inc()
+    HTTP_DURATION.labels(endpoint=endpoint).observe(duration)
+    if status >= 500:
+        HTTP_ERRORS.labels(endpoint=endpoint).inc()
+
+
+def _collect_model_info():
+    from src.pipeline.model_registry import get_model_registry
+
+    # status() never loads the model, a worker that served nothing reports no version
+    status = get_model_registry().status()
+    MODEL_VERSION.clear()
+    if status["version"] is not None:
+        MODEL_VERSION.labels(version=status["version"]).set(1)
+        MODEL_LOAD_SECONDS.labels().set(status["load_time"])
+
+
+REGISTRY.add_collector(_collect_model_info)
+
+
+def render_metrics():
+    """
+    Returns every metric of this process in the Prometheus text format.
+    """
+    return REGISTRY.render()
+
+
+def overhead_benchmark(n_requests=2000):
+    """
+    Measures the cost of one histogram observation, one timed block and the
+    difference in /predict latency with instrumentation on and off.
+    """
+    import itertools
+    import numpy as np
+    from src.benchmark_suite import time_call
+
+    child = STAGE_DURATION.labels(stage="benchmark")
+
+    def timed_block():
+        with stage_timer("benchmark"):
+            pass
+
+    report = {
+        "observe_seconds": time_call(lambda: child.observe(0.001))["median"],
+        "timed_block_seconds": time_call(timed_block)["median"],
+    }
+
+    import app
+
+    client = app.app.test_client()
+    form = {
+        "gender": "female",
+        "race_ethnicity": "group B",
+        "parental_level_of_education": "bachelor's degree",
+        "lunch": "standard",
+        "test_preparation_course": "none",
+        "reading_score": "72",
+        "writing_score": "74",
+    }
+    # Every request gets a score never posted before and off the integer grid, so none is answered
+    # by the prediction cache or the score table and the transform and model_predict stages all run
+    scores = (20.005 + 0.01 * i for i in itertools.count())
+
+    # Warm every code path first, then alternate on/off request by request so drift affects both equally
+    for _ in range(100):
+        form["reading_score"] = f"{next(scores):.3f}"
+        client.post("/predict", data=form)
+
+    latencies = {True: [], False: []}
+    for i in range(2 * n_requests):
+        enabled = i % 2 == 0
+        set_enabled(enabled)
+        form["reading_score"] = f"{next(scores):.3f}"
+        start = time.perf_counter()
+        client.post("/predict", data=form)
+        latencies[enabled].append(time.perf_counter() - start)
+    report["predict_seconds_enabled"] = float(np.median(latencies[True]))
+    report["predict_seconds_disabled"] = float(np.median(latencies[False]))
+    set_enabled(True)
+
+    report["predict_overhead_seconds"] = report["predict_seconds_enabled"] - report["predict_seconds_disabled"]
+    return report
+
+
+# Run for testing: instrumentation overhead
+if __name__ == "__main__":
+    report = overhead_benchmark()
+    print(f"observe: {report['observe_seconds'] * 1e9:.0f} ns")
+    print(f"timed block: {report['timed_block_seconds'] * 1e9:.0f} ns")
+    print(f"/predict median with metrics: {report['predict_seconds_enabled'] * 1e6:.1f} us, "
+          f"without: {report['predict_seconds_disabled'] * 1e6:.1f} us, "
+          f"overhead: {report['predict_overhead_seconds'] * 1e6:.1f} us")
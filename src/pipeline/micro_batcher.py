@@ -0,0 +1,172 @@
+# src/pipeline/micro_batcher.py
+import os
+import sys
+import time
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class MicroBatcherConfig:
+    """
+    Configuration class for the request coalescer.
+    """
+    # Longest time the first request of a batch waits for others to join it
+    max_wait_ms: float = 2.0
+    # A batch is scored as soon as it holds this many requests
+    max_batch_size: int = 64
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row requests into one vectorized call.
+
+    Callers submit a record and get a Future; a background thread collects
+    queued records for up to max_wait_ms or max_batch_size records, scores them
+    with a single predict_fn(records) call and resolves each caller's Future
+    with its own prediction.
+    """
+    def __init__(self, predict_fn, config: MicroBatcherConfig = None):
+        self.predict_fn = predict_fn
+        self.micro_batcher_config = config or MicroBatcherConfig()
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        """
+        Queues one record and returns a Future resolving to its prediction.
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def predict(self, record, timeout=None):
+        """
+        Scores one record through the coalescer and waits for its prediction.
+        """
+        try:
+            return self.submit(record).result(timeout=timeout)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _collect(self):
+        # Block for the first request, then fill the batch until it is full or the window closes
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return None
+        deadline = time.monotonic() + self.micro_batcher_config.max_wait_ms / 1000.0
+
+        while len(batch) < self.micro_batcher_config.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Close requested, score what we have and stop afterwards
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            records = [record for record, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                predictions = self.predict_fn(records)
+            except Exception as e:
+                logging.error("Micro batch of %d records failed: %s", len(batch), e)
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            finally:
+                with self._stats_lock:
+                    self._batch_sizes[len(batch)] += 1
+
+            for future, prediction in zip(futures, predictions):
+                future.set_result(prediction)
+
+    def stats(self):
+        """
+        Returns the distribution of batch sizes achieved so far.
+        """
+        with self._stats_lock:
+            batch_sizes = dict(sorted(self._batch_sizes.items()))
+        n_batches = sum(batch_sizes.values())
+        n_requests = sum(size * count for size, count in batch_sizes.items())
+        return {
+            "batches": n_batches,
+            "requests": n_requests,
+            "mean_batch_size": n_requests / n_batches if n_batches else 0.0,
+            "batch_size_histogram": batch_sizes,
+            "max_wait_ms": self.micro_batcher_config.max_wait_ms,
+            "max_batch_size": self.micro_batcher_config.max_batch_size,
+        }
+
+    def close(self, timeout=None):
+        """
+        Scores the requests already queued and stops the background thread.
+        """
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+
+_micro_batcher = None
+_micro_batcher_lock = threading.Lock()
+
+
+def get_micro_batcher():
+    """
+    Returns the process-wide coalescer in front of PredictPipeline.predict_records.
+    """
+    global _micro_batcher
+    if _micro_batcher is None:
+        with _micro_batcher_lock:
+            if _micro_batcher is None:
+                from src.pipeline.predict_pipeline import PredictPipeline
+                predict_pipeline = PredictPipeline()
+                # Callers look the record up in the prediction cache before queueing it
+                _micro_batcher = MicroBatcher(
+                    lambda records: predict_pipeline.predict_records(records, lookup_cache=False)
+                )
+    return _micro_batcher
+
+
+def reset_micro_batcher():
+    """
+    Stops the process-wide coalescer, the next get_micro_batcher call starts a new one.
+    """
+    global _micro_batcher
+    with _micro_batcher_lock:
+        if _micro_batcher is not None:
+            _micro_batcher.close()
+            _micro_batcher = None
+
+
+def _after_fork_in_child():
+    global _micro_batcher, _micro_batcher_lock
+    # The coalescer thread of the parent doesn't exist in a forked child
+    _micro_batcher = None
+    _micro_batcher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,268 @@
+# src/pipeline/model_registry.py
+import os
+import sys
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import load_object
+from src.components.model_artifact import (
+    is_model_artifact, load_model_artifact, model_metadata_path, preprocessor_digest, trained_preprocessor_digest,
+    MANIFEST_FILE_NAME,
+)
+from src.pipeline.compiled_encoder import CompiledEncoder
+from src.pipeline.compiled_trees import (
+    CompiledTreeEnsemble, is_supported_tree_model, probe_inputs, verify_parity, calibrate_max_rows
+)
+from src.components.score_table import ScoreTable, ScoreTableConfig
+from src.pipeline.metrics import MODEL_RELOADS
+
+
+@dataclass
+class ModelRegistryConfig:
+    """
+    Configuration class for the model registry.
+    """
+    model_path: str = os.path.join("artifacts", "trained_model.pkl")
+    # Native artifact directory, served instead of model_path when it exists
+    model_artifact_path: str = os.path.join("artifacts", "trained_model")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    # "mtime" compares (mtime, size) of the artifacts, "hash" compares their sha256 digests
+    watch_mode: str = "mtime"
+    # Minimum number of seconds between two checks of the artifact files
+    check_interval: float = 2.0
+    score_table_path: str = os.path.join("artifacts", "score_table.f32")
+    score_table_layout_path: str = os.path.join("artifacts", "score_table.json")
+    # Score small batches of tree models with the flat NumPy scorer of compiled_trees
+    compile_tree_models: bool = True
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    Immutable model/preprocessor pair. A request must take one LoadedModel and
+    use both objects from it, so a reload can never mix two versions.
+    """
+    model: object
+    preprocessor: object
+    # Flat pandas-free encoder compiled from the preprocessor, None if it can't be compiled
+    encoder: object
+    # Precomputed predictions for the integer score domain, None if not exported
+    score_table: object
+    # Flat tree scorer used for batches up to its max_rows, None for other models
+    compiled_model: object
+    version: str
+    load_time: float
+    loaded_at: float
+
+
+class ModelRegistry:
+    """
+    Loads the model/preprocessor pair once per process and serves it from memory.
+    The artifact files are watched and a new pair is swapped in atomically when
+    the training pipeline writes new artifacts.
+    """
+    def __init__(self, config: ModelRegistryConfig = None):
+        self.registry_config = config or ModelRegistryConfig()
+        self._lock = threading.Lock()
+        self._active = None
+        self._last_check = 0.0
+        self._reload_count = 0
+
+    def _file_fingerprint(self, file_path):
+        if self.registry_config.watch_mode == "hash":
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as file_obj:
+                for block in iter(lambda: file_obj.read(1 << 20), b""):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        stat = os.stat(file_path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _use_model_artifact(self):
+        return bool(self.registry_config.model_artifact_path) and is_model_artifact(self.registry_config.model_artifact_path)
+
+    def _model_file_path(self):
+        # The manifest is rewritten last on every save, so it versions the whole artifact
+        if self._use_model_artifact():
+            return os.path.join(self.registry_config.model_artifact_path, MANIFEST_FILE_NAME)
+        return self.registry_config.model_path
+
+    def current_version(self, include_score_table=True):
+        """
+        Returns the version string of the artifacts currently on disk. The
+        score table layout is part of the version, so exporting a table after
+        training is picked up like any other artifact change.
+        """
+        file_paths = [self._model_file_path(), self.registry_config.preprocessor_path]
+        # The pickle's sidecar records which preprocessor it was trained with
+        metadata_path = model_metadata_path(self.registry_config.model_path)
+        if not self._use_model_artifact() and os.path.exists(metadata_path):
+            file_paths.append(metadata_path)
+        if include_score_table and os.path.exists(self.registry_config.score_table_layout_path):
+            file_paths.append(self.registry_config.score_table_layout_path)
+
+        digest = hashlib.sha256()
+        for file_path in file_paths:
+            digest.update(self._file_fingerprint(file_path).encode())
+        return digest.hexdigest()[:12]
+
+    def _load_score_table(self):
+        score_table = ScoreTable.load(ScoreTableConfig(
+            table_file_path=self.registry_config.score_table_path,
+            layout_file_path=self.registry_config.score_table_layout_path,
+        ))
+        if score_table is None:
+            return None
+        # A table exported for other artifacts would serve stale predictions
+        if score_table.model_version != self.current_version(include_score_table=False):
+            logging.warning("Score table was built for another model version, serving live predictions")
+            return None
+        return score_table
+
+    def _compile_tree_model(self, model, preprocessor, encoder):
+        compiled = CompiledTreeEnsemble.compile(model)
+        probes = probe_inputs(preprocessor, encoder, compiled.n_features)
+        # Served only when it reproduces model.predict exactly, in every input format the
+        # predict paths pass, and is faster at some batch size
+        for input_format, probe in probes.items():
+            if not verify_parity(model, probe, compiled)["exact_match"]:
+                raise ValueError(f"Compiled scorer does not match model.predict on {input_format} input")
+        compiled.max_rows = calibrate_max_rows(model, compiled, probes["dense"])
+        if not compiled.max_rows:
+            logging.info("Compiled %s is not faster than the library, serving through it", compiled.source)
+            return None
+        logging.info("Compiled %s serves batches up to %d rows", compiled.source, compiled.max_rows)
+        return compiled
+
+    def _load(self, version):
+        start = time.perf_counter()
+        if self._use_model_artifact():
+            expected_digest = trained_preprocessor_digest(artifact_path=self.registry_config.model_artifact_path)
+            model = load_model_artifact(self.registry_config.model_artifact_path)
+        else:
+            expected_digest = trained_preprocessor_digest(model_path=self.registry_config.model_path)
+            model = load_object(file_path=self.registry_config.model_path)
+        # Training writes the preprocessor long before the model: until the model trained
+        # with it is saved too, the files on disk are a mixed pair even if they are stable
+        if expected_digest is None:
+            logging.warning("Model was saved without its preprocessor digest, serving the pair unchecked")
+        elif preprocessor_digest(self.registry_config.preprocessor_path) != expected_digest:
+            raise RuntimeError("Model was trained with another preprocessor, keeping the active version")
+        preprocessor = load_object(file_path=self.registry_config.preprocessor_path)
+        try:
+            encoder = CompiledEncoder.compile(preprocessor)
+        except Exception as e:
+            logging.warning(f"Preprocessor can't be compiled, serving through sklearn: {e}")
+            encoder = None
+        compiled_model = None
+        if self.registry_config.compile_tree_models and is_supported_tree_model(model):
+            try:
+                compiled_model = self._compile_tree_model(model, preprocessor, encoder)
+            except Exception as e:
+                logging.warning(f"Tree model can't be compiled, serving through the library: {e}")
+        score_table = self._load_score_table()
+        load_time = time.perf_counter() - start
+
+        # Retraining writes the two files one after the other; if they changed while
+        # we were reading them we may hold a mixed pair, so refuse to publish it.
+        if self.current_version() != version:
+            raise RuntimeError("Artifacts changed while loading, keeping the active version")
+
+        return LoadedModel(
+            model=model,
+            preprocessor=preprocessor,
+            encoder=encoder,
+            score_table=score_table,
+            compiled_model=compiled_model,
+            version=version,
+            load_time=load_time,
+            loaded_at=time.time(),
+        )
+
+    def reload(self, force=False):
+        """
+        Loads the artifacts from disk if they changed since the active version
+        (or unconditionally with force=True) and swaps them in.
+        """
+        with self._lock:
+            return self._reload_locked(force)
+
+    def _reload_locked(self, force=False):
+        # Callers hold self._lock
+        self._last_check = time.monotonic()
+        try:
+            version = self.current_version()
+            if not force and self._active is not None and self._active.version == version:
+                return self._active
+
+            loaded = self._load(version)
+        except Exception as e:
+            if self._active is None:
+                raise CustomException(e, sys)
+            # Keep serving the previous pair, the next check will try again
+            logging.error(f"Model reload failed, serving version {self._active.version}: {e}")
+            return self._active
+
+        self._active = loaded
+        self._reload_count += 1
+        MODEL_RELOADS.labels().inc()
+        logging.info(f"Model version {loaded.version} loaded in {loaded.load_time:.3f}s")
+        return loaded
+
+    def get(self):
+        """
+        Returns the active LoadedModel, checking the artifacts for changes at
+        most once per check_interval.
+        """
+        active = self._active
+        if active is None:
+            return self.reload()
+
+        if time.monotonic() - self._last_check >= self.registry_config.check_interval:
+            # Only one thread checks (and reloads), the others keep serving the active pair
+            if self._lock.acquire(blocking=False):
+                try:
+                    # Another thread may have finished a check since ours was found stale
+                    if time.monotonic() - self._last_check < self.registry_config.check_interval:
+                        return self._active
+                    return self._reload_locked()
+                finally:
+                    self._lock.release()
+        return active
+
+    def status(self):
+        """
+        Returns the active version and load statistics of the registry.
+        """
+        active = self._active
+        return {
+            "version": active.version if active else None,
+            "load_time": active.load_time if active else None,
+            "loaded_at": active.loaded_at if active else None,
+            "score_table": active is not None and active.score_table is not None,
+            "compiled_model_max_rows": active.compiled_model.max_rows if active and active.compiled_model else None,
+            "reload_count": self._reload_count,
+            "model_path": self._model_file_path(),
+            "preprocessor_path": self.registry_config.preprocessor_path,
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """
+    Returns the process-wide model registry.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
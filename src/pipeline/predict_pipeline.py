@@ -1,37 +1,206 @@
 import os
 import sys
-import pandas as pd
+from dataclasses import dataclass
+import numpy as np
 # import logging  # Missing import added
-from src.logger import logging
+from src.logger import logging, request_logger
 from src.exception import CustomException
-from src.utils import load_object
+from src.utils import prepare_features
+from src.pipeline.model_registry import get_model_registry
+from src.pipeline.prediction_cache import get_prediction_cache
+from src.pipeline.metrics import stage_timer
+
+
+@dataclass
+class PredictPipelineConfig:
+    """
+    Configuration class for the prediction pipeline.
+    """
+    # Number of rows scored per preprocessor.transform/model.predict call in batch mode
+    batch_chunk_size: int = 10000
+    # Serve repeated single records from the process-wide prediction cache
+    use_prediction_cache: bool = True
 
 
 class PredictPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, registry=None, config: PredictPipelineConfig = None):
+        self.registry = registry or get_model_registry()
+        self.predict_pipeline_config = config or PredictPipelineConfig()
+        self.cache = get_prediction_cache() if self.predict_pipeline_config.use_prediction_cache else None
 
     def predict(self, features):
         try:
-            logging.info("Starting prediction pipeline...")
+            request_logger.info("Starting prediction pipeline...")
+
+            # Take one snapshot so a hot reload can't mix model and preprocessor versions
+            with stage_timer("artifact_load"):
+                loaded = self.registry.get()
 
-            model_path = 'artifacts/trained_model.pkl'
-            preprocessor_path = 'artifacts/preprocessor.pkl'
+            with stage_timer("transform"):
+                data_scaled = prepare_features(loaded.model, loaded.preprocessor.transform(features))
+            with stage_timer("model_predict"):
+                predictions = self._model_predict(loaded, data_scaled)
 
-            model = load_object(file_path=model_path)
-            preprocessor = load_object(file_path=preprocessor_path)
+            request_logger.info("Prediction pipeline completed successfully.")
+            return predictions
 
-            data_scaled = preprocessor.transform(features)
-            predictions = model.predict(data_scaled)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _model_predict(loaded, data_scaled):
+        # Small batches of tree models skip the library dispatch and input validation
+        compiled = loaded.compiled_model
+        if compiled is not None and data_scaled.shape[0] <= compiled.max_rows:
+            return compiled.predict(data_scaled)
+        return loaded.model.predict(data_scaled)
+
+    def cached_prediction(self, record):
+        """
+        Returns the precomputed or cached prediction for a record, or None when
+        it has to be scored.
+        """
+        with stage_timer("artifact_load"):
+            loaded = self.registry.get()
+        with stage_timer("cache_lookup"):
+            if loaded.score_table is not None:
+                value = loaded.score_table.lookup(record)
+                if value is not None:
+                    return value
+            if self.cache is None:
+                return None
+            return self.cache.get(record, loaded.version)
+
+    def predict_record(self, record):
+        """
+        Scores a single record (a dict with the CustomData fields) through the
+        prediction cache and the compiled encoder, without building a DataFrame.
+        """
+        return self.predict_records([record])[0]
+
+    def predict_records(self, records, lookup_cache=True):
+        """
+        Scores a list of records (dicts with the CustomData fields). Cached
+        records skip the model, the others are scored with one vectorized
+        transform/predict call. With lookup_cache=False (records the caller
+        already looked up) the results are only stored in the cache.
+        """
+        try:
+            with stage_timer("artifact_load"):
+                loaded = self.registry.get()
+
+            predictions = np.empty(len(records))
+            missing = []
+            with stage_timer("cache_lookup"):
+                for i, record in enumerate(records):
+                    # In-domain records are an O(1) lookup in the precomputed score table
+                    value = loaded.score_table.lookup(record) if loaded.score_table is not None else None
+                    if value is None and self.cache is not None and lookup_cache:
+                        value = self.cache.get(record, loaded.version)
+                    if value is None:
+                        missing.append(i)
+                    else:
+                        predictions[i] = value
+
+            if missing:
+                to_score = [records[i] for i in missing]
+                with stage_timer("transform"):
+                    if loaded.encoder is None:
+                        import pandas as pd
+                        data_scaled = prepare_features(
+                            loaded.model, loaded.preprocessor.transform(pd.DataFrame.from_records(to_score))
+                        )
+                    else:
+                        data_scaled = loaded.encoder.transform_records(to_score)
+                with stage_timer("model_predict"):
+                    scored = np.asarray(self._model_predict(loaded, data_scaled)).ravel()
+                predictions[missing] = scored
+
+                if self.cache is not None:
+                    for record, value in zip(to_score, scored.tolist()):
+                        self.cache.put(record, loaded.version, value)
 
-            logging.info("Prediction pipeline completed successfully.")
             return predictions
 
         except Exception as e:
             raise CustomException(e, sys)
 
+    def predict_batch(self, features, chunk_size=None):
+        """
+        Scores many rows with one vectorized transform/predict call per chunk.
+
+        Parameters:
+        - features: A DataFrame with the CustomData columns, or an iterable of
+          such DataFrames (e.g. pd.read_csv(..., chunksize=n)).
+        - chunk_size (int): Rows per chunk, defaults to the configured batch_chunk_size.
+
+        Returns:
+        - predictions (np.ndarray): One prediction per input row, in input order.
+
+        Raises:
+        - ValueError: If the input does not have the CustomData columns.
+        """
+        import pandas as pd
+
+        chunk_size = chunk_size or self.predict_pipeline_config.batch_chunk_size
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if isinstance(features, pd.DataFrame):
+            frames = [features]
+        else:
+            frames = features
+
+        try:
+            request_logger.info("Starting batch prediction pipeline...")
+
+            # The same pair is used for every chunk of one batch
+            with stage_timer("artifact_load"):
+                loaded = self.registry.get()
+
+            predictions = []
+            n_rows = 0
+            for frame in frames:
+                frame = CustomData.validate_data_frame(frame)
+                for start in range(0, len(frame), chunk_size):
+                    chunk = frame.iloc[start:start + chunk_size]
+                    with stage_timer("transform"):
+                        data_scaled = prepare_features(loaded.model, loaded.preprocessor.transform(chunk))
+                    with stage_timer("model_predict"):
+                        predictions.append(np.asarray(self._model_predict(loaded, data_scaled)).ravel())
+                    n_rows += len(chunk)
+
+            request_logger.info("Batch prediction pipeline scored %d rows.", n_rows)
+            if not predictions:
+                return np.empty(0)
+            return np.concatenate(predictions)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+class RecordValidationError(ValueError):
+    """
+    Raised by CustomData.validate_record, errors maps each invalid field to the reason.
+    """
+    def __init__(self, errors):
+        super().__init__(f"Invalid record: {errors}")
+        self.errors = errors
+
 
 class CustomData:
+    categorical_columns = [
+        "gender",
+        "race_ethnicity",
+        "parental_level_of_education",
+        "lunch",
+        "test_preparation_course",
+    ]
+    numerical_columns = ["reading_score", "writing_score"]
+    feature_columns = categorical_columns + numerical_columns
+
     def __init__(
         self,
         gender: str,
@@ -50,9 +219,25 @@ class CustomData:
         self.reading_score = reading_score
         self.writing_score = writing_score
 
+    def get_data_as_dict(self):
+        """
+        Returns the features as a flat dict, the input of PredictPipeline.predict_record.
+        """
+        return {
+            "gender": self.gender,
+            "race_ethnicity": self.race_ethnicity,
+            "parental_level_of_education": self.parental_level_of_education,
+            "lunch": self.lunch,
+            "test_preparation_course": self.test_preparation_course,
+            "reading_score": self.reading_score,
+            "writing_score": self.writing_score,
+        }
+
     def get_data_as_data_frame(self):
+        import pandas as pd
+
         try:
-            logging.info("Converting custom data to DataFrame...")
+            request_logger.info("Converting custom data to DataFrame...")
             custom_data_input_dict = {
                 "gender": [self.gender],
                 "race_ethnicity": [self.race_ethnicity],
@@ -62,9 +247,78 @@ class CustomData:
                 "reading_score": [self.reading_score],
                 "writing_score": [self.writing_score]
             }
-            df = pd.DataFrame(custom_data_input_dict)
-            logging.info(f"Custom data converted to DataFrame: {df}")
+            with stage_timer("build_dataframe"):
+                df = pd.DataFrame(custom_data_input_dict)
+            logging.debug("Custom data converted to DataFrame: %s", df)
             return df
         except Exception as e:
-            logging.error(f"Error converting custom data to DataFrame: {e}")
+            logging.error("Error converting custom data to DataFrame: %s", e)
             raise CustomException(e, sys)
+
+    @classmethod
+    def validate_record(cls, payload):
+        """
+        Checks a JSON object against the CustomData schema: every categorical
+        field is a string and every score a finite number (bools are rejected).
+        Extra fields are ignored.
+
+        Returns:
+        - record (dict): The CustomData fields with float scores, the input of PredictPipeline.predict_records.
+
+        Raises:
+        - RecordValidationError: With one message per missing or invalid field.
+        """
+        if not isinstance(payload, dict):
+            raise RecordValidationError({"__root__": "expected a JSON object"})
+
+        record = {}
+        errors = {}
+        for col in cls.categorical_columns:
+            value = payload.get(col)
+            if value is None:
+                errors[col] = "field required"
+            elif not isinstance(value, str):
+                errors[col] = "must be a string"
+            else:
+                record[col] = value
+        for col in cls.numerical_columns:
+            value = payload.get(col)
+            if value is None:
+                errors[col] = "field required"
+                continue
+            try:
+                # JSON integers are unbounded, float() overflows beyond 1.8e308
+                number = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+            except OverflowError:
+                number = None
+            if number is None or number != number or abs(number) == float("inf"):
+                errors[col] = "must be a finite number"
+            else:
+                record[col] = number
+
+        if errors:
+            raise RecordValidationError(errors)
+        return record
+
+    @classmethod
+    def validate_data_frame(cls, df):
+        """
+        Checks that a DataFrame has the CustomData columns and returns them in the
+        CustomData order with numeric score columns. Extra columns are dropped.
+
+        Raises:
+        - ValueError: If a column is missing or a score is not numeric.
+        """
+        import pandas as pd
+
+        missing_columns = [col for col in cls.feature_columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        df = df[cls.feature_columns].copy()
+        for col in cls.numerical_columns:
+            try:
+                df[col] = pd.to_numeric(df[col]).astype(float)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"Column '{col}' must contain numeric values") from None
+        return df
@@ -0,0 +1,175 @@
+# src/pipeline/prediction_cache.py
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.logger import logging
+
+
+CATEGORICAL_FIELDS = (
+    "gender",
+    "race_ethnicity",
+    "parental_level_of_education",
+    "lunch",
+    "test_preparation_course",
+)
+NUMERICAL_FIELDS = ("reading_score", "writing_score")
+
+# Marker for a NaN category: it is imputed, unlike None which is an unknown category
+_NAN_CATEGORY = ("nan",)
+
+# Approximate bookkeeping cost of one OrderedDict entry on top of key and value
+_ENTRY_OVERHEAD = 100
+
+
+def make_key(record):
+    """
+    Normalizes a record (a dict with the CustomData fields) into the seven-field
+    cache key. Scores are compared as floats, so 72, 72.0 and "72" share an entry,
+    and missing scores (None or NaN) share an entry since both are imputed.
+    """
+    key = []
+    for field in CATEGORICAL_FIELDS:
+        value = record.get(field)
+        if isinstance(value, float) and value != value:
+            value = _NAN_CATEGORY
+        key.append(value)
+    for field in NUMERICAL_FIELDS:
+        value = record.get(field)
+        if value is not None:
+            value = float(value)
+            if value != value:
+                value = None
+        key.append(value)
+    return tuple(key)
+
+
+def _entry_size(key, value):
+    return sys.getsizeof(key) + sum(sys.getsizeof(item) for item in key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+
+
+@dataclass
+class PredictionCacheConfig:
+    """
+    Configuration class for the prediction cache.
+    """
+    max_entries: int = 100_000
+    # Approximate memory bound of keys and values, in bytes
+    max_bytes: int = 64 * 1024 * 1024
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions keyed on normalized CustomData features.
+
+    Every lookup carries the model version it is served for; when the version
+    changes (the registry loaded new artifacts) the cache is cleared, so a
+    prediction of a previous model is never returned.
+    """
+    def __init__(self, config: PredictionCacheConfig = None):
+        self.prediction_cache_config = config or PredictionCacheConfig()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                logging.info("Prediction cache invalidated for model version %s", version)
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, record, version):
+        """
+        Returns the cached prediction for a record, or None on a miss.
+        """
+        key = make_key(record)
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, record, version, value):
+        """
+        Stores a prediction, evicting the least recently used entries to stay
+        within max_entries and max_bytes.
+        """
+        key = make_key(record)
+        size = _entry_size(key, value)
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.prediction_cache_config.max_entries
+                or self._bytes > self.prediction_cache_config.max_bytes
+            ):
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted_key)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self):
+        """
+        Returns hit, miss and eviction counters and the current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self._version,
+            }
+
+
+_prediction_cache = None
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """
+    Returns the process-wide prediction cache.
+    """
+    global _prediction_cache
+    if _prediction_cache is None:
+        with _prediction_cache_lock:
+            if _prediction_cache is None:
+                _prediction_cache = PredictionCache()
+    return _prediction_cache
@@ -0,0 +1,230 @@
+# src/pipeline/serving.py
+import gc
+import os
+import sys
+import math
+import time
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class ServingConfig:
+    """
+    Configuration class for the pre-fork serving entry point (gunicorn.conf.py).
+    """
+    bind: str = os.environ.get("BIND", "0.0.0.0:8000")
+    # None autotunes from the cores and the measured per-request CPU; WEB_CONCURRENCY
+    # and GUNICORN_THREADS override
+    workers: int = int(os.environ["WEB_CONCURRENCY"]) if os.environ.get("WEB_CONCURRENCY") else None
+    threads: int = int(os.environ["GUNICORN_THREADS"]) if os.environ.get("GUNICORN_THREADS") else None
+    max_workers: int = 16
+    max_threads: int = 16
+    # Dummy requests run in the master: the first ones fault in the code paths,
+    # the rest measure the per-request CPU time
+    warmup_requests: int = 20
+    measure_requests: int = 200
+    # Time a request spends off-CPU outside the app (network, slow clients)
+    expected_io_wait_ms: float = 5.0
+    timeout: int = 30
+    # Move the warm heap out of the garbage collector's reach so collections in
+    # the workers don't write to (and un-share) the master's pages
+    freeze_gc: bool = True
+
+
+_warm = False
+
+
+def _sample_form(i):
+    from src.pipeline.startup_report import SAMPLE_FORM
+
+    # Distinct scores so the requests miss the prediction cache and reach the model
+    form = dict(SAMPLE_FORM)
+    form["reading_score"] = str(40 + i % 60)
+    form["writing_score"] = str(30 + (i * 7) % 70)
+    return form
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def warm_up(config: ServingConfig = None):
+    """
+    Loads the model/preprocessor into this process and runs dummy requests
+    through the app, so the libraries, the compiled encoder, the templates and
+    the micro-batcher path are all initialized. Metrics, the prediction cache
+    and the coalescer are reset afterwards so the dummy requests don't show up
+    in what the workers report.
+
+    Returns:
+    - report (dict): The model version and the measured wall and CPU time per /predict.
+    """
+    global _warm
+    try:
+        config = config or ServingConfig()
+        import app
+        from src.pipeline import metrics
+        from src.pipeline.model_registry import get_model_registry
+        from src.pipeline.micro_batcher import reset_micro_batcher
+        from src.pipeline.prediction_cache import get_prediction_cache
+
+        start = time.perf_counter()
+        loaded = get_model_registry().reload()
+        load_seconds = time.perf_counter() - start
+
+        client = app.app.test_client()
+        metrics_enabled = metrics.is_enabled()
+        metrics.set_enabled(False)
+        try:
+            for i in range(config.warmup_requests):
+                response = client.post("/predict", data=_sample_form(i))
+                if response.status_code != 200:
+                    raise RuntimeError(f"Warm-up request failed with status {response.status_code}")
+            client.post("/predict_batch", json=[_sample_form(i) for i in range(config.warmup_requests)])
+
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for i in range(config.measure_requests):
+                client.post("/predict", data=_sample_form(config.warmup_requests + i))
+            wall_seconds = (time.perf_counter() - wall_start) / config.measure_requests
+            cpu_seconds = (time.process_time() - cpu_start) / config.measure_requests
+        finally:
+            metrics.set_enabled(metrics_enabled)
+
+        get_prediction_cache().clear()
+        # The workers start their own coalescer thread
+        reset_micro_batcher()
+        _warm = True
+
+        logging.info(
+            "Warmed model version %s in %.3fs: %.2f ms wall, %.2f ms CPU per request",
+            loaded.version, time.perf_counter() - start, wall_seconds * 1e3, cpu_seconds * 1e3,
+        )
+        return {
+            "version": loaded.version,
+            "load_seconds": load_seconds,
+            "wall_seconds_per_request": wall_seconds,
+            "cpu_seconds_per_request": cpu_seconds,
+        }
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def autotune(report, config: ServingConfig = None, cpu_count=None):
+    """
+    Picks the gunicorn worker and thread counts. Python code holds the GIL, so
+    one worker per core saturates the CPU. Inside a worker a request is off-CPU
+    for (wall - cpu) in the app (the micro-batcher window) plus the expected
+    I/O wait; enough threads are started to keep the core busy meanwhile.
+
+    Returns:
+    - workers (int), threads (int)
+    """
+    config = config or ServingConfig()
+    cpu_count = cpu_count or _cpu_count()
+
+    workers = config.workers or min(cpu_count, config.max_workers)
+
+    threads = config.threads
+    if threads is None:
+        cpu_seconds = max(report["cpu_seconds_per_request"], 1e-6)
+        busy_seconds = max(report["wall_seconds_per_request"], cpu_seconds) + config.expected_io_wait_ms / 1000
+        threads = min(max(1, math.ceil(busy_seconds / cpu_seconds)), config.max_threads)
+    return workers, threads
+
+
+def prepare_master(config: ServingConfig = None):
+    """
+    Runs in the gunicorn master before the workers are forked: warms the model,
+    sizes the worker pool and freezes the warm heap.
+
+    Returns:
+    - report (dict): The warm-up report with the chosen workers and threads.
+    """
+    config = config or ServingConfig()
+    report = warm_up(config)
+    report["workers"], report["threads"] = autotune(report, config)
+    if config.freeze_gc:
+        gc.collect()
+        gc.freeze()
+    logging.info("Serving with %d workers x %d threads", report["workers"], report["threads"])
+    return report
+
+
+def readiness():
+    """
+    Returns whether this process serves a warm model. Workers forked from a
+    warmed master are ready from their first request.
+    """
+    from src.pipeline.model_registry import get_model_registry
+
+    version = get_model_registry().status()["version"]
+    return {"ready": _warm and version is not None, "version": version, "pid": os.getpid()}
+
+
+def _child_first_request(preloaded, result_pipe):
+    import app
+    from src.pipeline.model_registry import get_model_registry
+    from src.components.model_artifact import _memory_mb
+
+    client = app.app.test_client()
+    reloads_before = get_model_registry().status()["reload_count"]
+    start = time.perf_counter()
+    response = client.post("/predict", data=_sample_form(1000))
+    first_request_seconds = time.perf_counter() - start
+    os.write(result_pipe, repr({
+        "preloaded": preloaded,
+        "status_code": response.status_code,
+        "first_request_seconds": first_request_seconds,
+        "loaded_model": get_model_registry().status()["reload_count"] > reloads_before,
+        "private_mb": _memory_mb()[1],
+    }).encode())
+
+
+def fork_benchmark(preload=True):
+    """
+    Forks a worker the way gunicorn does, from a master that warmed the model
+    (preload=True) or one that only imported the app, and reports the worker's
+    first request latency and private (unshared) memory after it. Runs in a
+    fresh interpreter per mode so the two don't share state.
+    """
+    import ast
+    import subprocess
+
+    script = (
+        "import os, sys\n"
+        "import app\n"
+        "from src.pipeline import serving\n"
+        f"if {preload!r}: serving.prepare_master()\n"
+        "read_fd, write_fd = os.pipe()\n"
+        "pid = os.fork()\n"
+        "if pid == 0:\n"
+        f"    serving._child_first_request({preload!r}, write_fd)\n"
+        "    os._exit(0)\n"
+        "os.close(write_fd)\n"
+        "os.waitpid(pid, 0)\n"
+        "print(os.read(read_fd, 4096).decode())\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+
+# Run for testing: warm-up report, chosen pool size, and a forked worker with and without preloading
+if __name__ == "__main__":
+    report = prepare_master()
+    print(f"Model version {report['version']} loaded in {report['load_seconds']:.3f}s")
+    print(f"/predict: {report['wall_seconds_per_request'] * 1e3:.2f} ms wall, "
+          f"{report['cpu_seconds_per_request'] * 1e3:.2f} ms CPU")
+    print(f"Autotuned: {report['workers']} workers x {report['threads']} threads on {_cpu_count()} cores")
+    print(f"Ready: {readiness()['ready']}")
+
+    for preload in (False, True):
+        result = fork_benchmark(preload)
+        print(f"preload={preload}: first request {result['first_request_seconds'] * 1e3:.1f} ms, "
+              f"worker loaded the model: {result['loaded_model']}, worker private memory {result['private_mb']:.1f} MB")
@@ -0,0 +1,213 @@
+# src/pipeline/startup_report.py
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class StartupReportConfig:
+    """
+    Configuration class for the serving cold start report.
+    """
+    report_file_path: str = os.path.join("artifacts", "startup_report.json")
+    # Module imported by the serving workers
+    entry_module: str = "app"
+    # A metric slower than the previous report by more than this fraction is flagged
+    regression_threshold: float = 0.2
+    # Differences below this many seconds are noise and never flagged
+    min_regression_seconds: float = 0.01
+
+
+# Heavy libraries that should only be loaded when the active model needs them
+WATCHED_MODULES = ["pandas", "scipy", "sklearn", "xgboost", "catboost", "dill"]
+
+# Runs in a fresh interpreter: import the app, then time the first and second /predict
+_FIRST_PREDICTION_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {entry_module} as entry
+import_seconds = time.perf_counter() - start
+loaded_after_import = [name for name in {watched!r} if name in sys.modules]
+
+client = entry.app.test_client()
+form = {form!r}
+start = time.perf_counter()
+response = client.post("/predict", data=form)
+first_prediction_seconds = time.perf_counter() - start
+form["reading_score"] = "71"
+start = time.perf_counter()
+client.post("/predict", data=form)
+second_prediction_seconds = time.perf_counter() - start
+
+print(json.dumps({{
+    "status_code": response.status_code,
+    "import_seconds": import_seconds,
+    "first_prediction_seconds": first_prediction_seconds,
+    "second_prediction_seconds": second_prediction_seconds,
+    "loaded_after_import": loaded_after_import,
+    "loaded_after_first_prediction": [name for name in {watched!r} if name in sys.modules],
+}}))
+"""
+
+SAMPLE_FORM = {
+    "gender": "female",
+    "race_ethnicity": "group B",
+    "parental_level_of_education": "bachelor's degree",
+    "lunch": "standard",
+    "test_preparation_course": "none",
+    "reading_score": "72",
+    "writing_score": "74",
+}
+
+
+def parse_import_times(output):
+    """
+    Parses the stderr of python -X importtime.
+
+    Returns:
+    - modules (dict): Module name -> {"self": seconds, "cumulative": seconds, "depth": nesting level}.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            # The header line
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = {
+            "self": int(self_us) / 1e6,
+            "cumulative": int(cumulative_us) / 1e6,
+            "depth": depth,
+        }
+    return modules
+
+
+def _import_report(entry_module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry_module}"],
+        capture_output=True, text=True, check=True,
+    )
+    modules = parse_import_times(result.stderr)
+
+    # Own time summed per top-level package, and the cumulative time of every src module
+    by_package = {}
+    for name, times in modules.items():
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + times["self"]
+    top_packages = dict(sorted(by_package.items(), key=lambda item: -item[1])[:15])
+    src_modules = {
+        name: times["cumulative"] for name, times in modules.items()
+        if name == entry_module or name.startswith("src.")
+    }
+    return {
+        "total_seconds": modules.get(entry_module, {}).get("cumulative"),
+        "by_package": top_packages,
+        "src_modules": src_modules,
+    }
+
+
+def _first_prediction_report(entry_module):
+    script = _FIRST_PREDICTION_SCRIPT.format(entry_module=entry_module, watched=WATCHED_MODULES, form=dict(SAMPLE_FORM))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["process_seconds"] = time.perf_counter() - start
+    return report
+
+
+def _flatten_metrics(report):
+    metrics = {
+        "import_seconds": report["first_prediction"]["import_seconds"],
+        "first_prediction_seconds": report["first_prediction"]["first_prediction_seconds"],
+        "second_prediction_seconds": report["first_prediction"]["second_prediction_seconds"],
+    }
+    for name, seconds in report["imports"]["src_modules"].items():
+        metrics[f"import:{name}"] = seconds
+    return metrics
+
+
+def compare_reports(previous, current, threshold=0.2, min_seconds=0.01):
+    """
+    Returns the metrics of current that are slower than in previous by more
+    than threshold (a fraction) and min_seconds.
+    """
+    previous_metrics = _flatten_metrics(previous)
+    regressions = []
+    for name, seconds in _flatten_metrics(current).items():
+        before = previous_metrics.get(name)
+        if before is None:
+            continue
+        if seconds - before > min_seconds and seconds > before * (1 + threshold):
+            regressions.append({"metric": name, "previous": before, "current": seconds})
+    return regressions
+
+
+def startup_report(config: StartupReportConfig = None):
+    """
+    Measures the cold start of the serving app in fresh interpreters: the
+    import time per package and per src module (python -X importtime), the
+    time to the first and second /predict, and which heavy libraries are
+    loaded after import and after the first prediction. The report is
+    compared with the previous one and written to report_file_path.
+
+    Returns:
+    - report (dict): The measurements and the list of regressions.
+    """
+    try:
+        config = config or StartupReportConfig()
+        logging.info(f"Measuring cold start of {config.entry_module}")
+
+        report = {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "entry_module": config.entry_module,
+            "imports": _import_report(config.entry_module),
+            "first_prediction": _first_prediction_report(config.entry_module),
+        }
+
+        report["regressions"] = []
+        if os.path.exists(config.report_file_path):
+            with open(config.report_file_path) as file_obj:
+                previous = json.load(file_obj)
+            report["regressions"] = compare_reports(
+                previous, report, config.regression_threshold, config.min_regression_seconds
+            )
+
+        os.makedirs(os.path.dirname(config.report_file_path), exist_ok=True)
+        with open(config.report_file_path, "w") as file_obj:
+            json.dump(report, file_obj, indent=2)
+        logging.info(f"Startup report saved at {config.report_file_path}")
+
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+# Run for testing: exits with status 1 when a metric regressed against the previous report
+if __name__ == "__main__":
+    report = startup_report()
+    first_prediction = report["first_prediction"]
+
+    print(f"Import of {report['entry_module']}: {first_prediction['import_seconds']:.3f}s")
+    print(f"First /predict: {first_prediction['first_prediction_seconds']:.3f}s, "
+          f"second: {first_prediction['second_prediction_seconds']:.4f}s")
+    print(f"Loaded after import: {first_prediction['loaded_after_import']}")
+    print(f"Loaded after first prediction: {first_prediction['loaded_after_first_prediction']}")
+    print(f"{'package':<24}{'import (s)':>12}")
+    for package, seconds in report["imports"]["by_package"].items():
+        print(f"{package:<24}{seconds:>12.4f}")
+
+    for regression in report["regressions"]:
+        print(f"REGRESSION {regression['metric']}: {regression['previous']:.4f}s -> {regression['current']:.4f}s")
+    sys.exit(1 if report["regressions"] else 0)
@@ -0,0 +1,265 @@
+# src/pipeline/train_pipeline.py
+import os
+import sys
+import json
+import time
+import hashlib
+import inspect
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation, save_features, load_features
+from src.components.model_trainer import ModelTrainer
+from src.components import columnar_dataset, data_ingestion, data_transformation, model_trainer, model_artifact, model_search, fold_store, model_profiler, cv_cache, score_table
+from src.pipeline import compiled_encoder, model_registry
+from src import train_utils, utils
+
+
+@dataclass
+class TrainPipelineConfig:
+    """
+    Configuration class for the training pipeline runner.
+    """
+    state_file_path: str = os.path.join("artifacts", "pipeline_state.json")
+    train_features_path: str = os.path.join("artifacts", "train_features.npz")
+    test_features_path: str = os.path.join("artifacts", "test_features.npz")
+    train_target_path: str = os.path.join("artifacts", "train_target.npy")
+    test_target_path: str = os.path.join("artifacts", "test_target.npy")
+    # Maximum number of independent steps running at the same time
+    max_workers: int = 2
+
+
+@dataclass
+class PipelineStep:
+    """
+    One step of the training DAG. The step is skipped when its fingerprint
+    (code, config and the content of its inputs) matches the last successful
+    run and all its outputs still exist.
+    """
+    name: str
+    run: object
+    inputs: list
+    outputs: list
+    depends_on: list = field(default_factory=list)
+    code: list = field(default_factory=list)
+    config: dict = field(default_factory=dict)
+
+
+def _hash_path(digest, path):
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                _hash_path(digest, file_path)
+    elif os.path.exists(path):
+        with open(path, "rb") as file_obj:
+            for block in iter(lambda: file_obj.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        digest.update(b"<missing>")
+
+
+def fingerprint_step(step):
+    """
+    Returns the fingerprint of a step from its code, config and input contents.
+    """
+    digest = hashlib.sha256()
+    for module in step.code:
+        digest.update(inspect.getsource(module).encode())
+    digest.update(json.dumps(step.config, sort_keys=True, default=str).encode())
+    for path in step.inputs:
+        digest.update(path.encode())
+        _hash_path(digest, path)
+    return digest.hexdigest()
+
+
+def _save_array(file_path, array):
+    tmp_file_path = f"{file_path}.tmp.npy"
+    np.save(tmp_file_path, array)
+    os.replace(tmp_file_path, file_path)
+
+
+class TrainPipeline:
+    """
+    Incremental runner over DataIngestion -> DataTransformation -> ModelTrainer.
+
+    Every step declares its inputs and outputs and is fingerprinted by its code,
+    its config and its input contents. Steps whose fingerprint didn't change are
+    skipped, so editing a model grid only reruns the model trainer. Steps whose
+    dependencies are done run in parallel.
+    """
+    def __init__(self, config: TrainPipelineConfig = None):
+        self.train_pipeline_config = config or TrainPipelineConfig()
+        self.data_ingestion = DataIngestion()
+        self.data_transformation = DataTransformation()
+        self.model_trainer = ModelTrainer()
+
+    def _run_data_ingestion(self):
+        self.data_ingestion.initiate_data_ingestion()
+
+    def _run_data_transformation(self):
+        ingestion_config = self.data_ingestion.ingestion_config
+        X_train, y_train, X_test, y_test, _ = self.data_transformation.initiate_data_transformation(
+            train_path=ingestion_config.train_dataset_path,
+            test_path=ingestion_config.test_dataset_path,
+        )
+        config = self.train_pipeline_config
+        save_features(config.train_features_path, X_train)
+        save_features(config.test_features_path, X_test)
+        _save_array(config.train_target_path, y_train)
+        _save_array(config.test_target_path, y_test)
+
+    def _run_model_trainer(self):
+        config = self.train_pipeline_config
+        r2 = self.model_trainer.initiate_model_trainer(
+            X_train=load_features(config.train_features_path),
+            y_train=np.load(config.train_target_path),
+            X_test=load_features(config.test_features_path),
+            y_test=np.load(config.test_target_path),
+            preprocessor_path=self.data_transformation.data_transformation_config.preprocessor_obj_file_path,
+        )
+        logging.info(f"Best model R2 score: {r2}")
+
+    def build_steps(self):
+        ingestion_config = self.data_ingestion.ingestion_config
+        transformation_config = self.data_transformation.data_transformation_config
+        trainer_config = self.model_trainer.model_trainer_config
+        config = self.train_pipeline_config
+
+        ingestion_outputs = [ingestion_config.train_dataset_path, ingestion_config.test_dataset_path]
+        trainer_outputs = [trainer_config.trained_mode_file_path, trainer_config.search_report_file_path]
+        if trainer_config.model_artifact_path:
+            trainer_outputs.append(trainer_config.model_artifact_path)
+        if ingestion_config.export_csv:
+            ingestion_outputs += [ingestion_config.train_data_path, ingestion_config.test_data_path]
+
+        return [
+            PipelineStep(
+                name="data_ingestion",
+                run=self._run_data_ingestion,
+                inputs=[ingestion_config.source_data_path],
+                outputs=ingestion_outputs,
+                code=[data_ingestion, columnar_dataset],
+                config=asdict(ingestion_config),
+            ),
+            PipelineStep(
+                name="data_transformation",
+                run=self._run_data_transformation,
+                inputs=[ingestion_config.train_dataset_path, ingestion_config.test_dataset_path],
+                outputs=[
+                    transformation_config.preprocessor_obj_file_path,
+                    config.train_features_path,
+                    config.test_features_path,
+                    config.train_target_path,
+                    config.test_target_path,
+                ],
+                depends_on=["data_ingestion"],
+                code=[data_transformation, columnar_dataset, utils],
+                config=asdict(transformation_config),
+            ),
+            PipelineStep(
+                name="model_trainer",
+                run=self._run_model_trainer,
+                inputs=[
+                    config.train_features_path,
+                    config.test_features_path,
+                    config.train_target_path,
+                    config.test_target_path,
+                    transformation_config.preprocessor_obj_file_path,
+                ],
+                outputs=trainer_outputs,
+                depends_on=["data_transformation"],
+                # Score table export encodes with the compiled encoder and stamps the registry version
+                code=[
+                    model_trainer, model_search, train_utils, utils, model_artifact, fold_store, model_profiler,
+                    cv_cache, score_table, compiled_encoder, model_registry,
+                ],
+                config=asdict(trainer_config),
+            ),
+        ]
+
+    def _load_state(self):
+        if not os.path.exists(self.train_pipeline_config.state_file_path):
+            return {}
+        with open(self.train_pipeline_config.state_file_path) as file_obj:
+            return json.load(file_obj)
+
+    def _save_state(self, state):
+        state_file_path = self.train_pipeline_config.state_file_path
+        os.makedirs(os.path.dirname(state_file_path), exist_ok=True)
+        with open(f"{state_file_path}.tmp", "w") as file_obj:
+            json.dump(state, file_obj, indent=2)
+        os.replace(f"{state_file_path}.tmp", state_file_path)
+
+    def _execute(self, step, state, force):
+        start_time = time.perf_counter()
+        fingerprint = fingerprint_step(step)
+        outputs_exist = all(os.path.exists(path) for path in step.outputs)
+
+        if not force and outputs_exist and state.get(step.name) == fingerprint:
+            logging.info(f"Step {step.name} is up to date, skipping")
+            return "skipped", fingerprint, time.perf_counter() - start_time
+
+        logging.info(f"Running step {step.name}")
+        step.run()
+        return "ran", fingerprint, time.perf_counter() - start_time
+
+    def run(self, force=False):
+        """
+        Runs the out of date steps of the DAG.
+
+        Parameters:
+        - force (bool): Run every step even if it is up to date.
+
+        Returns:
+        - summary (list): One dict per step with its status and duration in seconds.
+        """
+        try:
+            steps = {step.name: step for step in self.build_steps()}
+            state = self._load_state()
+            done = set()
+            summary = {}
+            pipeline_start_time = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=self.train_pipeline_config.max_workers) as executor:
+                running = {}
+                while len(done) < len(steps):
+                    for name, step in steps.items():
+                        if name in done or name in running.values():
+                            continue
+                        if all(dependency in done for dependency in step.depends_on):
+                            running[executor.submit(self._execute, step, state, force)] = name
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        status, fingerprint, elapsed = future.result()
+                        state[name] = fingerprint
+                        # Persist after every step so an interrupted run keeps finished steps
+                        self._save_state(state)
+                        summary[name] = {"step": name, "status": status, "seconds": elapsed}
+                        done.add(name)
+
+            total_time = time.perf_counter() - pipeline_start_time
+            summary = [summary[name] for name in steps]
+
+            print(f"{'step':<24}{'status':<10}{'seconds':>10}")
+            for row in summary:
+                print(f"{row['step']:<24}{row['status']:<10}{row['seconds']:>10.2f}")
+            print(f"{'total':<34}{total_time:>10.2f}")
+            logging.info(f"Training pipeline summary: {summary}")
+
+            return summary
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    TrainPipeline().run(force="--force" in sys.argv)
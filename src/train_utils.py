@@ -0,0 +1,205 @@
+# src/train_utils.py
+# Training-side helpers, kept out of src/utils.py so the serving path never imports them
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import prepare_features
+from sklearn.metrics import r2_score
+from sklearn.base import is_classifier
+from sklearn.model_selection import ParameterGrid, check_cv
+
+
+def _limit_estimator_threads(model, n_threads):
+    """
+    Caps the estimator's own thread pool so families running side by side
+    don't each grab every core.
+    """
+    params = model.get_params()
+    for param in ("n_jobs", "thread_count", "nthread"):
+        if param in params:
+            model.set_params(**{param: n_threads})
+    return model
+
+
+def _cv_splitter(model, y, n_splits=3):
+    # What GridSearchCV(cv=3) uses: StratifiedKFold for classifiers on class labels, else KFold
+    return check_cv(n_splits, y, classifier=is_classifier(model))
+
+
+def _cross_validate_config(params, estimator, X_train, y_train, cv, cv_cache_config, data_fingerprint, fold_store=None):
+    from src.components.cv_cache import CVCache, cached_cross_val_scores
+
+    start_time = time.perf_counter()
+    cache = CVCache(cv_cache_config) if cv_cache_config is not None else None
+    scores, cached = cached_cross_val_scores(estimator, X_train, y_train, cv, cache, data_fingerprint, fold_store)
+    # A configuration that fails on a fold ranks last, like GridSearchCV's error_score=nan
+    score = float(np.mean(scores)) if np.all(np.isfinite(scores)) else -np.inf
+    return params, score, cached, time.perf_counter() - start_time
+
+
+def _search_model_family(name, model, param_grid, X_train, y_train, X_test, y_test, n_jobs, cv_cache_config=None,
+                         fold_store=None):
+    """
+    Runs the grid search of one model family. Each configuration is fitted once
+    per CV fold (or read from the CV cache) and the best one is refitted once
+    on the full training data. With a fold_store the data and the folds are
+    memory-mapped from it and the X/y arguments are ignored.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.base import clone
+    from threadpoolctl import threadpool_limits
+    from src.components.cv_cache import fingerprint_arrays
+
+    start_time = time.perf_counter()
+    if fold_store is not None:
+        (X_train, y_train), (X_test, y_test) = fold_store.train(), fold_store.test()
+    cv = _cv_splitter(model, y_train)
+    features = X_train
+    X_train = prepare_features(model, X_train)
+    X_test = prepare_features(model, X_test)
+    data_fingerprint = None
+    if cv_cache_config is not None:
+        # Densified features hash differently, like they did without the store
+        reuse = fold_store is not None and X_train is features
+        data_fingerprint = fold_store.fingerprint if reuse else fingerprint_arrays(X_train, y_train)
+    model = _limit_estimator_threads(model, 1)
+    # The workers map the folds from the store instead of receiving a copy of X
+    X_cv, y_cv = (None, None) if fold_store is not None else (X_train, y_train)
+    if fold_store is not None:
+        from src.components.fold_store import writable_features
+
+        X_train, X_test = writable_features(model, X_train), writable_features(model, X_test)
+
+    # Keep BLAS/OpenMP inside this family within its share of the core budget
+    with threadpool_limits(limits=n_jobs):
+        # Results are consumed as they complete, so each one is cached before the next finishes
+        results = list(Parallel(n_jobs=n_jobs, return_as="generator")(
+            delayed(_cross_validate_config)(
+                config, clone(model).set_params(**config), X_cv, y_cv, cv, cv_cache_config, data_fingerprint,
+                fold_store,
+            )
+            for config in ParameterGrid(param_grid)
+        ))
+
+        # First best configuration wins ties, like GridSearchCV
+        best_params, best_score, _, _ = max(results, key=lambda result: result[1])
+        best_model = clone(model).set_params(**best_params)
+        best_model.fit(X_train, y_train)
+
+        train_model_score = r2_score(y_train, best_model.predict(X_train))
+        test_model_score = r2_score(y_test, best_model.predict(X_test))
+
+    n_cached = sum(1 for _, _, cached, _ in results if cached)
+    # Same entries as the successive halving report, every configuration on the one full-data rung
+    evaluations = [
+        {"model": name, "params": params, "rung": 0, "n_samples": int(len(y_train)), "cv_score": score,
+         "elapsed": elapsed, "cached": cached}
+        for params, score, cached, elapsed in results
+    ]
+    return {
+        "model": best_model,
+        "best_params": best_params,
+        "cv_score": best_score,
+        "train_score": train_model_score,
+        "test_score": test_model_score,
+        "n_configs": len(results),
+        "cv_cache_hits": n_cached,
+        "fits_skipped": n_cached * cv.get_n_splits(),
+        "fit_time": time.perf_counter() - start_time,
+        "evaluations": evaluations,
+    }
+
+
+def evaluate_models(X_train,y_train,X_test,y_test,models,params,n_cores=None,cv_cache_config=None,
+                    fold_store_config=None):
+    """
+    Grid searches every model family and scores the refitted best estimator of each.
+
+    Families run concurrently on a process pool. The core budget (n_cores,
+    defaults to every core) is split between the families running at the
+    same time and each family search gets its share as n_jobs, so the outer
+    pool and the inner searches never oversubscribe the machine.
+
+    With a cv_cache_config, the fold scores of every configuration are stored
+    on disk and reused by later runs on the same training data.
+
+    With a fold_store_config, the CV folds are split once into a
+    SharedFoldStore and every family and worker memory-maps them instead of
+    receiving its own copy of the data. Each family is cross-validated like
+    GridSearchCV(cv=3): StratifiedKFold for the classifiers, KFold otherwise.
+
+    Returns:
+    - reports (dict): Model name -> dict with the fitted best "model", "best_params",
+      "cv_score", "train_score", "test_score", "n_configs", "cv_cache_hits",
+      "fits_skipped", "fit_time" (seconds) and "evaluations" (the CV score and
+      elapsed seconds of every configuration).
+    """
+    try:
+        logging.info("Evaluating models...")
+        n_cores = n_cores or os.cpu_count() or 1
+        n_workers = max(1, min(len(models), n_cores))
+        n_jobs = max(1, n_cores // n_workers)
+
+        # Largest grids first so the longest searches don't start last
+        names = sorted(models, key=lambda name: -len(ParameterGrid(params[name])))
+
+        start_time = time.perf_counter()
+        fold_store = None
+        if fold_store_config is not None:
+            from src.components.fold_store import SharedFoldStore
+
+            splitters = [_cv_splitter(models[name], y_train) for name in names]
+            fold_store = SharedFoldStore.build(X_train, y_train, X_test, y_test, splitters, fold_store_config)
+            # Only the store's path is shipped to the workers
+            X_train = y_train = X_test = y_test = None
+
+        reports = {}
+        try:
+            if n_workers == 1:
+                for name in names:
+                    logging.info(f"Evaluating model: {name}")
+                    reports[name] = _search_model_family(
+                        name, models[name], params[name], X_train, y_train, X_test, y_test, n_jobs, cv_cache_config,
+                        fold_store,
+                    )
+            else:
+                logging.info(f"Searching {len(models)} model families on {n_workers} processes with {n_jobs} cores each")
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    futures = {
+                        name: executor.submit(
+                            _search_model_family,
+                            name, models[name], params[name], X_train, y_train, X_test, y_test, n_jobs,
+                            cv_cache_config, fold_store,
+                        )
+                        for name in names
+                    }
+                    for name, future in futures.items():
+                        reports[name] = future.result()
+        finally:
+            if fold_store is not None and fold_store_config.cleanup:
+                fold_store.cleanup()
+
+        for name in names:
+            report = reports[name]
+            logging.info(
+                f"Model: {name}, Train Score: {report['train_score']}, Test Score: {report['test_score']}, "
+                f"Configs: {report['n_configs']}, Cached: {report['cv_cache_hits']}, Fit Time: {report['fit_time']:.2f}s"
+            )
+        logging.info(f"Model search completed in {time.perf_counter() - start_time:.2f}s")
+
+        if cv_cache_config is not None:
+            from src.components.cv_cache import CVCache
+
+            fits_skipped = sum(report["fits_skipped"] for report in reports.values())
+            logging.info(f"CV cache skipped {fits_skipped} fits")
+            CVCache(cv_cache_config).evict()
+
+        # Keep the caller's order of families
+        return {name: reports[name] for name in models}
+
+    except Exception as e:
+        raise CustomException(e,sys)
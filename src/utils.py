@@ -1,13 +1,9 @@
 # # src/utils.py
 import os
 import sys
-import pandas as pd
-import numpy as np
 import dill
 from src.exception import CustomException
 from src.logger import logging
-from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
 
 def save_object(file_path, obj):
     """
@@ -28,9 +24,12 @@ def save_object(file_path, obj):
         
         logging.info(f"Saving object at {file_path}")
 
-        # Using dill to serialize the object
-        with open(file_path, 'wb') as file_obj:
+        # Using dill to serialize the object, written to a temporary file first and
+        # renamed so readers (e.g. the model registry) never see a partial file
+        tmp_file_path = f"{file_path}.tmp"
+        with open(tmp_file_path, 'wb') as file_obj:
             dill.dump(obj, file_obj)
+        os.replace(tmp_file_path, file_path)
 
         logging.info(f"Object saved successfully at {file_path}")
 
@@ -39,72 +38,36 @@ def save_object(file_path, obj):
         raise CustomException(e, sys)
     
 
-def evaluate_models(X_train,y_train,X_test,y_test,models,params):
+def accepts_sparse(estimator):
+    """
+    Returns whether an estimator declares support for sparse input.
+    """
     try:
-        logging.info("Evaluating models...")
-        # Initialize a dictionary to hold the evaluation reports
-        reports = {}
-        for i in range (len(list(models))):
-
-            logging.info(f"Evaluating model: {list(models.keys())[i]}")
-            model = list(models.values())[i]
-
-            logging.info(f"Setting parameters for model: {list(models.keys())[i]}")
-            # Setting the parameters for the model
-            para = params[list(models.keys())[i]]
-
-            gs = GridSearchCV(
-                model,para,
-                cv=3,
-                n_jobs=-1,
-                verbose=2,
-                refit=True,
-                scoring='r2'
-            )
-
-            logging.info(f"Fitting model with GridSearchCV: {list(models.keys())[i]}")
-            # Fitting the model with GridSearchCV
-            model = gs.fit(X_train,y_train)
-
-
-            logging.info(f"Fitting model: {list(models.keys())[i]}")
-            model.fit(X_train,y_train)
+        from sklearn.utils import get_tags
+        return get_tags(estimator).input_tags.sparse
+    except Exception:
+        return False
 
-            logging.info(f"Predicting with model: {list(models.keys())[i]}")
-            # Predicting on training and testing data
-            y_train_pred = model.predict(X_train)
 
-
-            logging.info(f"Predicting with model on test data: {list(models.keys())[i]}")
-            # Predicting on test data
-            y_test_pred = model.predict(X_test)
-
-
-            logging.info(f"Calculating scores for model: {list(models.keys())[i]}")
-            # Calculating the score for training and testing data
-            train_model_score = r2_score(y_train,y_train_pred)
-
-            logging.info(f"Calculating test score for model: {list(models.keys())[i]}")
-            test_model_score = r2_score(y_test,y_test_pred)
-
-            # Logging the scores
-            logging.info(f"Model: {list(models.keys())[i]}, Train Score: {train_model_score}, Test Score: {test_model_score}")
-
-            # Storing the scores in the reports dictionary
-            reports[list(models.keys())[i]] = test_model_score
-            # reports[list(models.keys())[i]] = {
-            #     "train_score": train_model_score,
-            #     "test_score": test_model_score
-            # }
-        logging.info(f"Model evaluation reports: {reports}")
-        return reports
-    
+def sparse_zeros_are_missing(estimator):
+    """
+    Returns whether an estimator reads the implicit zeros of a sparse matrix
+    as missing values instead of 0.0 (XGBoost), so CSR and dense input of the
+    same rows give different predictions.
+    """
+    return type(estimator).__module__.split(".")[0] == "xgboost"
 
 
+def prepare_features(estimator, X):
+    """
+    Densifies sparse features only for estimators that can't take them, or
+    that would read their implicit zeros as missing. Training and every
+    predict path go through here, so a model always sees one format.
+    """
+    if hasattr(X, "toarray") and (not accepts_sparse(estimator) or sparse_zeros_are_missing(estimator)):
+        return X.toarray()
+    return X
 
-    except Exception as e:
-        raise CustomException(e,sys)
-    
 
 def load_object(file_path):
 
@@ -124,37 +87,3 @@ def load_object(file_path):
     except Exception as e:
         logging.error(f"Error loading object from {file_path}: {e}")
         raise CustomException(e, sys)
-    
-
-
-
-   
-    """
-    Evaluates multiple regression models and returns their performance metrics.
-    
-    Parameters:
-    - X_train: Training feature set.
-    - y_train: Training target values.
-    - X_test: Testing feature set.
-    - y_test: Testing target values.
-    - models (dict): Dictionary of model names and their instances.
-    
-    Returns:
-    - model_report (dict): Dictionary containing model names and their R2 scores.
-    """
-    model_report = {}
-
-    for model_name, model in models.items():
-        try:
-            # Fit the model
-            model.fit(X_train, y_train)
-            # Predict on the test set
-            y_pred = model.predict(X_test)
-            # Calculate R2 score
-            r2 = r2_score(y_test, y_pred)
-            model_report[model_name] = r2
-        except Exception as e:
-            logging.error(f"Error evaluating {model_name}: {e}")
-            model_report[model_name] = None
-
-    return model_report
\ No newline at end of file
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.columnar_dataset import ColumnarDatasetWriter, read_columnar_dataset
+from src.exception import CustomException
+
+
+def test_append_promotes_numeric_columns(tmp_path):
+    dataset_path = str(tmp_path / "data")
+    chunks = [
+        pd.DataFrame({"score": [1, 2], "count": np.array([1, 2], dtype=np.int8), "lunch": ["standard", "free"]}),
+        pd.DataFrame({"score": [3.5, np.nan], "count": np.array([300, 4], dtype=np.int64), "lunch": ["free", None]}),
+    ]
+    writer = ColumnarDatasetWriter(dataset_path)
+    for chunk in chunks:
+        writer.append(chunk)
+    writer.close()
+
+    df = read_columnar_dataset(dataset_path, mmap=False)
+    assert df["score"].dtype == np.float64
+    assert df["count"].dtype == np.int64
+    np.testing.assert_array_equal(df["score"].to_numpy(), [1.0, 2.0, 3.5, np.nan])
+    np.testing.assert_array_equal(df["count"].to_numpy(), [1, 2, 300, 4])
+    assert df["lunch"].tolist()[:3] == ["standard", "free", "free"]
+
+
+def test_append_rejects_non_numeric_chunk(tmp_path):
+    writer = ColumnarDatasetWriter(str(tmp_path / "data"))
+    writer.append(pd.DataFrame({"score": [1, 2]}))
+    with pytest.raises(CustomException):
+        writer.append(pd.DataFrame({"score": pd.Series([np.datetime64("2024-01-01")] * 2)}))
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_transformation import DataTransformation
+from src.pipeline.compiled_encoder import CompiledEncoder, verify_parity
+
+TARGET_COLUMN = "math_score"
+
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    train_df = pd.read_csv(os.path.join("artifacts", "train.csv"))
+    preprocessor = DataTransformation().get_data_transformer_object()
+    return preprocessor.fit(train_df.drop(columns=[TARGET_COLUMN]))
+
+
+@pytest.fixture(scope="module")
+def test_df():
+    return pd.read_csv(os.path.join("artifacts", "test.csv")).drop(columns=[TARGET_COLUMN])
+
+
+def _assert_parity(preprocessor, df):
+    report = verify_parity(preprocessor, df)
+    assert report == {"rows": len(df), "records_match": True, "structured_match": True}
+
+
+def test_parity_on_test_data(preprocessor, test_df):
+    _assert_parity(preprocessor, test_df)
+
+
+def test_parity_with_missing_values(preprocessor, test_df):
+    df = test_df.head(20).copy()
+    df["reading_score"] = df["reading_score"].astype(float)
+    df.loc[0:4, "reading_score"] = np.nan
+    df.loc[3:6, "writing_score"] = np.nan
+    df.loc[5:8, "gender"] = np.nan
+    df.loc[9:10, "lunch"] = None
+    _assert_parity(preprocessor, df)
+
+
+def test_parity_with_unseen_categories(preprocessor, test_df):
+    df = test_df.head(10).copy()
+    df.loc[0:2, "race_ethnicity"] = "group Z"
+    df.loc[3, "parental_level_of_education"] = "doctorate"
+    _assert_parity(preprocessor, df)
+
+    # An unknown category contributes no one-hot entry for its column
+    encoder = CompiledEncoder.compile(preprocessor)
+    known = encoder.transform_record({**test_df.iloc[0].to_dict(), "race_ethnicity": "group A"})
+    unseen = encoder.transform_record({**test_df.iloc[0].to_dict(), "race_ethnicity": "group Z"})
+    assert np.count_nonzero(known) - np.count_nonzero(unseen) == 1
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from src.components.data_transformation import DataTransformation
+from src.pipeline.compiled_encoder import CompiledEncoder
+from src.pipeline.compiled_trees import CompiledTreeEnsemble, _fit_candidates, probe_inputs, verify_parity
+
+TARGET_COLUMN = "math_score"
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    train_df = pd.read_csv(os.path.join("artifacts", "train.csv"))
+    test_df = pd.read_csv(os.path.join("artifacts", "test.csv"))
+    preprocessor = DataTransformation().get_data_transformer_object()
+    X_train = preprocessor.fit_transform(train_df.drop(columns=[TARGET_COLUMN]))
+    X_test = preprocessor.transform(test_df.drop(columns=[TARGET_COLUMN]))
+    models = _fit_candidates(X_train, train_df[TARGET_COLUMN].to_numpy())
+    return preprocessor, X_test, models
+
+
+@pytest.mark.parametrize("name", [
+    "DecisionTree Regressor", "RandomFores Regressor", "GradientBoosting Regressor", "AdaBoost Regressor", "XGBRegressor ",
+])
+def test_parity_on_test_data(fitted, name):
+    _, X_test, models = fitted
+    model = models[name]
+    compiled = CompiledTreeEnsemble.compile(model)
+    assert sparse.issparse(X_test)
+    # The CSR rows preprocessor.transform gives the predict paths, and the compiled encoder's dense rows
+    for X in (X_test, X_test.toarray()):
+        report = verify_parity(model, X, compiled)
+        assert report["exact_match"], report
+
+
+def test_probe_inputs_cover_predict_formats(fitted):
+    preprocessor, _, models = fitted
+    encoder = CompiledEncoder.compile(preprocessor)
+    compiled = CompiledTreeEnsemble.compile(models["XGBRegressor "])
+    probes = probe_inputs(preprocessor, encoder, compiled.n_features, n_rows=64)
+    assert set(probes) == {"dense", "csr", "preprocessor"}
+    np.testing.assert_array_equal(probes["preprocessor"].toarray(), probes["dense"])
+    for probe in probes.values():
+        assert verify_parity(models["XGBRegressor "], probe, compiled)["exact_match"]
@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold, cross_val_score
+
+from src.components import fold_store
+from src.components.fold_store import SharedFoldStore
+
+
+def _data():
+    rng = np.random.default_rng(42)
+    X = rng.random((500, 8))
+    return X, X @ rng.random(8)
+
+
+def test_scores_match_cross_val_score():
+    X, y = _data()
+    store = SharedFoldStore.build(X[:400], y[:400], X[400:], y[400:], [KFold(3)])
+    try:
+        expected = cross_val_score(LinearRegression(), X[:400], y[:400], cv=KFold(3), scoring="r2")
+        np.testing.assert_allclose(store.cross_val_scores(LinearRegression(), KFold(3)), expected)
+    finally:
+        store.cleanup()
+
+
+def test_store_falls_back_when_shared_memory_is_full(monkeypatch):
+    X, y = _data()
+    full = shutil._ntuple_diskusage(64 << 20, 64 << 20, 0)
+    monkeypatch.setattr(fold_store.shutil, "disk_usage", lambda path: full)
+    store = SharedFoldStore.build(X[:400], y[:400], X[400:], y[400:], [KFold(3)])
+    try:
+        assert os.path.dirname(store.store_path) == tempfile.gettempdir()
+    finally:
+        store.cleanup()
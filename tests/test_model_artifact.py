@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pytest
+from catboost import CatBoostClassifier, CatBoostRegressor
+from sklearn.ensemble import RandomForestRegressor
+from xgboost import XGBClassifier, XGBRegressor
+
+from src.components.model_artifact import (
+    ModelArtifactConfig, load_model_artifact, publish_model_artifact, save_model_artifact
+)
+
+
+def _data():
+    rng = np.random.default_rng(42)
+    X = rng.random((200, 5))
+    y = X @ rng.random(5)
+    return X, y, (y > np.median(y)).astype(int)
+
+
+@pytest.mark.parametrize("model, kind, classifier", [
+    (XGBRegressor(n_estimators=10), "xgboost", False),
+    (XGBClassifier(n_estimators=10), "xgboost", True),
+    (CatBoostRegressor(iterations=10, verbose=False, allow_writing_files=False), "catboost", False),
+    (CatBoostClassifier(iterations=10, verbose=False, allow_writing_files=False), "catboost", True),
+    (RandomForestRegressor(n_estimators=10, random_state=42), "pickle", False),
+])
+def test_round_trip(tmp_path, model, kind, classifier):
+    X, y_regression, y_class = _data()
+    model.fit(X, y_class if classifier else y_regression)
+
+    manifest = save_model_artifact(model, ModelArtifactConfig(artifact_path=str(tmp_path / "model")))
+    loaded = load_model_artifact(str(tmp_path / "model"), verify=True)
+
+    assert manifest["kind"] == kind
+    assert type(loaded) is type(model)
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+    if classifier:
+        np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+
+
+def test_staged_artifact_is_published_on_swap(tmp_path):
+    X, y, _ = _data()
+    artifact_path = str(tmp_path / "model")
+    first = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    second = XGBRegressor(n_estimators=5).fit(X, y)
+    save_model_artifact(first, ModelArtifactConfig(artifact_path=artifact_path))
+
+    save_model_artifact(second, ModelArtifactConfig(artifact_path=artifact_path), publish=False)
+    # Readers keep loading the previous artifact, its files are all still there
+    assert type(load_model_artifact(artifact_path, verify=True)) is RandomForestRegressor
+
+    publish_model_artifact(artifact_path)
+    assert type(load_model_artifact(artifact_path, verify=True)) is XGBRegressor
+    # The random forest's blobs went with its manifest
+    assert os.listdir(os.path.join(artifact_path, "blobs")) == []
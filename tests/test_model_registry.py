@@ -0,0 +1,110 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+
+
+class _YieldingLock:
+    """
+    Lock that lets other threads run right after every release, so a gap
+    between a check and a reload under two separate acquires is always hit.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def acquire(self, blocking=True):
+        return self._lock.acquire(blocking)
+
+    def release(self):
+        self._lock.release()
+        time.sleep(0.05)
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class _SlowRegistry(ModelRegistry):
+    """
+    Registry whose artifacts always look changed and take a while to load.
+    """
+    def __init__(self):
+        super().__init__(ModelRegistryConfig(check_interval=0.0))
+        self._lock = _YieldingLock()
+        self.n_loads = 0
+        self._active = self._load(0)
+
+    def current_version(self, include_score_table=True):
+        return time.monotonic_ns()
+
+    def _load(self, version):
+        self.n_loads += 1
+        time.sleep(0.2)
+        return SimpleNamespace(version=version, load_time=0.2)
+
+
+def test_concurrent_get_reloads_once_and_never_blocks():
+    registry = _SlowRegistry()
+    active = registry._active
+    results, durations = [], []
+
+    def call():
+        start = time.perf_counter()
+        results.append(registry.get())
+        durations.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One thread reloaded, the others served the active pair without waiting for it
+    assert len(results) == 8
+    assert registry.n_loads == 2
+    assert sum(result is active for result in results) == 7
+    assert sorted(durations)[-2] < 0.1
+
+
+def test_mixed_pair_is_never_served(tmp_path):
+    import pandas as pd
+    import pytest
+    from sklearn.linear_model import LinearRegression
+    from src.components.data_transformation import DataTransformation
+    from src.components.model_artifact import save_model_metadata
+    from src.exception import CustomException
+    from src.utils import save_object
+
+    df = pd.read_csv("artifacts/train.csv")
+    config = ModelRegistryConfig(
+        model_path=str(tmp_path / "trained_model.pkl"),
+        model_artifact_path=str(tmp_path / "trained_model"),
+        preprocessor_path=str(tmp_path / "preprocessor.pkl"),
+        check_interval=0.0,
+    )
+
+    def train(rows):
+        preprocessor = DataTransformation().get_data_transformer_object()
+        model = LinearRegression().fit(preprocessor.fit_transform(rows.drop(columns=["math_score"])), rows["math_score"])
+        return preprocessor, model
+
+    preprocessor, model = train(df.iloc[:400])
+    save_object(config.preprocessor_path, preprocessor)
+    save_object(config.model_path, model)
+    save_model_metadata(config.model_path, config.preprocessor_path)
+    registry = ModelRegistry(config)
+    first = registry.get()
+
+    # The next run's transformation step has written its preprocessor, the model is not saved yet
+    preprocessor, model = train(df.iloc[400:])
+    save_object(config.preprocessor_path, preprocessor)
+    assert registry.reload() is first
+    with pytest.raises(CustomException):
+        ModelRegistry(config).get()
+
+    save_object(config.model_path, model)
+    save_model_metadata(config.model_path, config.preprocessor_path)
+    assert registry.reload().version != first.version
@@ -0,0 +1,22 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.components.model_search import successive_halving_search
+
+
+def test_first_rung_holds_every_class_for_stratified_folds():
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 4))
+    # A rare class: a 30-row random subset would hold fewer than 3 of its rows
+    y = np.where(np.arange(300) < 9, 2, (X[:, 0] > 0.5).astype(int))
+    models = {"Tree": DecisionTreeClassifier(random_state=0), "Linear": LinearRegression()}
+    params = {"Tree": {"max_depth": [2, 3, 4, 5]}, "Linear": {"fit_intercept": [True, False]}}
+
+    _, search_report = successive_halving_search(
+        X[:250], y[:250], X[250:], y[250:], models, params, min_resource=30, n_jobs=1
+    )
+
+    first_rung = [evaluation for evaluation in search_report["evaluations"] if evaluation["rung"] == 0]
+    assert first_rung[0]["n_samples"] > 30
+    assert all(np.isfinite(evaluation["cv_score"]) for evaluation in first_rung)
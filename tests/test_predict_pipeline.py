@@ -0,0 +1,20 @@
+import pytest
+
+from src.pipeline.predict_pipeline import CustomData, RecordValidationError
+
+RECORD = {
+    "gender": "female", "race_ethnicity": "group B", "parental_level_of_education": "bachelor's degree",
+    "lunch": "standard", "test_preparation_course": "none", "reading_score": 72, "writing_score": 74.0,
+}
+
+
+def test_validate_record_converts_scores():
+    record = CustomData.validate_record(RECORD)
+    assert record["reading_score"] == 72.0 and isinstance(record["reading_score"], float)
+
+
+@pytest.mark.parametrize("value", [10 ** 400, float("nan"), float("inf"), True, "72", None])
+def test_validate_record_rejects_invalid_scores(value):
+    with pytest.raises(RecordValidationError) as excinfo:
+        CustomData.validate_record({**RECORD, "reading_score": value})
+    assert list(excinfo.value.errors) == ["reading_score"]
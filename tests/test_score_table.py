@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from src.components.data_transformation import DataTransformation
+from src.components.score_table import ScoreTableConfig, ScoreTableExporter
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+from src.utils import prepare_features, save_object
+
+
+def test_table_is_served_after_every_export(tmp_path):
+    train_df = pd.read_csv(os.path.join("artifacts", "train.csv"))
+    preprocessor = DataTransformation().get_data_transformer_object()
+    X = preprocessor.fit_transform(train_df.drop(columns=["math_score"]))
+    model = LinearRegression()
+    model.fit(prepare_features(model, X), train_df["math_score"])
+
+    config = ScoreTableConfig(
+        table_file_path=str(tmp_path / "score_table.f32"),
+        layout_file_path=str(tmp_path / "score_table.json"),
+        model_file_path=str(tmp_path / "trained_model.pkl"),
+        preprocessor_file_path=str(tmp_path / "preprocessor.pkl"),
+        score_min=70,
+        score_max=72,
+        n_jobs=1,
+    )
+    save_object(config.model_file_path, model)
+    save_object(config.preprocessor_file_path, preprocessor)
+    record = {
+        "gender": "female", "race_ethnicity": "group B", "parental_level_of_education": "bachelor's degree",
+        "lunch": "standard", "test_preparation_course": "none", "reading_score": 71, "writing_score": 72,
+    }
+
+    for _ in range(2):
+        ScoreTableExporter(config).initiate_export()
+        registry = ModelRegistry(ModelRegistryConfig(
+            model_path=config.model_file_path,
+            model_artifact_path=str(tmp_path / "trained_model"),
+            preprocessor_path=config.preprocessor_file_path,
+            score_table_path=config.table_file_path,
+            score_table_layout_path=config.layout_file_path,
+        ))
+        score_table = registry.get().score_table
+        assert score_table is not None
+        assert score_table.lookup(record) is not None